@@ -0,0 +1,84 @@
+#! /usr/bin/env python3
+
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Micro-benchmark for the data cleaning in `kolli_dashboard/data.py`. The SoSci
+# export is replicated to simulate future data volumes and the cleaning steps
+# are timed with the current vectorized implementation and with the previous,
+# row-wise implementation. Afterwards the runtime of each repair rule is shown
+# for the largest factor. Run from the project root:
+#
+#     poetry run python -m benchmarks.etl [FACTOR ...]
+#==============================================================================
+
+import sys, time
+
+import pandas as pd
+
+from kolli_dashboard.data    import _clean, data_csv, labels_csv
+from kolli_dashboard.repairs import run_repairs
+from kolli_dashboard.utils   import to_scale_minus_plus, checkbox_to_scale_minus_plus
+
+def replicate(data, factor):
+    """
+    Concatenate the raw export `factor` times with unique CASE ids.
+    """
+    copies = []
+
+    for i in range(factor):
+        copy = data.copy()
+        copy["CASE"] += i * (data["CASE"].max() + 1)
+        copies.append(copy)
+
+    return pd.concat(copies, ignore_index=True)
+
+def legacy_row_wise(data, labels):
+    """
+    The conversion steps as they were implemented before, with one Python
+    function call per row or cell.
+    """
+    data.apply(lambda row: "Erwartungen: " + str(row["VU02_01"]) if pd.notnull(row["VU02_01"]) else row["V210_01"], axis=1)
+
+    for label in labels[labels["TYPE"] == "plus_minus"].itertuples():
+        if label.VAR in data:
+            data[label.VAR].apply(to_scale_minus_plus)
+
+    for label in labels[labels["TYPE"] == "checkbox_plus_minus"].itertuples():
+        if label.VAR in data:
+            data[label.VAR].apply(checkbox_to_scale_minus_plus)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    factors = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    data    = pd.read_csv(str(data_csv),   encoding="utf-16", sep="\t", quotechar='"', decimal=".")
+    labels  = pd.read_csv(str(labels_csv), encoding="utf-16", sep="\t", quotechar='"', decimal=".")
+
+    print(f"{'Factor':>6}  {'Rows':>8}  {'_clean()':>10}  {'Row-wise steps only':>20}")
+
+    for factor in factors:
+        raw     = replicate(data, factor)
+        current = timed(_clean, raw.copy(), labels)
+        legacy  = timed(legacy_row_wise, raw.copy(), labels)
+
+        print(f"{factor:>5}x  {raw.shape[0]:>8}  {current:>9.3f}s  {legacy:>19.3f}s")
+
+    raw = replicate(data, max(factors))
+    raw["STARTED"] = pd.to_datetime(raw["STARTED"])
+    _, report = run_repairs(raw)
+
+    print()
+    print(f"{'Rows':>8}  {'Time':>9}  Repair rule ({max(factors)}x)")
+
+    for entry in report:
+        fused = f" (fused pass of {entry['fused']} rules)" if entry["fused"] > 1 else ""
+        print(f"{entry['rows']:>8}  {entry['seconds'] * 1000:>7.1f}ms  {entry['description']}{fused}")
@@ -0,0 +1,113 @@
+#! /usr/bin/env python3
+
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Micro-benchmark for the likert statistics in `kolli_dashboard/data.py`. The
+# answers to wide groups of questions are replicated to simulate future data
+# volumes and the statistics are computed with the current vectorized
+# implementation, which counts all questions in one pass, and with the
+# previous implementation, which counted and summarized each question on its
+# own. Both results are compared, too. Run from the project root:
+#
+#     poetry run python -m benchmarks.likert [FACTOR ...]
+#==============================================================================
+
+import sys, time
+
+import numpy  as np
+import pandas as pd
+
+from kolli_dashboard.data import _code_counts, _count_statistics, data, rename_map
+
+groups = [
+    [f"IL13_{i:02}" for i in range(1, 12)],
+    [f"V209_{i:02}" for i in range(1, 10)],
+    [f"AB07_{i:02}" for i in range(1, 10)],
+]
+
+def replicate(df, factor):
+    """
+    Concatenate the answers `factor` times.
+    """
+    return pd.concat([df] * factor, ignore_index=True)
+
+def legacy_per_question(df, plot_percentage):
+    """
+    The statistics as they were implemented before, with one pass over the
+    answers and a separate summary for each question.
+    """
+    ordinal_order = [1, 2, 3, 4, 5]
+    ordinal_scale = [str(v) for v in ordinal_order]
+
+    rows = []
+    for question, series in df.items():
+        codes   = series.cat.codes.to_numpy()
+        ordinal = codes[codes >= 0].astype(int) + 1
+        counts  = np.bincount(ordinal - 1, minlength=len(ordinal_order))
+        total   = int(counts.sum())
+        mean    = ordinal.mean().round(1) if total else pd.NA
+        stddev  = ordinal.std(ddof=1) if total >= 2 else pd.NA
+
+        if plot_percentage:
+            scale_values = {
+                str(scale_value): (f"{round((int(counts[i]) / total) * 100)}%" if total else pd.NA)
+                for i, scale_value in enumerate(ordinal_order)
+            }
+        else:
+            scale_values = {str(scale_value): int(counts[i]) for i, scale_value in enumerate(ordinal_order)}
+
+        if total:
+            target_pos = (total + 1) // 2
+            median     = ordinal_order[int(np.argmax(counts.cumsum() >= target_pos))]
+        else:
+            median     = pd.NA
+
+        rows.append({
+            "Frage": question,
+            **scale_values,
+            "N": total,
+            "MD": median,
+            "M": mean,
+            "SD": (round(float(stddev), 2) if pd.notna(stddev) else pd.NA),
+        })
+
+    return pd.DataFrame(rows, columns=["Frage", *ordinal_scale, "N", "MD", "M", "SD"])
+
+def vectorized(df, plot_percentage):
+    return _count_statistics(df.columns, _code_counts(df), plot_percentage)
+
+def timed(func, *args, repeat=20):
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        result = func(*args)
+
+    return (time.perf_counter() - start) / repeat, result
+
+if __name__ == "__main__":
+    factors = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+
+    print(f"{'Factor':>6}  {'Rows':>8}  {'Questions':>9}  {'Vectorized':>10}  {'Per question':>12}  Group")
+
+    for factor in factors:
+        for vars in groups:
+            vars = [var for var in vars if var in data["answers"]]
+
+            if not vars:
+                continue
+
+            df = data["answers"][vars].rename(columns=rename_map(*vars))
+            df = replicate(df, factor)
+
+            for plot_percentage in (False, True):
+                current, result = timed(vectorized, df, plot_percentage)
+                legacy, expect  = timed(legacy_per_question, df, plot_percentage)
+                pd.testing.assert_frame_equal(result, expect)
+
+            print(f"{factor:>5}x  {df.shape[0]:>8}  {len(vars):>9}  {current * 1000:>8.2f}ms  {legacy * 1000:>10.2f}ms  {vars[0]}..{vars[-1]}")
@@ -8,7 +8,11 @@
 from dotenv import load_dotenv
 load_dotenv()
 
+from .cache           import image_cache, log_cache_stats, result_cache
+from .client_charts   import chart_mode
+from .data            import new_correlation_filters
 from .infobox         import infobox_ui, infobox_server
+from .plot_pool       import cancel_plot_jobs, start_plot_pool
 from .sidebar         import sidebar_ui, sidebar_server
 from .surveys.round1  import round1_ui, round1_server
 from .surveys.revised import revised_ui, revised_server
@@ -20,6 +24,7 @@ app_ui = ui.page_navbar(
     ui.head_content(
         ui.include_css(str(src_dir / "www" / "style.css")),
         ui.HTML('<link rel="icon" href="favicon.svg"/>'),
+        ui.tags.script(src="charts.js") if chart_mode == "client" else None,
     ),
     ui.nav_spacer(),
     ui.nav_panel("Runden 2 & 3", revised_ui(), value="round3"),
@@ -35,10 +40,19 @@ app_ui = ui.page_navbar(
 )
 
 def server(input, output, session):
-    sidebar_server(input, output, session)
-    revised_server(input, output, session)
-    round1_server(input, output, session)
-    special_server(input, output, session)
+    correlation_filters = new_correlation_filters()
+    sidebar_filters     = sidebar_server(input, output, session, correlation_filters)
+
+    revised_server(input, output, session, sidebar_filters, correlation_filters)
+    round1_server(input, output, session, sidebar_filters, correlation_filters)
+    special_server(input, output, session, sidebar_filters, correlation_filters)
     infobox_server(input, output, session)
 
+    session.on_ended(lambda: log_cache_stats("Result", result_cache))
+    session.on_ended(lambda: log_cache_stats("Image", image_cache))
+    session.on_ended(lambda: cancel_plot_jobs(session.id))
+
+if chart_mode == "server":
+    start_plot_pool()
+
 app = App(app_ui, server, static_assets=str(src_dir / "www"))
\ No newline at end of file
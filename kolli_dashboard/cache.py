@@ -0,0 +1,115 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+from collections import OrderedDict
+
+import logging
+import numpy  as np
+import os
+import pandas as pd
+import sys
+
+logger = logging.getLogger(__name__)
+
+def new_cache(max_bytes):
+    """
+    Create an empty cache for computed results, which are shared by all sessions
+    of the process. When the results take more than `max_bytes`, the least
+    recently used results are dropped.
+    """
+    return {
+        "entries":   OrderedDict(),
+        "bytes":     0,
+        "max_bytes": max_bytes,
+        "hits":      0,
+        "misses":    0,
+        "evictions": 0,
+    }
+
+def cached(cache, key, compute):
+    """
+    Return the cached result for `key` or call `compute()` to create it. The
+    result is shared, so the caller must not modify it.
+    """
+    value = cache_lookup(cache, key)
+
+    if value is None:
+        value = compute()
+        cache_store(cache, key, value)
+
+    return value
+
+def cache_lookup(cache, key):
+    """
+    Return the cached result for `key` or `None`. Together with `cache_store()`
+    this allows to cache results that are computed asynchronously.
+    """
+    entries = cache["entries"]
+
+    if key in entries:
+        entries.move_to_end(key)
+        cache["hits"] += 1
+        return entries[key][0]
+
+    cache["misses"] += 1
+    return None
+
+def cache_store(cache, key, value):
+    """
+    Add a result to the cache and drop the least recently used results, if the
+    cache gets too big. Results that alone exceed the limit are not cached.
+    """
+    entries = cache["entries"]
+    size    = _size_of(value)
+
+    if size > cache["max_bytes"] or key in entries:
+        return
+
+    entries[key]    = (value, size)
+    cache["bytes"] += size
+
+    while cache["bytes"] > cache["max_bytes"]:
+        _, (_, evicted)     = entries.popitem(last=False)
+        cache["bytes"]     -= evicted
+        cache["evictions"] += 1
+
+def cache_stats(cache):
+    """
+    Counters to size the cache: number and size of the entries, hits, misses
+    and evictions since the start of the process.
+    """
+    return {
+        "entries":   len(cache["entries"]),
+        "bytes":     cache["bytes"],
+        "max_bytes": cache["max_bytes"],
+        "hits":      cache["hits"],
+        "misses":    cache["misses"],
+        "evictions": cache["evictions"],
+    }
+
+def log_cache_stats(name, cache):
+    logger.info("%s cache: %s", name, cache_stats(cache))
+
+def _size_of(value):
+    """
+    Approximate memory usage of a cached result in bytes.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        size = value.memory_usage(index=True, deep=True)
+        return int(size.sum()) if isinstance(size, pd.Series) else int(size)
+    elif isinstance(value, np.ndarray):
+        return value.nbytes
+    elif isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_size_of(item) for item in value)
+    else:
+        return sys.getsizeof(value)
+
+# Count matrices and statistics of the likert charts, see `data.py`
+result_cache = new_cache(int(float(os.environ.get("RESULT_CACHE_MB", "64")) * 1024 * 1024))
+
+# Rendered PNG images of the likert charts, see `plot_likert_chart()` in `data.py`
+image_cache = new_cache(int(float(os.environ.get("IMAGE_CACHE_MB", "64")) * 1024 * 1024))
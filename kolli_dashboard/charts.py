@@ -0,0 +1,134 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+from matplotlib.figure import Figure
+
+import io
+import numpy as np
+
+# Transparent padding followed by one color per value of the scale, like plot-likert
+likert_colors = ["#ffffff00", "firebrick", "lightcoral", "gainsboro", "cornflowerblue", "darkblue"]
+
+# Fractions of the largest total for the padding around the bars and the
+# smallest bar that still gets a label, like plot-likert
+padding_left     = 0.02
+padding_right    = 0.04
+bar_label_cutoff = 0.05
+
+def plot_likert_bars(counts, questions, *, percentages=False, label_format="%.0f", width=0.15, xlabel=""):
+    """
+    Diverging stacked bar chart of likert answers, which is drawn like the
+    charts of plot-likert. `counts` has one row per question and one column
+    per value of the scale. The bars are centered around the middle value.
+
+    The chart is drawn on a figure of its own and all options are passed as
+    arguments instead of module globals, so that several charts can be drawn
+    at the same time. Returns the axes of the chart.
+    """
+    counts = np.asarray(counts, dtype=float)
+
+    if percentages:
+        counts = counts / counts.sum(axis=1)[:, None] * 100
+
+    # Pad each question from the left, so that the bars are centered around the middle value
+    n_values = counts.shape[1]
+    middle   = n_values // 2
+    middles  = counts[:, :middle].sum(axis=1)
+
+    if n_values % 2:
+        middles = middles + counts[:, middle] / 2
+
+    center  = middles.max()
+    padded  = np.column_stack([np.abs(middles - center), counts])[::-1]
+    n_bars  = padded.shape[0]
+    figure  = Figure()
+    ax      = figure.add_subplot()
+
+    # Stack the segments from the left, with the first question at the top
+    positions = np.arange(n_bars)
+    stacked   = np.zeros(n_bars)
+    segments  = []
+
+    for i in range(padded.shape[1]):
+        values  = padded[:, i]
+        start   = np.where(values > 0, stacked, 0)
+        stacked = stacked + np.where(values > 0, values, 0)
+        segments.append(ax.barh(positions, values, width, left=start, color=likert_colors[i % len(likert_colors)]))
+
+    ax.set_ylim(-width / 2 - 0.25, n_bars - 1 + width / 2 + 0.25)
+    ax.set_yticks(positions)
+    ax.set_yticklabels(list(questions)[::-1])
+
+    center_line = ax.axvline(center, linestyle="--", color="black", alpha=0.5)
+    center_line.set_zorder(-1)
+
+    # Ticks in both directions from the center. Labels above the largest total are hidden.
+    max_width = int(round(padded.sum(axis=1).max()))
+    interval  = _tick_interval(ax.xaxis.get_tick_space(), max_width)
+    right     = np.arange(interval, max_width - center + interval, interval)
+    left      = np.arange(0, center + 1, interval)
+    xvalues   = np.concatenate([center - left, center + right])
+    xlabels   = [int(label) for label in np.concatenate([left, right]) if round(label) == label]
+    total_max = counts.sum(axis=1).max()
+    xlabels   = ["" if label > total_max else label for label in xlabels]
+
+    if percentages:
+        xlabels = [f"{label}%" if label != "" else "" for label in xlabels]
+
+    ax.set_xticks(xvalues)
+    ax.set_xticklabels(xlabels)
+    ax.set_xlabel(xlabel)
+
+    x_min, x_max = ax.get_xlim()
+    ax.set_xlim(x_min - total_max * padding_left, x_max - total_max * padding_right)
+
+    # Label the segments, except for the padding and segments too small for their label
+    fmt    = label_format + ("%%" if percentages else "")
+    cutoff = total_max * bar_label_cutoff
+
+    for segment in segments[1:]:
+        for label in ax.bar_label(segment, label_type="center", fmt=fmt, padding=0, color="white", weight="bold"):
+            if float(label.get_text().rstrip("%")) < cutoff:
+                label.set_text("")
+
+    return ax
+
+def likert_png(width_px, height_px, pixelratio, counts, questions, **options):
+    """
+    PNG image of `plot_likert_bars()` with the given size in CSS pixels. The
+    figure is sized and saved like `render.plot` of Shiny does it, so that this
+    can run in a worker process of `plot_pool.py` and only return the bytes.
+    """
+    figure = plot_likert_bars(counts, questions, **options).figure
+    dpi    = figure.get_dpi()
+
+    figure.set_size_inches(width_px / dpi, height_px / dpi)
+    figure.set_dpi(dpi * pixelratio)
+    figure.set_layout_engine(layout="tight")
+
+    with io.BytesIO() as buffer:
+        figure.savefig(buffer, format="png", dpi=dpi * pixelratio)
+        return buffer.getvalue()
+
+def _tick_interval(tick_space, max_width):
+    """
+    Distance between the ticks of the x-axis for about `tick_space` ticks. Of the
+    possible distances the one that is divisible by the roundest number wins.
+    """
+    min_ticks    = max(tick_space - 5, 1)
+    min_interval = max(1, int(max_width / (tick_space + 2)))
+    max_interval = max(1, round(max_width / min_ticks))
+    candidates   = list(range(min_interval, max_interval + 1))
+
+    return candidates[int(np.argmax([_roundest_divisor(candidate) for candidate in candidates]))]
+
+def _roundest_divisor(n):
+    """
+    Largest of 5, 10, 25, 50, 100, 1000, ... that divides `n`, otherwise 1.
+    """
+    divisors = [5, 10, 25, 50, *(10 ** i for i in range(2, len(str(n)) + 1))]
+    return max([divisor for divisor in divisors if n % divisor == 0], default=1)
@@ -0,0 +1,88 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+from shiny.render.renderer import Renderer
+from shiny                 import ui
+
+import os
+
+# "server": Charts are drawn with matplotlib and sent as PNG images
+# "client": Only the counts are sent as JSON and `www/charts.js` draws the charts
+chart_mode = os.environ.get("CHART_MODE", "server")
+
+def output_chart(id, height="400px"):
+    """
+    Placeholder for a chart output of `render_chart()`.
+    """
+    if chart_mode == "client":
+        return ui.div(id=id, class_="kolli-chart-output", style=f"width:100%;height:{height};")
+    else:
+        return ui.output_plot(id, height=height)
+
+def render_chart(server_renderer):
+    """
+    Decorator for chart outputs. In server mode `server_renderer`, e.g.
+    `render.plot`, sends the chart drawn on the server. In client mode the
+    value function returns a chart from `likert_chart_json()` and the like,
+    which is sent as JSON to `www/charts.js`.
+    """
+    if chart_mode == "client":
+        return chart_json()
+    else:
+        return server_renderer
+
+class chart_json(Renderer[dict]):
+    """
+    Sends the chart returned by the value function unchanged to the browser.
+    """
+    def auto_output_ui(self):
+        return output_chart(self.output_id)
+
+    async def transform(self, value):
+        return value
+
+def likert_chart_json(counts, questions, scale, percentages, width, xlabel):
+    """
+    Diverging stacked bar chart, see `plot_likert_bars()`.
+    """
+    return {
+        "type":        "likert",
+        "counts":      [[float(count) for count in row] for row in counts],
+        "questions":   [str(question) for question in questions],
+        "scale":       list(scale),
+        "percentages": bool(percentages),
+        "width":       float(width),
+        "xlabel":      xlabel,
+    }
+
+def bar_chart_json(labels, values, total, percentages, ylabel):
+    """
+    Bar chart with one bar per label. With `percentages` the values are shown
+    as percentages of `total`.
+    """
+    return {
+        "type":        "bar",
+        "labels":      [str(label) for label in labels],
+        "values":      [float(value) for value in values],
+        "total":       float(total),
+        "percentages": bool(percentages),
+        "ylabel":      ylabel,
+    }
+
+def histogram_json(edges, values, percentages, xlabel, ylabel):
+    """
+    Histogram with the given bin edges and bar heights. With `percentages` the
+    heights are fractions, which are shown as percentages.
+    """
+    return {
+        "type":        "histogram",
+        "edges":       [float(edge) for edge in edges],
+        "values":      [float(value) for value in values],
+        "percentages": bool(percentages),
+        "xlabel":      xlabel,
+        "ylabel":      ylabel,
+    }
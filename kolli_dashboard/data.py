@@ -5,252 +5,971 @@
 # This source code is licensed under the BSD 3-Clause License found in the
 # LICENSE file in the root directory of this source tree.
 
-from .utils import src_dir, scale_minus_plus, to_scale_minus_plus, checkbox_to_scale_minus_plus
-from shiny  import reactive, render
+from .cache         import cache_lookup, cache_store, cached, image_cache, result_cache
+from .charts        import likert_png
+from .client_charts import bar_chart_json, chart_mode, histogram_json, likert_chart_json
+from .plot_pool     import png_result
+from .repairs       import repairs, run_repairs
+from .store         import read_columns, read_labels, read_manifest, write_manifest, write_part
+from .utils         import src_dir, scale_minus_plus, scale_minus_plus_dtype, series_to_scale_minus_plus, series_checkbox_to_scale_minus_plus
+from collections    import OrderedDict
+from pathlib        import Path
+from shiny          import reactive, render
+from shiny.session  import get_current_session
+from textwrap       import wrap
 
+import asyncio
+import codecs
+import hashlib
+import io
+import logging
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
+import numpy as np
+import os
 import pandas as pd
-import plot_likert
+import tempfile
+
+data_csv   = src_dir / "data" / "data.csv"
+labels_csv = src_dir / "data" / "labels.csv"
+
+reload_interval  = float(os.environ.get("DATA_RELOAD_INTERVAL", "10"))
+query_cache_size = int(os.environ.get("QUERY_CACHE_SIZE", "256"))
+logger           = logging.getLogger(__name__)
+
+questnnr_parts   = ["ROUND", "TEACHER", "LECTURE", "PHASE"]
+metadata_columns = ["CASE", "QUESTNNR", "STARTED", *questnnr_parts, "FAMILY"]
+bitmap_types     = ["plus_minus", "checkbox_plus_minus", "numeric"]
+bitmap_columns   = ["TEACHER", "LECTURE"]
+cube_types       = ["plus_minus", "checkbox_plus_minus"]
 
 def __init__():
     """
     Read in data files when the module is first imported. Returns a dictionary
     with the following properties:
     
-     * `data`: A dataframe with the survey results
+     * `data`: A dataframe with the survey results, including the parts of the
+       questionnaire name as columns `ROUND`, `TEACHER`, `LECTURE` and `PHASE`
+       and the questionnaire family as column `FAMILY`, sorted by family and
+       start time
+     * `partitions`: Row range of each questionnaire family in `data`
+     * `bitmaps`: Packed bitset of the responses for each answer of each
+       question and each teacher and lecture, used by `query_surveys()`
+     * `value_counts`: Number of responses for each bitset in `bitmaps`
+     * `cube`: Pre-aggregated answers of the likert questions, see `_count_cube()`
      * `labels`: A dataframe with the question labels
+     * `label_index`: A dictionary with the label and type of each question
+     * `rename_maps`: Column renamings built by `rename_map()` for this data
+     * `queries`: Results of `query_surveys()` for this data, least recently used first
      * `max_date`: A string with the formatted date of the last survey
      * `teachers`: A list of the teacher IDs
+     * `lectures`: A list of the lecture IDs
+     * `stamp`: Modification times and sizes of the CSV files that were read
+     * `store`: Manifest of the store in `data/cache` or `None`
+
+    Parsing and cleaning the CSV files takes a few seconds. Therefore the cleaned
+    dataframes are kept in a binary store in `data/cache`, to which new exports
+    only add their new responses. See `_ingest()`.
+
+    To save memory in each worker process, only the metadata columns and the
+    columns declared by the survey pages with `register_columns()` are kept in
+    `answers`. All other columns are read from the store on first use, see
+    `load_columns()`.
+
+    The survey pages find their responses with `_family_rows()`, which only
+    looks up the rows of the requested families instead of filtering all answers.
     """
-    # Read data files
-    data    = pd.read_csv(str(src_dir / "data" / "data.csv"),   encoding="utf-16", sep="\t", quotechar='"', decimal=".")
-    labels  = pd.read_csv(str(src_dir / "data" / "labels.csv"), encoding="utf-16", sep="\t", quotechar='"', decimal=".")
+    stamp = _data_files_stamp()
 
-    data["STARTED"] = pd.to_datetime(data["STARTED"])
+    try:
+        manifest = _ingest()
+        labels   = read_labels(manifest)
+        registry = {*metadata_columns, *column_registry}
+        columns  = dict.fromkeys(column for part in manifest["parts"] for column in part["columns"])
+        data     = read_columns(manifest, [column for column in columns if column in registry])
+    except (ImportError, OSError, TypeError, ValueError):
+        # Without a writable store all responses are cleaned and kept in memory
+        manifest     = None
+        data, labels = _read_and_clean()
+
+    label_index      = _label_index(labels)
+    data             = data.reset_index(drop=True)
+    bitmaps, counts  = _bitmap_index(data, label_index)
+    data, partitions = _partition(data)
+    cube             = _count_cube(data, label_index)
 
-    # Remove dummy responses
-    data = data[data["CASE"] != 242]
-    data = data[data["CASE"] != 432]
-    data = data[data["CASE"] != 523]
-    data = data[data["CASE"] != 553]
+    _data = data[data["ROUND"].isin(["R1", "R2", "R3"])]
+
+    return {
+        "answers":      data,
+        "partitions":   partitions,
+        "bitmaps":      bitmaps,
+        "value_counts": counts,
+        "cube":         cube,
+        "labels":       labels,
+        "label_index":  label_index,
+        "rename_maps":  {},
+        "queries":      OrderedDict(),
+        "max_date":     data["STARTED"].max().strftime('%d.%m.%Y'),
+        "teachers":     _data["TEACHER"].unique().tolist(),
+        "lectures":     _data["LECTURE"].unique().tolist(),
+        "stamp":        stamp,
+        "store":        manifest,
+    }
 
-    # Repair survey that was accidentally run for the wrong teacher
-    filtered_rows = data[(data["QUESTNNR"] == "R1-SILA-1") & (data["STARTED"].dt.date == pd.to_datetime("2024-10-16").date())]
-    data.loc[filtered_rows.index, "QUESTNNR"] = "R1-KAWE-1"
+def _label_index(labels):
+    """
+    Lookup table from question ID to its label and type. Like the former scan
+    of the labels dataframe, the first entry wins if an ID appears twice.
+    """
+    labels = labels.drop_duplicates("VAR")
+    return {var: {"label": label, "type": kind} for var, label, kind in zip(labels["VAR"], labels["LABEL"], labels["TYPE"])}
 
-    # Make initial pre-survey compatible with the later version
-    data["VU03_01"] = data["VU03_01"].clip(upper=4)
-    data["VU03_02"] = data["VU03_02"].clip(upper=4)
-    data["VU03_03"] = data["VU03_03"].clip(upper=4)
-    data["VU03_04"] = data["VU03_04"].clip(upper=4)
+def _data_files_stamp():
+    """
+    Cheap fingerprint of the CSV files, which is polled to detect a new export.
+    """
+    return tuple((path.stat().st_mtime_ns, path.stat().st_size) for path in (data_csv, labels_csv))
 
-    data.loc[data["VU03_01"].notnull(), "V204_02"] = data["VU03_01"]
-    data.loc[data["VU01_01"].notnull(), "V202_01"] = data["VU01_01"]
-    data.loc[data["VU03_02"].notnull(), "V201_02"] = data["VU03_02"]
+def _read_and_clean():
+    """
+    Parse the SoSci Survey export and apply all data fixes. Returns the cleaned
+    survey results and the question labels as two dataframes.
+    """
+    # Read data files
+    data    = pd.read_csv(str(data_csv),   encoding="utf-16", sep="\t", quotechar='"', decimal=".")
+    labels  = pd.read_csv(str(labels_csv), encoding="utf-16", sep="\t", quotechar='"', decimal=".")
+    return _clean(data, labels), labels
 
-    data["V203_01"] = data["V203_01"].fillna(0)
-    data["V210_01"] = data.apply(lambda row: "Erwartungen: " + str(row["VU02_01"]) if pd.notnull(row["VU02_01"]) else row["V210_01"], axis=1)
+def _clean(data, labels):
+    """
+    Apply all data fixes to the raw survey results. All steps work on whole
+    columns, so that the runtime stays low even with many more responses. The
+    fixes for individual surveys are defined as rules in `repairs.py`.
+    """
+    data["STARTED"] = pd.to_datetime(data["STARTED"])
 
-    data.drop(["VU01_01", "VU02_01", "VU03_01", "VU03_02"], axis=1, inplace=True)
+    # Apply the data fixes from `repairs.py`
+    data, _ = run_repairs(data, repairs)
 
-    # Question DR06_01 from survey R1-DIRA-PROG1-2-special can be used for the student mid survey, too
-    try:
-        dira2_special = data[(data["QUESTNNR"] == "R1-DIRA-2-special") & (data["DR06_01"].notnull())].copy()
-        dira2_special["QUESTNNR"] = "R1-DIRA-2"
-        dira2_special.loc[:,"ZW04_01"] = dira2_special["DR06_01"]
-        dira2_special.drop("DR06_01", axis=1)
-        data = pd.concat([data, dira2_special], ignore_index=True)
-    except KeyError:
-        pass
-
-    # Survey S-KAWE-SENG-3 uses slightly different wording for some questions
-    for target, source in [
-        ("AB09_01", "AB16_01"),
-        ("AB09_02", "AB16_02"),
-        ("AB09_03", "AB16_03"),
-        ("AB09_04", "AB16_04"),
-        ("AB09_05", "AB16_05"),
-        ("AB09_06", "AB16_06"),
-        ("AB09_07", "AB16_07"),
-        ("AB14_06", "AB17_06"),
-        ("AB14_07", "AB17_07"),
-        ("AB14_08", "AB17_08"),
-        ("AB14_09", "AB17_09"),
-    ]:
-        mask = data[source].notnull()
-        data.loc[mask, target] = data.loc[mask, source]
-
-    # Replace missing numerical values with minus one
-    data["V203_01"] = data["V203_01"].fillna(-1)
-    data["AA02_01"] = data["AA02_01"].fillna(-1)
-
-    # Convert plus_minus likert questions to strings
+    # Convert plus_minus likert questions to ordered categories, so that filters
+    # and statistics work on the small integer codes instead of strings
     for label in labels[labels["TYPE"] == "plus_minus"].itertuples():
         try:
-            data[label.VAR] = data[label.VAR].apply(to_scale_minus_plus)
+            data[label.VAR] = series_to_scale_minus_plus(data[label.VAR])
         except KeyError:
             pass
     
     for label in labels[labels["TYPE"] == "checkbox_plus_minus"].itertuples():
         try:
-            data[label.VAR] = data[label.VAR].apply(checkbox_to_scale_minus_plus)
+            data[label.VAR] = series_checkbox_to_scale_minus_plus(data[label.VAR])
         except KeyError:
             pass
 
-    # Return final result
-    _data = data[data["QUESTNNR"].str.startswith(("R1-", "R2-", "R3-"))]
+    # Split the questionnaire names once, so that the survey pages can filter
+    # and count teachers and lectures on plain columns
+    data["QUESTNNR"] = data["QUESTNNR"].astype("category")
+
+    questnnrs = data["QUESTNNR"].cat.categories
+    parts     = pd.DataFrame([_split_questnnr(questnnr) for questnnr in questnnrs], index=questnnrs, columns=questnnr_parts)
+
+    parts["FAMILY"] = [_questnnr_family(questnnr) for questnnr in questnnrs]
+
+    for column in [*questnnr_parts, "FAMILY"]:
+        data[column] = data["QUESTNNR"].map(parts[column]).astype("category")
+
+    return data
+
+def _split_questnnr(questnnr):
+    """
+    Split a questionnaire name like `R1-KAWE-PROG1-2` or `KG-R3-MIDE-WEBPROG`
+    into round, teacher, lecture and phase. The phase is missing for surveys
+    without phases. All parts are missing for questionnaires outside of the
+    rounds, e.g. `LERNRAUM-1`.
+    """
+    parts = questnnr.split("-")
+
+    if parts[0] == "KG":
+        parts = ["-".join(parts[:2]), *parts[2:]]
+
+    if parts[0] not in ("R1", "R2", "R3", "KG-R3") or len(parts) < 3:
+        return None, None, None, None
+
+    return parts[0], parts[1], parts[2], "-".join(parts[3:]) or None
+
+def _questnnr_family(questnnr):
+    """
+    Questionnaire name without teacher and lecture, e.g. `R1-2` for all surveys
+    `R1-*-*-2` or `R2` for all surveys `R2-*-*`. Questionnaires outside of the
+    rounds are a family of their own, e.g. `LERNRAUM-1`.
+    """
+    round, _, _, phase = _split_questnnr(questnnr)
+
+    if not round:
+        return questnnr
+
+    return f"{round}-{phase}" if phase else round
+
+def _partition(data):
+    """
+    Sort the survey results by questionnaire family, so that the responses of
+    each family are stored in one contiguous block of rows, and by start time
+    within each family for the date filter of `_family_rows()`. Returns the sorted
+    data and the start and stop row of each family. The index keeps the row
+    number in export order, so that combined families can be put back into
+    export order.
+    """
+    codes = data["FAMILY"].cat.codes.to_numpy()
+    order = np.lexsort((data["STARTED"].to_numpy(), codes))
+    data  = data.take(order)
+    codes = codes[order]
+
+    families   = data["FAMILY"].cat.categories
+    starts     = np.searchsorted(codes, np.arange(len(families)), side="left")
+    stops      = np.searchsorted(codes, np.arange(len(families)), side="right")
+    partitions = {family: (int(start), int(stop)) for family, start, stop in zip(families, starts, stops) if stop > start}
+
+    return data, partitions
+
+def _bitmap_index(data, label_index):
+    """
+    One packed bitset for each answer of each scale and numeric question and for
+    each teacher and lecture, with one bit per response in export order. Missing
+    answers have no bitset. Returns the bitsets and the number of set bits.
+    """
+    bitmaps = {}
+    counts  = {}
+
+    for var in data.columns:
+        if var not in bitmap_columns and label_index.get(var, {}).get("type") not in bitmap_types:
+            continue
+
+        if isinstance(data[var].dtype, pd.CategoricalDtype):
+            codes  = data[var].cat.codes.to_numpy()
+            values = data[var].cat.categories
+        else:
+            codes, values = pd.factorize(data[var], sort=True)
+
+        bitmaps[var] = {value: np.packbits(codes == code) for code, value in enumerate(values)}
+        counts[var]  = dict(zip(values, np.bincount(codes[codes >= 0], minlength=len(values)).tolist()))
+
+    return bitmaps, counts
+
+def _count_cube(data, label_index):
+    """
+    Pre-aggregated answers of the likert questions: the number of responses for
+    each value of `scale_minus_plus` per questionnaire, day and question. Likert
+    charts and statistics without correlation filters only sum up the cells that
+    match the sidebar filters, see `_cube_counts()`. Returns a dictionary with the
+    family, teacher, lecture and day of each cell, the cell of each response
+    (-1 without questionnaire), the position of each question and the counts
+    with the shape (cells, questions, values).
+    """
+    # The date filter compares the start time with midnight of the first and the
+    # last day. Responses started exactly at midnight get cells of their own, so
+    # that the last day of the date range can be matched exactly.
+    started = data["STARTED"]
+    day     = started.dt.normalize()
+    keys    = pd.DataFrame({"QUESTNNR": data["QUESTNNR"], "DAY": day, "MIDNIGHT": started == day})
+    groups  = keys.groupby(["QUESTNNR", "DAY", "MIDNIGHT"], observed=True, dropna=False)
+    cell    = groups.ngroup().to_numpy()
+    cells   = groups.size().index.to_frame(index=False)
+    valid   = cells["QUESTNNR"].notna().to_numpy()
+
+    # Drop the cells of responses without questionnaire and renumber the others
+    renumber = np.where(valid, np.cumsum(valid) - 1, -1)
+    cell     = renumber[cell]
+    cells    = cells[valid].reset_index(drop=True)
+
+    parts = data[["QUESTNNR", *bitmap_columns, "FAMILY"]].drop_duplicates("QUESTNNR").set_index("QUESTNNR")
+    parts = parts.astype(object).fillna("")
+
+    cube = {
+        "family":   parts["FAMILY"].reindex(cells["QUESTNNR"]).to_numpy(),
+        "teacher":  parts["TEACHER"].reindex(cells["QUESTNNR"]).to_numpy(),
+        "lecture":  parts["LECTURE"].reindex(cells["QUESTNNR"]).to_numpy(),
+        "day":      cells["DAY"].to_numpy(),
+        "midnight": cells["MIDNIGHT"].to_numpy(dtype=bool),
+        "cell":     cell,
+        "vars":     {},
+        "counts":   np.zeros((len(cells), 0, len(scale_minus_plus)), dtype=np.int32),
+    }
+
+    return _extend_cube(cube, data, label_index)
+
+def _extend_cube(cube, data, label_index):
+    """
+    Copy of a cube from `_count_cube()` with the counts of the likert questions
+    in `data` that are not part of the cube yet. `data` must have the responses
+    of the cube in the same order. The cells are kept, so only the new questions
+    are counted.
+    """
+    vars = [
+        var for var in data.columns
+        if var not in cube["vars"]
+        and label_index.get(var, {}).get("type") in cube_types
+        and isinstance(data[var].dtype, pd.CategoricalDtype)
+        and data[var].cat.categories.tolist() == scale_minus_plus
+    ]
+
+    if not vars:
+        return cube
+
+    cell     = cube["cell"]
+    n_cells  = cube["counts"].shape[0]
+    n_values = len(scale_minus_plus)
+    counts   = np.zeros((n_cells, len(vars), n_values), dtype=np.int32)
+
+    for i, var in enumerate(vars):
+        codes        = data[var].cat.codes.to_numpy()
+        answered     = (codes >= 0) & (cell >= 0)
+        counts[:, i] = np.bincount(cell[answered] * n_values + codes[answered], minlength=n_cells * n_values).reshape(n_cells, n_values)
 
     return {
-        "answers":  data,
-        "labels":   labels,
-        "max_date": data["STARTED"].max().strftime('%d.%m.%Y'),
-        "teachers": _data["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist(),
-        "lectures": _data["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist(),
+        **cube,
+        "vars":   {**cube["vars"], **{var: len(cube["vars"]) + i for i, var in enumerate(vars)}},
+        "counts": np.concatenate([cube["counts"], counts], axis=1),
     }
 
+def _ingest():
+    """
+    Bring the store in `data/cache` up to date with the SoSci export and return
+    its manifest. SoSci always exports all responses, so a new export usually
+    starts with the bytes of the last one. Then only the rows after them are
+    parsed, cleaned and appended to the store as a new partition. The whole
+    store is rebuilt when the start of the export changed or the export got
+    shorter, and when `labels.csv` or the cleaning code change.
+    """
+    pipeline = _files_hash(labels_csv, Path(__file__), src_dir / "repairs.py", src_dir / "utils.py")
+    content  = data_csv.read_bytes()
+    export   = _bytes_hash(content)
+    manifest = read_manifest()
+
+    if not manifest or manifest.get("pipeline") != pipeline:
+        manifest = {"pipeline": pipeline, "export": None, "size": 0, "labels": None, "parts": []}
+
+    if manifest["export"] == export:
+        return manifest
+
+    # The hash of the last export is also the hash of the bytes it contributed
+    size = manifest["size"]
+
+    if size and (len(content) < size or _bytes_hash(content[:size]) != manifest["export"]):
+        manifest = {**manifest, "export": None, "size": 0, "parts": []}
+        size     = 0
+
+    labels = pd.read_csv(str(labels_csv), encoding="utf-16", sep="\t", quotechar='"', decimal=".")
+
+    if not manifest["labels"]:
+        manifest["labels"] = write_part(f"labels-{pipeline}", labels)["file"]
+
+    if size:
+        # Only the header and the appended rows of the UTF-16 export are decoded
+        codec = "utf-16-be" if content.startswith(codecs.BOM_UTF16_BE) else "utf-16-le"
+
+        with io.TextIOWrapper(io.BytesIO(content), encoding="utf-16") as file:
+            header = file.readline()
+
+        rows = io.StringIO(header + content[size:].decode(codec))
+    else:
+        rows = io.StringIO(content.decode("utf-16"))
+
+    data = pd.read_csv(rows, sep="\t", quotechar='"', decimal=".")
+
+    if data.shape[0]:
+        part = write_part(f"answers-{pipeline}-{export}", _clean(data, labels))
+        manifest["parts"].append(part)
+
+    manifest["export"] = export
+    manifest["size"]   = len(content)
+    write_manifest(manifest)
+
+    return manifest
+
+def _files_hash(*paths):
+    return _bytes_hash(*(path.read_bytes() for path in paths))
+
+def _bytes_hash(*contents):
+    sha256 = hashlib.sha256()
+
+    for content in contents:
+        sha256.update(content)
+
+    return sha256.hexdigest()[:16]
+
+# Columns of the survey results that the survey pages read, see `register_columns()`
+column_registry = {}
+
 data    = __init__()
 version = "2.0.1"
 
-# Reactive values for correlation filters
-correlation_filters = {
-    "round1_student1": {
-        "V201_01": reactive.value([]),
-        "V201_02": reactive.value([]),
-        "V204_01": reactive.value([]),
-        "V204_02": reactive.value([]),
-        "V203_01": reactive.value([-1, 11]),
-        "VU03_03": reactive.value([]),
-        "VU03_04": reactive.value([]),
-        "V209_01": reactive.value([]),
-        "V209_02": reactive.value([]),
-        "V209_03": reactive.value([]),
-        "V209_04": reactive.value([]),
-        "V209_05": reactive.value([]),
-        "V209_06": reactive.value([]),
-        "V209_07": reactive.value([]),
-        "V209_08": reactive.value([]),
-        "V209_09": reactive.value([]),
-    },
-    "round1_student2": {
-        "ZW04_01": reactive.value([]),
-        "ZW04_02": reactive.value([]),
-        "ZW04_03": reactive.value([]),
-        "ZW04_04": reactive.value([]),
-        "ZW04_05": reactive.value([]),
-        "ZW04_06": reactive.value([]),
-        "ZW04_07": reactive.value([]),
-        "ZW04_08": reactive.value([]),
-    },
-    "round1_student3": {
-        "AB03_01": reactive.value([]),
-        "AB03_02": reactive.value([]),
-        "AB03_03": reactive.value([]),
-        "AB03_04": reactive.value([]),
-        "AB07_01": reactive.value([]),
-        "AB07_02": reactive.value([]),
-        "AB07_03": reactive.value([]),
-        "AB07_04": reactive.value([]),
-        "AB07_05": reactive.value([]),
-        "AB07_06": reactive.value([]),
-        "AB07_07": reactive.value([]),
-        "AB07_08": reactive.value([]),
-        "AB07_09": reactive.value([]),
-        "AB09_01": reactive.value([]),
-        "AB09_02": reactive.value([]),
-        "AB09_03": reactive.value([]),
-        "AB09_04": reactive.value([]),
-        "AB09_05": reactive.value([]),
-        "AB09_06": reactive.value([]),
-        "AB09_07": reactive.value([]),
-        "AB14_06": reactive.value([]),
-        "AB14_07": reactive.value([]),
-        "AB14_08": reactive.value([]),
-        "AB14_09": reactive.value([]),
-    },
-    "revised": {
-        "R201_01": reactive.value([]),
-        "R201_02": reactive.value([]),
-        "R201_03": reactive.value([]),
-        "R201_04": reactive.value([]),
-        "R201_05": reactive.value([]),
-        "R202_02": reactive.value([]),
-        "R202_03": reactive.value([]),
-        "R202_04": reactive.value([]),
-        "R202_05": reactive.value([]),
-        "R202_06": reactive.value([]),
-        "R204_01": reactive.value([]),
-    },
-    "special_DIRA_r1": {
-        "DR06_01": reactive.value([]),
-        "DR06_08": reactive.value([]),
-    },
-    "special_DESC_r2_general": {
-        "AA01_01": reactive.value([]),
-        "AA01_02": reactive.value([]),
-        "AA01_03": reactive.value([]),
-        "AA01_04": reactive.value([]),
-        "AA02_01": reactive.value([-1, 11]),
-        "AA03_01": reactive.value([]),
-        "AA03_02": reactive.value([]),
-        "AA03_03": reactive.value([]),
-        "AA03_04": reactive.value([]),
-    },
-    "special_DESC_r2_specific": {
-        "AS01_01": reactive.value([]),
-        "AS01_02": reactive.value([]),
-        "AS01_03": reactive.value([]),
-        "AS02_01": reactive.value([]),
-        "AS02_02": reactive.value([]),
-        "AS02_03": reactive.value([]),
-        "AS02_04": reactive.value([]),
-        "AS02_05": reactive.value([]),
-    },
-}
+# Reactive version number of `data`. All calculations that read the survey
+# results must call this, so that they are invalidated when a new export is
+# copied into the `data` directory while the server is running.
+dataset_version = reactive.value(1)
 
-def get_label(var):
-    return data["labels"].loc[data["labels"]["VAR"] == var, "LABEL"].values[0]
+@reactive.poll(_data_files_stamp, reload_interval)
+def _data_files():
+    return _data_files_stamp()
+
+@reactive.effect
+def _():
+    global _reload_task
+
+    if _data_files() != data["stamp"] and (_reload_task is None or _reload_task.done()):
+        _reload_task = asyncio.create_task(_reload_data())
+
+async def _reload_data():
+    """
+    Re-read the CSV files in a worker thread, so that the open sessions stay
+    responsive, and swap in the new data. The swap, the version bump and the
+    flush hold `reactive.lock()` like the flushes of the sessions, so that no
+    calculation ever sees a mix of old and new data. If the files cannot be
+    read, e.g. because they are still being copied, the old data is kept until
+    the next change.
+    """
+    while _data_files_stamp() != data["stamp"]:
+        try:
+            new_data = await asyncio.to_thread(__init__)
+        except Exception:
+            logger.exception("Could not reload the survey data, keeping the previous version")
+            return
+
+        async with reactive.lock():
+            data.update(new_data)
+
+            with reactive.isolate():
+                dataset_version.set(dataset_version() + 1)
+
+            await reactive.flush()
+
+_reload_task = None
+
+def new_correlation_filters():
+    """
+    Reactive values for the correlation filters of each survey page. Each session
+    gets its own filters in `app.server()`, so that changing them only updates
+    the session of the analyst. The cached query results are shared anyway, as
+    `survey_spec()` only takes the selected values into account.
+    """
+    return {
+        "round1_student1": {
+            "V201_01": reactive.value([]),
+            "V201_02": reactive.value([]),
+            "V204_01": reactive.value([]),
+            "V204_02": reactive.value([]),
+            "V203_01": reactive.value([-1, 11]),
+            "VU03_03": reactive.value([]),
+            "VU03_04": reactive.value([]),
+            "V209_01": reactive.value([]),
+            "V209_02": reactive.value([]),
+            "V209_03": reactive.value([]),
+            "V209_04": reactive.value([]),
+            "V209_05": reactive.value([]),
+            "V209_06": reactive.value([]),
+            "V209_07": reactive.value([]),
+            "V209_08": reactive.value([]),
+            "V209_09": reactive.value([]),
+        },
+        "round1_student2": {
+            "ZW04_01": reactive.value([]),
+            "ZW04_02": reactive.value([]),
+            "ZW04_03": reactive.value([]),
+            "ZW04_04": reactive.value([]),
+            "ZW04_05": reactive.value([]),
+            "ZW04_06": reactive.value([]),
+            "ZW04_07": reactive.value([]),
+            "ZW04_08": reactive.value([]),
+        },
+        "round1_student3": {
+            "AB03_01": reactive.value([]),
+            "AB03_02": reactive.value([]),
+            "AB03_03": reactive.value([]),
+            "AB03_04": reactive.value([]),
+            "AB07_01": reactive.value([]),
+            "AB07_02": reactive.value([]),
+            "AB07_03": reactive.value([]),
+            "AB07_04": reactive.value([]),
+            "AB07_05": reactive.value([]),
+            "AB07_06": reactive.value([]),
+            "AB07_07": reactive.value([]),
+            "AB07_08": reactive.value([]),
+            "AB07_09": reactive.value([]),
+            "AB09_01": reactive.value([]),
+            "AB09_02": reactive.value([]),
+            "AB09_03": reactive.value([]),
+            "AB09_04": reactive.value([]),
+            "AB09_05": reactive.value([]),
+            "AB09_06": reactive.value([]),
+            "AB09_07": reactive.value([]),
+            "AB14_06": reactive.value([]),
+            "AB14_07": reactive.value([]),
+            "AB14_08": reactive.value([]),
+            "AB14_09": reactive.value([]),
+        },
+        "revised": {
+            "R201_01": reactive.value([]),
+            "R201_02": reactive.value([]),
+            "R201_03": reactive.value([]),
+            "R201_04": reactive.value([]),
+            "R201_05": reactive.value([]),
+            "R202_02": reactive.value([]),
+            "R202_03": reactive.value([]),
+            "R202_04": reactive.value([]),
+            "R202_05": reactive.value([]),
+            "R202_06": reactive.value([]),
+            "R204_01": reactive.value([]),
+        },
+        "special_DIRA_r1": {
+            "DR06_01": reactive.value([]),
+            "DR06_08": reactive.value([]),
+        },
+        "special_DESC_r2_general": {
+            "AA01_01": reactive.value([]),
+            "AA01_02": reactive.value([]),
+            "AA01_03": reactive.value([]),
+            "AA01_04": reactive.value([]),
+            "AA02_01": reactive.value([-1, 11]),
+            "AA03_01": reactive.value([]),
+            "AA03_02": reactive.value([]),
+            "AA03_03": reactive.value([]),
+            "AA03_04": reactive.value([]),
+        },
+        "special_DESC_r2_specific": {
+            "AS01_01": reactive.value([]),
+            "AS01_02": reactive.value([]),
+            "AS01_03": reactive.value([]),
+            "AS02_01": reactive.value([]),
+            "AS02_02": reactive.value([]),
+            "AS02_03": reactive.value([]),
+            "AS02_04": reactive.value([]),
+            "AS02_05": reactive.value([]),
+        },
+    }
+
+def register_columns(*columns):
+    """
+    Declare the columns of the survey results that a survey page reads. Each
+    survey module lists its columns when it is imported. The columns are loaded
+    right away, if they are not in memory yet, and kept in memory after each
+    reload of the data. Columns that are not part of the export are skipped.
+    """
+    column_registry.update(dict.fromkeys(columns))
+
+    stored = _stored_columns()
+    load_columns(*[column for column in columns if column in stored or column in data["answers"]])
+
+def load_columns(*columns):
+    """
+    Add columns that are not in memory to `data["answers"]`, e.g. questions that
+    no survey page has declared with `register_columns()`. They are read from the
+    store on first use and then kept in memory, together with their bitsets and
+    their counts in the cube, see `_extend_cube()`. Returns the answers. Raises
+    a `KeyError` for columns that are not part of the export.
+    """
+    answers = data["answers"]
+    missing = [column for column in columns if column not in answers]
+
+    if missing:
+        unknown = [column for column in missing if column not in _stored_columns()]
+
+        if unknown:
+            raise KeyError(unknown)
+
+        # The store has the export order like the bitsets, which is the index of the sorted answers
+        loaded          = read_columns(data["store"], missing)
+        bitmaps, counts = _bitmap_index(loaded, data["label_index"])
+        loaded          = loaded.reindex(answers.index)
+        data["answers"] = pd.concat([answers, loaded], axis=1)
+
+        data["bitmaps"].update(bitmaps)
+        data["value_counts"].update(counts)
+        data["cube"] = _extend_cube(data["cube"], loaded, data["label_index"])
+
+    return data["answers"]
+
+def _stored_columns():
+    """
+    Columns of all partitions of the store, an empty set without a store.
+    """
+    if not data["store"]:
+        return set()
+
+    return {column for part in data["store"]["parts"] for column in part["columns"]}
+
+def _family_rows(families, start=None, end=None):
+    """
+    Row positions in `data["answers"]` of the survey results of the given
+    questionnaire families (see `_questnnr_family()`) that were started between
+    `start` and `end`. This only looks up the row range of each family in
+    `data["partitions"]`, so that the survey pages don't need to scan all
+    responses when a filter changes. As the responses of each family are sorted
+    by start time, the date range is found by binary search. Several families
+    are combined in export order.
+    """
+    answers = data["answers"]
+    started = answers["STARTED"].to_numpy()
+    ranges  = []
+
+    for family in families:
+        if family not in data["partitions"]:
+            continue
+
+        first, stop = data["partitions"][family]
 
-def plot_likert_chart(input, data, *vars, width=0.15):
-    plot_percentage = input.number_format() == "percent"
+        if start is not None:
+            first += int(np.searchsorted(started[first:stop], pd.Timestamp(start).to_datetime64(), side="left"))
+        if end is not None:
+            stop = first + int(np.searchsorted(started[first:stop], pd.Timestamp(end).to_datetime64(), side="right"))
 
-    df = data[[*vars]]
-    df = df.rename(columns={var: get_label(var) for var in vars})
+        ranges.append(np.arange(first, stop))
 
-    # Bug in plot-likert? Crashes with percentages if there a no answers for one question
-    df1 = df.copy()
-    df1.dropna(axis=1, how="all", inplace=True)
+    if not ranges:
+        return np.arange(0)
+    elif len(ranges) == 1:
+        return ranges[0]
 
-    if df1.shape[1]:
-        df = df1
+    rows = np.concatenate(ranges)
+    return rows[np.argsort(answers.index.to_numpy()[rows], kind="stable")]
+
+def survey_spec(families, teachers=None, lectures=None, start=None, end=None, correlation=None):
+    """
+    Normalized filter of a survey page for `query_surveys()`: the questionnaire
+    families, the teachers and lectures (`None` for no filter), the date range
+    and the correlation filters of the page (see `new_correlation_filters()`).
+    Reading the correlation filters here makes the calling calculation depend on
+    them. Equal filters give equal specs, no matter in which order values were
+    chosen, so that all sessions share the results. Correlation filters that
+    don't filter anything are left out, see `_correlation_filter()`.
+    """
+    correlation = [(var, _correlation_filter(var, value.get())) for var, value in (correlation or {}).items()]
+
+    return (
+        tuple(families),
+        tuple(sorted(teachers)) if teachers is not None else None,
+        tuple(sorted(lectures)) if lectures is not None else None,
+        pd.Timestamp(start) if start is not None else None,
+        pd.Timestamp(end)   if end   is not None else None,
+        tuple((var, selected) for var, selected in correlation if selected is not None),
+    )
+
+def _correlation_filter(var, selected):
+    """
+    Normalized selection of a correlation filter or `None`, if it doesn't filter
+    anything: when no answers are selected or when the range of a numeric
+    question covers the answers of all responses, like the untouched sliders.
+    Then the likert charts can still use `_count_cube()`.
+    """
+    if not selected:
+        return None
+
+    if var not in data["answers"]:
+        load_columns(var)
+
+    selected = tuple(sorted(selected))
+    counts   = data["value_counts"].get(var)
+
+    if data["label_index"].get(var, {}).get("type") == "numeric" and counts:
+        answered = sum(counts.values())
+        values   = [value for value, count in counts.items() if count]
+
+        if answered == data["answers"].shape[0] and selected[0] <= min(values) and max(values) <= selected[-1]:
+            return None
+
+    return selected
+
+def query_surveys(spec):
+    """
+    Survey results matching a spec from `survey_spec()`. The matching rows are
+    kept in a cache shared by all sessions of the process, so that sessions
+    with the same filters, e.g. the default filters, only run the query once.
+    The least recently used results are dropped after `QUERY_CACHE_SIZE` specs.
+
+    The result is a view on the answers, which only holds the spec and the row
+    numbers. The values are only copied for the columns that are actually used,
+    with `survey_columns()`, `survey_column()` and `survey_count()`.
+    """
+    queries = data["queries"]
+
+    if spec in queries:
+        queries.move_to_end(spec)
     else:
-        plot_percentage = False
+        queries[spec] = _run_query(spec)
 
-    # See: https://gist.github.com/nmalkin/9a31437d3be18d637d0b63e54926c491
-    if plot_percentage:
-        plot_likert.__internal__.BAR_LABEL_FORMAT = "%.1f"
+        if len(queries) > query_cache_size:
+            queries.popitem(last=False)
+
+    return {"spec": spec, "answers": data["answers"], "rows": queries[spec]}
+
+def survey_columns(surveys, *columns):
+    """
+    Dataframe with the given columns of a view from `query_surveys()`. Columns
+    that are not in memory are loaded with `load_columns()`, which raises a
+    `KeyError` like pandas, if one of the columns doesn't exist.
+    """
+    answers   = surveys["answers"]
+    positions = answers.columns.get_indexer(columns)
+
+    if (positions < 0).any():
+        answers   = load_columns(*columns)
+        positions = answers.columns.get_indexer(columns)
+
+    return answers.iloc[surveys["rows"], positions]
+
+def survey_column(surveys, column):
+    return survey_columns(surveys, column)[column]
+
+def survey_count(surveys):
+    return len(surveys["rows"])
+
+def _run_query(spec):
+    """
+    Row positions of `data["answers"]` that match a spec from `survey_spec()`.
+    The family and date range give ranges of rows. All other conditions are
+    checked on the bitsets of `data["bitmaps"]`, one after the other in the
+    order of `_plan_query()`, and only for the rows that are still left.
+    """
+    families, teachers, lectures, start, end, correlation = spec
+
+    rows   = _family_rows(families, start, end)
+    export = data["answers"].index.to_numpy()
+
+    for var, accepted in _plan_query(teachers, lectures, correlation):
+        if not rows.size:
+            break
+
+        rows = rows[_bitmap_matches(var, accepted, export[rows])]
+
+    return rows
+
+def _plan_query(teachers, lectures, correlation):
+    """
+    Conditions of a query as pairs of column and accepted values, the most
+    selective condition first. The selectivity is estimated from the number of
+    all responses with the accepted values. The selected answers of a question
+    are combined with OR, the conditions with AND. Numeric questions select a
+    range `[min, max]`.
+    """
+    conditions = []
+
+    for var, selected in [("TEACHER", teachers), ("LECTURE", lectures), *correlation]:
+        if selected is None:
+            continue
+
+        if data["label_index"].get(var, {}).get("type") == "numeric":
+            selected = [value for value in data["bitmaps"][var] if selected[0] <= value <= selected[1]]
+
+        conditions.append((var, selected))
+
+    counts = data["value_counts"]
+    return sorted(conditions, key=lambda condition: sum(counts[condition[0]].get(value, 0) for value in condition[1]))
+
+def _bitmap_matches(var, accepted, rows):
+    """
+    Boolean mask of the given rows (in export order) whose value of `var` is
+    one of the accepted values.
+    """
+    bitmaps = data["bitmaps"][var]
+    byte    = rows >> 3
+    shift   = 7 - (rows & 7)
+    mask    = np.zeros(len(rows), dtype=bool)
+
+    # `np.packbits()` puts the first row into the highest bit of each byte.
+    # Only the bytes of the given rows are read, not the whole bitsets.
+    for value in accepted:
+        if value in bitmaps:
+            mask |= ((bitmaps[value][byte] >> shift) & 1).astype(bool)
+
+    return mask
+
+def get_label(var):
+    return data["label_index"][var]["label"]
+
+def rename_map(*vars):
+    """
+    Mapping from the given question IDs to their labels, for `df.rename()`. The
+    mapping is built once for each group of questions and kept until the next
+    data reload.
+    """
+    try:
+        return data["rename_maps"][vars]
+    except KeyError:
+        return data["rename_maps"].setdefault(vars, {var: get_label(var) for var in vars})
+
+def _result_key(surveys, *parts):
+    """
+    Key for `result_cache` for a view from `query_surveys()`.
+    """
+    return (data["stamp"], surveys["spec"], *parts)
+
+def _cube_counts(spec, vars):
+    """
+    Number of answers for each value of `scale_minus_plus` of the given questions
+    for a spec from `survey_spec()`, summed up from the cells of `_count_cube()`.
+    Returns `None` if the answers must be counted from the responses instead,
+    because correlation filters apply, a question is not part of the cube or
+    the date range doesn't start and end at midnight.
+    """
+    families, teachers, lectures, start, end, correlation = spec
+    cube = data["cube"]
+
+    if correlation or any(var not in cube["vars"] for var in vars):
+        return None
+    if any(date is not None and date != date.normalize() for date in (start, end)):
+        return None
+
+    match = np.isin(cube["family"], families)
+
+    if teachers is not None:
+        match &= np.isin(cube["teacher"], teachers)
+    if lectures is not None:
+        match &= np.isin(cube["lecture"], lectures)
+    if start is not None:
+        match &= cube["day"] >= start.to_datetime64()
+    if end is not None:
+        match &= (cube["day"] < end.to_datetime64()) | ((cube["day"] == end.to_datetime64()) & cube["midnight"])
+
+    positions = [cube["vars"][var] for var in vars]
+    return cube["counts"][match][:, positions].sum(axis=0, dtype=np.int64)
+
+def likert_count_matrix(surveys, *vars):
+    """
+    Number of answers for each value of `scale_minus_plus` of the given questions,
+    one row per question. Without correlation filters the counts are taken from
+    the pre-aggregated cube, otherwise they are counted from the matching rows.
+
+    The matrix is cached for each view and group of questions and shared by the
+    likert chart and the statistics table, so that switching the display type or
+    the number format doesn't read the responses again. It must not be modified.
+    """
+    def compute():
+        counts = _cube_counts(surveys["spec"], vars)
+
+        if counts is None:
+            counts = _code_counts(survey_columns(surveys, *vars))
+
+        counts.setflags(write=False)
+        return counts
+
+    return cached(result_cache, _result_key(surveys, "likert_count_matrix", vars), compute)
+
+def _code_counts(df):
+    """
+    Number of answers for each value of `scale_minus_plus` in each column of `df`,
+    counted in a single pass: the category codes of each column are shifted into
+    a range of their own, so that one `np.bincount()` counts all columns at once.
+    """
+    n_values = len(scale_minus_plus) + 1
+    codes    = np.column_stack([_scale_codes(series) for _, series in df.items()])
+
+    # The first bin of each column takes the missing answers (code -1)
+    offsets = np.arange(codes.shape[1]) * n_values + 1
+    counts  = np.bincount((codes + offsets).ravel(), minlength=codes.shape[1] * n_values)
+
+    return counts.reshape(codes.shape[1], n_values)[:, 1:]
+
+def _scale_codes(series):
+    """
+    Category codes of the answers to a likert question, -1 for missing answers.
+    """
+    if series.dtype == scale_minus_plus_dtype:
+        return series.array.codes
     else:
-        plot_likert.__internal__.BAR_LABEL_FORMAT = "%.0f"
-
-    ax = plot_likert.plot_likert(
-        df              = df,
-        plot_scale      = scale_minus_plus,
-        plot_percentage = plot_percentage,
-        bar_labels      = True,
-        width           = width,
-        legend          = 0,
-    )
+        return pd.Categorical(series, categories=scale_minus_plus).codes
 
-    ax.set_xlabel("Anzahl Antworten")
-    return ax
+def likert_counts(surveys, *vars):
+    """
+    Number of answers for each value of `scale_minus_plus` for the given questions,
+    as needed by `plot_likert_bars()`. Questions without answers are skipped, unless
+    none of the questions has answers. Built from `likert_count_matrix()`.
+    """
+    def compute():
+        counts    = likert_count_matrix(surveys, *vars)
+        labels    = [rename_map(*vars)[var] for var in vars]
+        questions = counts.sum(axis=1) > 0
 
-def plot_multiple_choice_bar_chart(input, data, *vars):
-    fig, ax = plt.subplots()
-    df      = data[[var for var in vars]].astype(int).copy()
-    df      = df.rename(columns={var: get_label(var) for var in vars})
+        # Percentages can't be computed for questions without answers
+        if questions.any():
+            counts = counts[questions]
+            labels = [label for label, answered in zip(labels, questions) if answered]
+
+        # Wrap long questions like plot-likert
+        labels = ["\n".join(wrap(str(label), 30)) for label in labels]
+        return pd.DataFrame(counts.astype(float), index=labels, columns=scale_minus_plus)
+
+    return cached(result_cache, _result_key(surveys, "likert_counts", vars), compute)
+
+async def plot_likert_chart(input, surveys, *vars, width=0.15):
+    """
+    Likert chart for `render.image(delete_file=True)`. Only the counts are sent
+    to a worker process of `plot_pool.py`, which draws the chart in the size of
+    the output and returns it as a PNG image. Until then the output shows as
+    busy, and this is called again when the image is ready.
+
+    The images are kept in a cache shared by all sessions, keyed by the data,
+    filters, questions, number format and image size, so that repeated views,
+    e.g. with the default filters, don't draw the chart again.
+
+    In client mode only the counts are returned for `render_chart()`.
+    """
+    number_format = input.number_format()
+
+    if chart_mode == "client":
+        counts = likert_counts(surveys, *vars)
+
+        return likert_chart_json(
+            counts      = counts.to_numpy(),
+            questions   = counts.index,
+            scale       = scale_minus_plus,
+            percentages = number_format == "percent" and bool(counts.to_numpy().any()),
+            width       = width,
+            xlabel      = "Anzahl Antworten",
+        )
+
+    session       = get_current_session()
+    size          = (session.clientdata.output_width(), session.clientdata.output_height(), session.clientdata.pixelratio())
+    key           = _result_key(surveys, "likert_png", vars, width, number_format, size)
+    png           = cache_lookup(image_cache, key)
+
+    if png is None:
+        counts          = likert_counts(surveys, *vars)
+        plot_percentage = number_format == "percent" and bool(counts.to_numpy().any())
+
+        # Survey pages can show the same questions, so the families are part of the chart key
+        png = png_result(
+            (session.id, surveys["spec"][0], vars, width),
+            key,
+            likert_png,
+            *size,
+            counts.to_numpy(),
+            counts.index.tolist(),
+            percentages  = plot_percentage,
+            label_format = "%.1f" if plot_percentage else "%.0f",
+            width        = width,
+            xlabel       = "Anzahl Antworten",
+        )
+
+        cache_store(image_cache, key, png)
+
+    fd, path = tempfile.mkstemp(suffix=".png")
+
+    with os.fdopen(fd, "wb") as file:
+        file.write(png)
+
+    return {"src": path, "width": "100%", "height": "100%"}
+
+def plot_multiple_choice_bar_chart(input, surveys, *vars):
+    df      = survey_columns(surveys, *vars).astype(int)
+    df      = df.rename(columns=rename_map(*vars))
     counts  = (df == 2).sum()
+    percent = input.number_format() == "percent"
+
+    if chart_mode == "client":
+        return bar_chart_json(counts.index, counts.values, df.shape[0], percent, "Anzahl Antworten")
+
+    fig, ax = plt.subplots()
 
-    if input.number_format() == "percent":
+    if percent:
         ax.yaxis.set_major_formatter(mtick.PercentFormatter(xmax=df.shape[0]))
 
     ax.bar(counts.index, counts.values)
@@ -259,55 +978,74 @@ def plot_multiple_choice_bar_chart(input, data, *vars):
     
     return fig
 
-def calc_likert_statistics(input, data, *vars):
-    plot_percentage = input.number_format() == "percent"
-    
-    df = data[[*vars]]
-    df = df.rename(columns={var: get_label(var) for var in vars})
+def plot_histogram(input, surveys, column, xlabel, bins=11):
+    """
+    Histogram of a numeric question for `render_chart(render.plot)`. With the
+    number format "percent" the bars show the share of the answers per unit.
+    """
+    values  = survey_column(surveys, column).dropna()
+    density = input.number_format() == "percent"
+
+    if chart_mode == "client":
+        heights, edges = np.histogram(values, bins, density=density)
+        return histogram_json(edges, heights, density, xlabel, "Anzahl Antworten")
 
-    ordinal_order = [1, 2, 3, 4, 5]
+    fig, ax = plt.subplots()
+
+    if density:
+        ax.yaxis.set_major_formatter(mtick.PercentFormatter(xmax=1))
+
+    ax.hist(values, bins, density=density)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Anzahl Antworten")
+
+    return fig
+
+def calc_likert_statistics(input, surveys, *vars):
+    number_format = input.number_format()
+    key           = _result_key(surveys, "likert_statistics", vars, number_format)
+    return cached(result_cache, key, lambda: _likert_statistics(surveys, vars, number_format == "percent")).copy()
+
+def _likert_statistics(surveys, vars, plot_percentage):
+    answers = likert_count_matrix(surveys, *vars)
+    labels  = [rename_map(*vars)[var] for var in vars]
+    return _count_statistics(labels, answers, plot_percentage)
+
+def _count_statistics(questions, counts, plot_percentage):
+    """
+    Table with the counts, N, median, mean and standard deviation of each
+    question, computed for all questions at once from a count matrix with one
+    row per question and one column per value of `scale_minus_plus`.
+    """
+    # The category codes 0..4 of `scale_minus_plus` plus one are the ordinal values
+    ordinal_order = np.arange(1, len(scale_minus_plus) + 1)
     ordinal_scale = [str(v) for v in ordinal_order]
-    ordinal_map   = {scale_value: ordinal_order[i] for i, scale_value in enumerate(scale_minus_plus)}
-
-    def _ordinal_median(values: pd.Series):
-        values = values.dropna()
-        if values.empty:
-            return pd.NA
-
-        # Median for an ordinal scale: pick the lower middle category (ceil(n/2)).
-        counts = values.value_counts(dropna=True).reindex(scale_minus_plus, fill_value=0)
-        total = int(counts.sum())
-        if total == 0:
-            return pd.NA
-
-        target_pos = (total + 1) // 2  # 1-indexed lower median position
-        cumulative = counts.cumsum()
-        return ordinal_map[cumulative.index[cumulative.ge(target_pos)][0]]
-
-    rows = []
-    for question, series in df.items():
-        ordinal_values = series.map(ordinal_map).dropna()
-        counts = ordinal_values.value_counts(dropna=True).reindex(ordinal_order, fill_value=0)
-        total  = int(counts.sum())
-        mean   = ordinal_values.mean().round(1)
-        stddev = ordinal_values.std() if ordinal_values.shape[0] >= 2 else pd.NA
-
-        if plot_percentage:
-            scale_values = {
-                str(scale_value): (f"{round((int(counts.loc[scale_value]) / total) * 100)}%" if total else pd.NA)
-                for scale_value in ordinal_order
-            }
-        else:
-            scale_values = {str(scale_value): int(counts.loc[scale_value]) for scale_value in ordinal_order}
-
-        row = {
-            "Frage": question,
-            **scale_values,
-            "N": total,
-            "MD": _ordinal_median(series),
-            "M": mean,
-            "SD": (round(float(stddev), 2) if pd.notna(stddev) else pd.NA),
+
+    total = counts.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean     = (counts @ ordinal_order) / total
+        variance = (counts * (ordinal_order - mean[:, None]) ** 2).sum(axis=1) / (total - 1)
+        percent  = counts / total[:, None] * 100
+
+    stddev = np.sqrt(variance)
+
+    # Median for an ordinal scale: pick the lower middle category (ceil(n/2)).
+    median = ordinal_order[np.argmax(counts.cumsum(axis=1) >= ((total + 1) // 2)[:, None], axis=1)]
+
+    if plot_percentage:
+        scale_values = {
+            scale_value: [f"{round(float(p))}%" if n else pd.NA for p, n in zip(percent[:, i], total)]
+            for i, scale_value in enumerate(ordinal_scale)
         }
-        rows.append(row)
+    else:
+        scale_values = {scale_value: [int(c) for c in counts[:, i]] for i, scale_value in enumerate(ordinal_scale)}
 
-    return pd.DataFrame(rows, columns=["Frage", *ordinal_scale, "N", "MD", "M", "SD"])
\ No newline at end of file
+    return pd.DataFrame({
+        "Frage": list(questions),
+        **scale_values,
+        "N":  [int(n) for n in total],
+        "MD": [int(md) if n else pd.NA for md, n in zip(median, total)],
+        "M":  [m if n else pd.NA for m, n in zip(mean.round(1), total)],
+        "SD": [round(float(sd), 2) if n >= 2 else pd.NA for sd, n in zip(stddev, total)],
+    })
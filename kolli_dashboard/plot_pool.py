@@ -0,0 +1,165 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+from concurrent.futures         import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools                  import partial
+from shiny                      import reactive
+from shiny.types                import SilentCancelOutputException
+
+import asyncio
+import logging
+import multiprocessing
+import os
+
+plot_workers    = int(os.environ.get("PLOT_WORKERS", "2"))
+plot_queue_size = int(os.environ.get("PLOT_QUEUE_SIZE", "16"))
+logger          = logging.getLogger(__name__)
+
+# Worker processes, the free slots of the queue, the latest job of each chart
+# and the extended task that waits for it
+pool = {
+    "executor": None,
+    "slots":    None,
+    "jobs":     {},
+    "tasks":    {},
+}
+
+def start_plot_pool():
+    """
+    Start the worker processes that draw the charts, so that the first charts
+    don't have to wait for matplotlib to be loaded. With `PLOT_WORKERS = 0` the
+    charts are drawn in a thread of the server process instead.
+    """
+    if plot_workers <= 0 or pool["executor"] is not None:
+        return
+
+    pool["executor"] = ProcessPoolExecutor(
+        max_workers = plot_workers,
+        mp_context  = multiprocessing.get_context("spawn"),
+        initializer = _warm_up,
+    )
+
+    for _ in range(plot_workers):
+        pool["executor"].submit(_warm_up)
+
+async def render_png(key, func, *args, **kwargs):
+    """
+    Call `func(*args, **kwargs)`, which returns the bytes of a PNG image, in a
+    worker process and wait for the result without blocking the event loop, so
+    that other sessions are served while a chart is drawn.
+
+    At most `PLOT_QUEUE_SIZE` charts are queued or drawn at once, further charts
+    wait for a free slot. `key` identifies the chart. When the same chart is
+    requested again, e.g. because a filter changed, the previous job is dropped
+    if it hasn't started yet and its output keeps its current image.
+    """
+    if pool["slots"] is None:
+        pool["slots"] = asyncio.Semaphore(plot_queue_size)
+
+    call  = partial(func, *args, **kwargs)
+    job   = {"future": None, "stale": False}
+    stale = pool["jobs"].get(key)
+    pool["jobs"][key] = job
+
+    if stale:
+        stale["stale"] = True
+
+        if stale["future"]:
+            stale["future"].cancel()
+
+    try:
+        async with pool["slots"]:
+            if job["stale"]:
+                raise SilentCancelOutputException()
+
+            try:
+                job["future"] = _submit(call)
+                png           = await asyncio.wrap_future(job["future"])
+            except asyncio.CancelledError:
+                if job["stale"]:
+                    raise SilentCancelOutputException()
+                raise
+            except BrokenProcessPool:
+                # A crashed worker breaks the whole pool, so start a new one
+                logger.warning("Plot worker crashed, restarting the pool")
+                pool["executor"].shutdown(wait=False, cancel_futures=True)
+                pool["executor"] = None
+                job["future"]    = _submit(call)
+                png              = await asyncio.wrap_future(job["future"])
+
+            # Jobs that were already running when they became stale are discarded
+            if job["stale"]:
+                raise SilentCancelOutputException()
+
+            return png
+    finally:
+        if pool["jobs"].get(key) is job:
+            del pool["jobs"][key]
+
+def png_result(key, image_key, func, *args, **kwargs):
+    """
+    PNG image of `func(*args, **kwargs)` for a render function. The outputs are
+    rendered while Shiny holds `reactive.lock()`, which blocks all sessions. So
+    the image is awaited from `render_png()` in a `reactive.ExtendedTask`, and
+    this raises a silent exception that shows the output as busy until the task
+    has finished and the render function is called again.
+
+    `key` identifies the chart like in `render_png()`, `image_key` the image.
+    The key must not depend on the filters, so that there is one task for each
+    output of a session. A new task is only started when the image of the chart
+    changes, and it replaces the previous task of the output, which is cancelled
+    if it is still drawing.
+    """
+    task = pool["tasks"].get(key)
+
+    if task is None or task["image"] != image_key:
+        async def draw():
+            return await render_png(key, func, *args, **kwargs)
+
+        if task is not None:
+            task["task"].cancel()
+
+        task = {"image": image_key, "task": reactive.ExtendedTask(draw)}
+        pool["tasks"][key] = task
+        task["task"].invoke()
+
+    return task["task"].result()
+
+def cancel_plot_jobs(session_id):
+    """
+    Drop the jobs of a session that has ended. `session_id` must be the first
+    part of the keys passed to `render_png()` and `png_result()`.
+    """
+    for key, job in list(pool["jobs"].items()):
+        if key[0] == session_id:
+            job["stale"] = True
+
+            if job["future"]:
+                job["future"].cancel()
+
+    for key, task in list(pool["tasks"].items()):
+        if key[0] == session_id:
+            task["task"].cancel()
+            del pool["tasks"][key]
+
+def _submit(call):
+    if pool["executor"] is None:
+        start_plot_pool()
+
+    if pool["executor"] is None:
+        return asyncio.get_running_loop().run_in_executor(None, call)
+    else:
+        return pool["executor"].submit(call)
+
+def _warm_up():
+    """
+    Import matplotlib and load its fonts in a new worker process by drawing a
+    tiny chart.
+    """
+    from .charts import likert_png
+    likert_png(100, 100, 1, [[1, 1, 1, 1, 1]], [""])
@@ -0,0 +1,370 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+import logging
+import time
+
+import numpy  as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Fixes for the raw SoSci export, applied in this order. Each rule names its
+# kind in `fix` (see `fixes` below) and has a short description for the log.
+# Rules of the same kind are fused into one pass, unless a rule in between
+# touches the same columns, so that adding rules for a new semester does not
+# add another pass over the whole table. See `compile_repairs()`.
+repairs = [
+    {
+        "fix":         "drop_cases",
+        "description": "Remove dummy responses",
+        "cases":       [242, 432, 523, 553],
+    },
+    {
+        "fix":         "rename_questionnaire",
+        "description": "Repair survey that was accidentally run for the wrong teacher",
+        "source":      "R1-SILA-1",
+        "target":      "R1-KAWE-1",
+        "started_on":  "2024-10-16",
+    },
+    {
+        "fix":         "clip",
+        "description": "Make initial pre-survey compatible with the later version",
+        "columns":     ["VU03_01", "VU03_02", "VU03_03", "VU03_04"],
+        "upper":       4,
+    },
+    {
+        "fix":         "migrate",
+        "description": "Move answers of the initial pre-survey to the later questions",
+        "columns":     {"V204_02": "VU03_01", "V202_01": "VU01_01", "V201_02": "VU03_02"},
+    },
+    {
+        "fix":         "fill_missing",
+        "description": "Count missing number of previous lectures as zero",
+        "columns":     ["V203_01"],
+        "value":       0,
+    },
+    {
+        "fix":         "migrate",
+        "description": "Move expectations of the initial pre-survey to the later question",
+        "columns":     {"V210_01": "VU02_01"},
+        "prefix":      "Erwartungen: ",
+    },
+    {
+        "fix":         "drop_columns",
+        "description": "Remove questions of the initial pre-survey",
+        "columns":     ["VU01_01", "VU02_01", "VU03_01", "VU03_02"],
+    },
+    {
+        "fix":         "copy_responses",
+        "description": "Question DR06_01 from survey R1-DIRA-PROG1-2-special can be used for the student mid survey, too",
+        "source":      "R1-DIRA-2-special",
+        "target":      "R1-DIRA-2",
+        "columns":     {"ZW04_01": "DR06_01"},
+    },
+    {
+        "fix":         "migrate",
+        "description": "Survey S-KAWE-SENG-3 uses slightly different wording for some questions",
+        "columns":     {
+            "AB09_01": "AB16_01",
+            "AB09_02": "AB16_02",
+            "AB09_03": "AB16_03",
+            "AB09_04": "AB16_04",
+            "AB09_05": "AB16_05",
+            "AB09_06": "AB16_06",
+            "AB09_07": "AB16_07",
+            "AB14_06": "AB17_06",
+            "AB14_07": "AB17_07",
+            "AB14_08": "AB17_08",
+            "AB14_09": "AB17_09",
+        },
+    },
+    {
+        "fix":         "fill_missing",
+        "description": "Replace missing numerical values with minus one",
+        "columns":     ["V203_01", "AA02_01"],
+        "value":       -1,
+    },
+]
+
+def run_repairs(data, rules=repairs):
+    """
+    Apply the given rules to the raw survey results. Returns the repaired data
+    and a report with the number of touched rows and the runtime of each rule.
+    The report lists the rules in the order of the passes of `compile_repairs()`.
+    Fused rules share one pass, so they report the runtime of the whole pass.
+    """
+    report = []
+
+    for fix, group in compile_repairs(rules):
+        start        = time.perf_counter()
+        data, counts = fixes[fix](data, group)
+        seconds      = time.perf_counter() - start
+
+        for rule, rows in zip(group, counts):
+            report.append({"description": rule["description"], "rows": rows, "seconds": seconds, "fused": len(group)})
+            logger.info("%s: %d rows in %.1f ms", rule["description"], rows, seconds * 1000)
+
+    return data, report
+
+def compile_repairs(rules):
+    """
+    Group the rules into passes over the data, one pass for each kind of fix.
+    A rule joins the last pass of its kind, if it doesn't depend on the rules
+    of the passes after that one, i.e. none of them reads a column the rule
+    changes or changes a column the rule reads, and not both of them add or
+    remove responses, and if it doesn't conflict with the rules already in
+    the pass (see `_conflicts()`). The result is then the same as applying the
+    rules one after the other. Otherwise the rule starts a new pass.
+    """
+    passes = []
+
+    for rule in rules:
+        if rule["fix"] not in fixes:
+            raise ValueError(f"Unknown data fix {rule['fix']!r} in rule {rule['description']!r}")
+
+        target = None
+
+        for i in reversed(range(len(passes))):
+            if passes[i][0] == rule["fix"]:
+                if not any(_conflicts(rule, other) for other in passes[i][1]):
+                    target = i
+
+                break
+
+            if any(_depends(rule, other) for other in passes[i][1]):
+                break
+
+        if target is None:
+            passes.append((rule["fix"], [rule]))
+        else:
+            passes[target][1].append(rule)
+
+    return passes
+
+def _depends(rule, other):
+    """
+    Whether the order of two rules matters, because one of them changes what
+    the other one reads or changes.
+    """
+    reads, writes             = _columns(rule)
+    other_reads, other_writes = _columns(other)
+
+    return bool(writes & (other_reads | other_writes) or other_writes & reads)
+
+def _conflicts(rule, other):
+    """
+    Whether two rules of the same kind can't share a pass, because the fused
+    fix sees the data before all rules of the pass: Renamed or copied responses
+    would not be renamed or copied again, migrated answers would not be migrated
+    again and a response would match two renames. Clipping, filling and dropping
+    take the order of the rules into account by themselves.
+    """
+    fix = rule["fix"]
+
+    if fix == "rename_questionnaire":
+        if rule["source"] == other["source"]:
+            return not (rule.get("started_on") and other.get("started_on") and rule["started_on"] != other["started_on"])
+
+        return rule["source"] == other["target"] or rule["target"] == other["source"]
+    elif fix == "copy_responses":
+        return rule["source"] == other["target"] or rule["target"] == other["source"]
+    elif fix == "migrate":
+        return _depends(rule, other)
+    else:
+        return False
+
+def _columns(rule):
+    """
+    Columns read and changed by a rule. `*` stands for the responses themselves,
+    for rules that add or remove rows. All other fixes only look at one row at
+    a time, so they don't depend on the rows that are added or removed.
+    """
+    fix = rule["fix"]
+
+    if fix == "drop_cases":
+        return {"CASE"}, {"*"}
+    elif fix == "rename_questionnaire":
+        return {"QUESTNNR", "STARTED"}, {"QUESTNNR"}
+    elif fix == "migrate":
+        return {*rule["columns"].values(), *rule["columns"]}, {*rule["columns"]}
+    elif fix == "drop_columns":
+        return set(), {*rule["columns"]}
+    elif fix == "copy_responses":
+        return {"QUESTNNR", *rule["columns"].values()}, {"*", "QUESTNNR", *rule["columns"]}
+    else:
+        return {*rule["columns"]}, {*rule["columns"]}
+
+def _drop_cases(data, rules):
+    """
+    Remove the responses with the given CASE ids. Responses that are listed by
+    several rules are counted for the first one.
+    """
+    case   = data["CASE"].to_numpy()
+    drop   = np.zeros(len(data), dtype=bool)
+    counts = []
+
+    for rule in rules:
+        mask  = np.isin(case, rule["cases"]) & ~drop
+        drop |= mask
+        counts.append(int(mask.sum()))
+
+    if drop.any():
+        data = data.take(np.flatnonzero(~drop))
+
+    return data, counts
+
+def _rename_questionnaire(data, rules):
+    """
+    Assign responses to another questionnaire, optionally only those started
+    on a given day. The rules are looked up by questionnaire and day for all
+    responses at once. `compile_repairs()` makes sure that a response matches
+    one rule at most.
+    """
+    questnnr = data["QUESTNNR"]
+    day      = data["STARTED"].dt.normalize()
+    dated    = {(rule["source"], pd.Timestamp(rule["started_on"])): i for i, rule in enumerate(rules) if rule.get("started_on")}
+    undated  = {rule["source"]: i for i, rule in enumerate(rules) if not rule.get("started_on")}
+
+    match = questnnr.map(undated)
+
+    if dated:
+        keys  = pd.MultiIndex.from_arrays([questnnr, day])
+        match = match.fillna(pd.Series(dated).reindex(keys).set_axis(data.index))
+
+    mask  = match.notna().to_numpy()
+    match = match[mask].astype(int).to_numpy()
+
+    if mask.any():
+        data.loc[mask, "QUESTNNR"] = np.array([rule["target"] for rule in rules], dtype=object)[match]
+
+    return data, np.bincount(match, minlength=len(rules)).tolist()
+
+def _clip(data, rules):
+    """
+    Limit the answers to an upper bound. A column that is limited by several
+    rules gets the lowest bound, and all columns with the same bound are
+    clipped together.
+    """
+    bounds = {}
+    counts = []
+
+    for rule in rules:
+        touched = np.zeros(len(data), dtype=bool)
+
+        for column in rule["columns"]:
+            if bounds.get(column, np.inf) > rule["upper"]:
+                touched       |= (data[column] > rule["upper"]).to_numpy()
+                bounds[column] = rule["upper"]
+
+        counts.append(int(touched.sum()))
+
+    for upper in set(bounds.values()):
+        columns       = [column for column, bound in bounds.items() if bound == upper]
+        data[columns] = data[columns].clip(upper=upper)
+
+    return data, counts
+
+def _migrate(data, rules):
+    """
+    Copy answers from old questions to their new counterparts, wherever the
+    old question was answered. `columns` maps new to old questions. The rules
+    of one pass don't share any questions, see `compile_repairs()`, so every
+    new question is written by exactly one `where()`.
+    """
+    counts = []
+
+    for rule in rules:
+        touched = np.zeros(len(data), dtype=bool)
+
+        for target, source in rule["columns"].items():
+            mask   = data[source].notnull()
+            values = data[source]
+
+            if "prefix" in rule:
+                values = rule["prefix"] + values.astype(str)
+
+            data[target] = values.where(mask, data[target])
+            touched     |= mask.to_numpy()
+
+        counts.append(int(touched.sum()))
+
+    return data, counts
+
+def _fill_missing(data, rules):
+    """
+    Replace missing answers with a fixed value. The first rule for a column
+    wins, like it would when the rules were applied one after the other.
+    """
+    values = {}
+    counts = []
+
+    for rule in rules:
+        touched = np.zeros(len(data), dtype=bool)
+
+        for column in rule["columns"]:
+            if column not in values:
+                touched       |= data[column].isna().to_numpy()
+                values[column] = rule["value"]
+
+        counts.append(int(touched.sum()))
+
+    if values:
+        columns       = list(values)
+        data[columns] = data[columns].fillna(values)
+
+    return data, counts
+
+def _drop_columns(data, rules):
+    """
+    Remove questions that are no longer needed. No responses are changed, so
+    the rules report zero rows.
+    """
+    data = data.drop([column for rule in rules for column in rule["columns"]], axis=1)
+    return data, [0] * len(rules)
+
+def _copy_responses(data, rules):
+    """
+    Add copies of the responses of one questionnaire to another one, wherever
+    the mapped questions were answered. `columns` maps target to source questions.
+    Questionnaires that don't exist in the export are skipped. The copies of all
+    rules are appended at once.
+    """
+    copies = []
+    counts = []
+
+    for rule in rules:
+        try:
+            mask = (data["QUESTNNR"] == rule["source"]) & data[list(rule["columns"].values())].notnull().any(axis=1)
+            copy = data[mask].copy()
+        except KeyError:
+            counts.append(0)
+            continue
+
+        copy["QUESTNNR"] = rule["target"]
+
+        for target, source in rule["columns"].items():
+            copy[target] = copy[source]
+
+        copies.append(copy)
+        counts.append(copy.shape[0])
+
+    if copies:
+        data = pd.concat([data, *copies], ignore_index=True)
+
+    return data, counts
+
+fixes = {
+    "drop_cases":           _drop_cases,
+    "rename_questionnaire": _rename_questionnaire,
+    "clip":                 _clip,
+    "migrate":              _migrate,
+    "fill_missing":         _fill_missing,
+    "drop_columns":         _drop_columns,
+    "copy_responses":       _copy_responses,
+}
+
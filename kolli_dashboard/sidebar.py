@@ -5,9 +5,15 @@
 # This source code is licensed under the BSD 3-Clause License found in the
 # LICENSE file in the root directory of this source tree.
 
-from .data  import correlation_filters, data, get_label, version
+from .data  import data, dataset_version, get_label, version
 from .utils import scale_minus_plus
-from shiny  import ui, reactive
+from shiny  import ui, reactive, render
+
+import asyncio
+import os
+
+# Seconds without changes of the filter inputs, before the survey pages are updated
+filter_delay = float(os.environ.get("FILTER_DELAY", "0.5"))
 
 def sidebar_ui():
     return ui.sidebar(
@@ -56,7 +62,7 @@ def sidebar_ui():
                 ui.div(
                     ui.strong("Version:"), f" {version}",
                     ui.span(" | ", class_="text-secondary"),
-                    ui.strong("Stand:"), f" {data['max_date']}"
+                    ui.strong("Stand:"), " ", ui.output_text("data_max_date", inline=True)
                 ),
                 ui.img(src="dhbw-logo.svg", height="60px", class_="mt-2"),
                 class_="text-center",
@@ -66,18 +72,16 @@ def sidebar_ui():
         width = "20em"
     )
 
-all_correlation_plus_minus_selectize = []
-
-def ui_correlation_plus_minus(input, var, survey):
+def ui_correlation_plus_minus(input, correlation_filters, all_selectize, var, survey):
     name = f"correlation_{var}"
 
-    if not name in all_correlation_plus_minus_selectize:
+    if not name in all_selectize:
         @reactive.effect
         @reactive.event(input[name])
         def _():
             correlation_filters[survey][var].set([*input[name]()])
     
-    all_correlation_plus_minus_selectize.append(name)
+    all_selectize.append(name)
 
     return ui.input_selectize(
         name,
@@ -88,7 +92,57 @@ def ui_correlation_plus_minus(input, var, survey):
         width    = "100%"
     ),
 
-def sidebar_server(input, output, session):
+def sidebar_server(input, output, session, correlation_filters):
+    """
+    Server logic of the sidebar. Returns a reactive value with the filters of
+    the sidebar, which the survey pages must use instead of the inputs. It only
+    changes after the inputs have been quiet for `FILTER_DELAY` seconds, so that
+    selecting several teachers or moving through the date picker updates the
+    survey pages once. The correlation filters of the modal dialog are written
+    to `correlation_filters` of the session.
+    """
+    sidebar_filters = reactive.value(None)
+    pending         = None
+
+    # Runs before the survey pages, so that they find the initial filters
+    @reactive.effect(priority=1)
+    def _():
+        nonlocal pending
+
+        filters = {
+            "teachers":   input.teachers(),
+            "lectures":   input.lectures(),
+            "date_range": input.date_range(),
+        }
+
+        if pending:
+            pending.cancel()
+            pending = None
+
+        with reactive.isolate():
+            current = sidebar_filters()
+
+        if current is None:
+            sidebar_filters.set(filters)
+        elif filters != current:
+            pending = asyncio.create_task(_apply_filters(filters))
+
+    async def _apply_filters(filters):
+        await asyncio.sleep(filter_delay)
+
+        # This task runs outside of the session's own flush, so hold the lock like it does
+        async with reactive.lock():
+            sidebar_filters.set(filters)
+            await reactive.flush()
+
+    session.on_ended(lambda: pending and pending.cancel())
+
+    # Selectize inputs of the correlation filters, registered on first display
+    all_correlation_plus_minus_selectize = []
+
+    def correlation_plus_minus(var, survey):
+        return ui_correlation_plus_minus(input, correlation_filters, all_correlation_plus_minus_selectize, var, survey)
+
     @reactive.effect
     @reactive.event(input.btn_correlation_filter)
     def _():    
@@ -109,23 +163,23 @@ def sidebar_server(input, output, session):
                         ui.navset_card_tab(
                             ui.nav_panel(
                                 "Umsetzung der Mitgestaltung",
-                                ui_correlation_plus_minus(input, "R201_01", "revised"),
-                                ui_correlation_plus_minus(input, "R201_02", "revised"),
-                                ui_correlation_plus_minus(input, "R201_03", "revised"),
-                                ui_correlation_plus_minus(input, "R201_04", "revised"),
-                                ui_correlation_plus_minus(input, "R201_05", "revised"),
+                                correlation_plus_minus("R201_01", "revised"),
+                                correlation_plus_minus("R201_02", "revised"),
+                                correlation_plus_minus("R201_03", "revised"),
+                                correlation_plus_minus("R201_04", "revised"),
+                                correlation_plus_minus("R201_05", "revised"),
                             ),
                             ui.nav_panel(
                                 "Wirkung der Mitgestaltung",
-                                ui_correlation_plus_minus(input, "R202_02", "revised"),
-                                ui_correlation_plus_minus(input, "R202_03", "revised"),
-                                ui_correlation_plus_minus(input, "R202_04", "revised"),
-                                ui_correlation_plus_minus(input, "R202_05", "revised"),
-                                ui_correlation_plus_minus(input, "R202_06", "revised"),
+                                correlation_plus_minus("R202_02", "revised"),
+                                correlation_plus_minus("R202_03", "revised"),
+                                correlation_plus_minus("R202_04", "revised"),
+                                correlation_plus_minus("R202_05", "revised"),
+                                correlation_plus_minus("R202_06", "revised"),
                             ),
                             ui.nav_panel(
                                 "Sonstiges",
-                                ui_correlation_plus_minus(input, "R204_01", "revised"),
+                                correlation_plus_minus("R204_01", "revised"),
                             ),
                         ),
                         class_="mt-4",
@@ -139,13 +193,13 @@ def sidebar_server(input, output, session):
                             ui.navset_card_tab(
                                 ui.nav_panel(
                                     "Vorwissen und Interesse",
-                                    ui_correlation_plus_minus(input, "V201_01", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V201_02", "round1_student1"),
+                                    correlation_plus_minus("V201_01", "round1_student1"),
+                                    correlation_plus_minus("V201_02", "round1_student1"),
                                 ),
                                 ui.nav_panel(
                                     "Mitgestaltung",
-                                    ui_correlation_plus_minus(input, "V204_01", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V204_02", "round1_student1"),
+                                    correlation_plus_minus("V204_01", "round1_student1"),
+                                    correlation_plus_minus("V204_02", "round1_student1"),
                                     ui.input_slider(
                                         "correlation_V203_01",
                                         get_label("V203_01"),
@@ -158,17 +212,17 @@ def sidebar_server(input, output, session):
                                 ),
                                 ui.nav_panel(
                                     "Studentisches Engagement",
-                                    ui_correlation_plus_minus(input, "VU03_03", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "VU03_04", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_01", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_02", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_03", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_04", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_05", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_06", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_07", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_08", "round1_student1"),
-                                    ui_correlation_plus_minus(input, "V209_09", "round1_student1"),
+                                    correlation_plus_minus("VU03_03", "round1_student1"),
+                                    correlation_plus_minus("VU03_04", "round1_student1"),
+                                    correlation_plus_minus("V209_01", "round1_student1"),
+                                    correlation_plus_minus("V209_02", "round1_student1"),
+                                    correlation_plus_minus("V209_03", "round1_student1"),
+                                    correlation_plus_minus("V209_04", "round1_student1"),
+                                    correlation_plus_minus("V209_05", "round1_student1"),
+                                    correlation_plus_minus("V209_06", "round1_student1"),
+                                    correlation_plus_minus("V209_07", "round1_student1"),
+                                    correlation_plus_minus("V209_08", "round1_student1"),
+                                    correlation_plus_minus("V209_09", "round1_student1"),
                                 ),
                             ),
                             class_="mt-4",
@@ -180,17 +234,17 @@ def sidebar_server(input, output, session):
                             ui.navset_card_tab(
                                 ui.nav_panel(
                                     "Klarheit und Überforderung",
-                                    ui_correlation_plus_minus(input, "ZW04_01", "round1_student2"),
-                                    ui_correlation_plus_minus(input, "ZW04_02", "round1_student2"),
-                                    ui_correlation_plus_minus(input, "ZW04_03", "round1_student2"),
-                                    ui_correlation_plus_minus(input, "ZW04_04", "round1_student2"),
+                                    correlation_plus_minus("ZW04_01", "round1_student2"),
+                                    correlation_plus_minus("ZW04_02", "round1_student2"),
+                                    correlation_plus_minus("ZW04_03", "round1_student2"),
+                                    correlation_plus_minus("ZW04_04", "round1_student2"),
                                 ),
                                 ui.nav_panel(
                                     "Zufriedenheit",
-                                    ui_correlation_plus_minus(input, "ZW04_05", "round1_student2"),
-                                    ui_correlation_plus_minus(input, "ZW04_06", "round1_student2"),
-                                    ui_correlation_plus_minus(input, "ZW04_07", "round1_student2"),
-                                    ui_correlation_plus_minus(input, "ZW04_08", "round1_student2"),
+                                    correlation_plus_minus("ZW04_05", "round1_student2"),
+                                    correlation_plus_minus("ZW04_06", "round1_student2"),
+                                    correlation_plus_minus("ZW04_07", "round1_student2"),
+                                    correlation_plus_minus("ZW04_08", "round1_student2"),
                                 ),
                             ),
                             class_="mt-4",
@@ -202,39 +256,39 @@ def sidebar_server(input, output, session):
                             ui.navset_card_tab(
                                 ui.nav_panel(
                                     "Inhalt der Lehrveranstaltung",
-                                    ui_correlation_plus_minus(input, "AB03_01", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB03_02", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB03_03", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB03_04", "round1_student3"),
+                                    correlation_plus_minus("AB03_01", "round1_student3"),
+                                    correlation_plus_minus("AB03_02", "round1_student3"),
+                                    correlation_plus_minus("AB03_03", "round1_student3"),
+                                    correlation_plus_minus("AB03_04", "round1_student3"),
                                 ),
                                 ui.nav_panel(
                                     "Studentisches Engagement",
-                                    ui_correlation_plus_minus(input, "AB07_01", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_02", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_03", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_04", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_05", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_06", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_07", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_08", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB07_09", "round1_student3"),
+                                    correlation_plus_minus("AB07_01", "round1_student3"),
+                                    correlation_plus_minus("AB07_02", "round1_student3"),
+                                    correlation_plus_minus("AB07_03", "round1_student3"),
+                                    correlation_plus_minus("AB07_04", "round1_student3"),
+                                    correlation_plus_minus("AB07_05", "round1_student3"),
+                                    correlation_plus_minus("AB07_06", "round1_student3"),
+                                    correlation_plus_minus("AB07_07", "round1_student3"),
+                                    correlation_plus_minus("AB07_08", "round1_student3"),
+                                    correlation_plus_minus("AB07_09", "round1_student3"),
                                 ),
                                 ui.nav_panel(
                                     "Beurteilung der Partizipation",
-                                    ui_correlation_plus_minus(input, "AB09_01", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB09_02", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB09_03", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB09_04", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB09_05", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB09_06", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB09_07", "round1_student3"),
+                                    correlation_plus_minus("AB09_01", "round1_student3"),
+                                    correlation_plus_minus("AB09_02", "round1_student3"),
+                                    correlation_plus_minus("AB09_03", "round1_student3"),
+                                    correlation_plus_minus("AB09_04", "round1_student3"),
+                                    correlation_plus_minus("AB09_05", "round1_student3"),
+                                    correlation_plus_minus("AB09_06", "round1_student3"),
+                                    correlation_plus_minus("AB09_07", "round1_student3"),
                                 ),
                                 ui.nav_panel(
                                     "Beurteilung der Lernwirksamkeit",
-                                    ui_correlation_plus_minus(input, "AB14_06", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB14_07", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB14_08", "round1_student3"),
-                                    ui_correlation_plus_minus(input, "AB14_09", "round1_student3"),
+                                    correlation_plus_minus("AB14_06", "round1_student3"),
+                                    correlation_plus_minus("AB14_07", "round1_student3"),
+                                    correlation_plus_minus("AB14_08", "round1_student3"),
+                                    correlation_plus_minus("AB14_09", "round1_student3"),
                                 ),
                             ),
                             class_="mt-4",
@@ -247,8 +301,8 @@ def sidebar_server(input, output, session):
                         "DIRA Lerntagebücher",
                         ui.div(
                             ui.h4("DIRA Lerntagebücher", class_="my-survey-title mb-4"),
-                            ui_correlation_plus_minus(input, "DR06_01", "special_DIRA_r1"),
-                            ui_correlation_plus_minus(input, "DR06_08", "special_DIRA_r1"),
+                            correlation_plus_minus("DR06_01", "special_DIRA_r1"),
+                            correlation_plus_minus("DR06_08", "special_DIRA_r1"),
                             class_="mt-4",
                         ),
                     ),
@@ -259,10 +313,10 @@ def sidebar_server(input, output, session):
                             ui.navset_card_tab(
                                 ui.nav_panel(
                                     "Lernen und Lehren allgemein",
-                                    ui_correlation_plus_minus(input, "AA01_01", "special_DESC_r2_general"),
-                                    ui_correlation_plus_minus(input, "AA01_02", "special_DESC_r2_general"),
-                                    ui_correlation_plus_minus(input, "AA01_03", "special_DESC_r2_general"),
-                                    ui_correlation_plus_minus(input, "AA01_04", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA01_01", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA01_02", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA01_03", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA01_04", "special_DESC_r2_general"),
                                     ui.input_slider(
                                         "correlation_AA02_01",
                                         get_label("AA02_01"),
@@ -275,10 +329,10 @@ def sidebar_server(input, output, session):
                                 ),
                                 ui.nav_panel(
                                     "Mitbestimmung in der Vorlesung",
-                                    ui_correlation_plus_minus(input, "AA03_01", "special_DESC_r2_general"),
-                                    ui_correlation_plus_minus(input, "AA03_02", "special_DESC_r2_general"),
-                                    ui_correlation_plus_minus(input, "AA03_03", "special_DESC_r2_general"),
-                                    ui_correlation_plus_minus(input, "AA03_04", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA03_01", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA03_02", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA03_03", "special_DESC_r2_general"),
+                                    correlation_plus_minus("AA03_04", "special_DESC_r2_general"),
                                 ),
                             ),
                             class_="mt-4",
@@ -291,17 +345,17 @@ def sidebar_server(input, output, session):
                             ui.navset_card_tab(
                                 ui.nav_panel(
                                     "Allgemeiner Nutzen",
-                                    ui_correlation_plus_minus(input, "AS01_01", "special_DESC_r2_specific"),
-                                    ui_correlation_plus_minus(input, "AS01_02", "special_DESC_r2_specific"),
-                                    ui_correlation_plus_minus(input, "AS01_03", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS01_01", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS01_02", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS01_03", "special_DESC_r2_specific"),
                                 ),
                                 ui.nav_panel(
                                     "Tatsächliche Umsetzung",
-                                    ui_correlation_plus_minus(input, "AS02_01", "special_DESC_r2_specific"),
-                                    ui_correlation_plus_minus(input, "AS02_02", "special_DESC_r2_specific"),
-                                    ui_correlation_plus_minus(input, "AS02_03", "special_DESC_r2_specific"),
-                                    ui_correlation_plus_minus(input, "AS02_04", "special_DESC_r2_specific"),
-                                    ui_correlation_plus_minus(input, "AS02_05", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS02_01", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS02_02", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS02_03", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS02_04", "special_DESC_r2_specific"),
+                                    correlation_plus_minus("AS02_05", "special_DESC_r2_specific"),
                                 ),
                             ),
                             class_="mt-4",
@@ -334,4 +388,18 @@ def sidebar_server(input, output, session):
         ui.update_slider("correlation_AA02_01", value=[-1, 11])
 
         for selectize in all_correlation_plus_minus_selectize:
-            ui.update_selectize(selectize, selected=[])
\ No newline at end of file
+            ui.update_selectize(selectize, selected=[])
+
+    @render.text
+    def data_max_date():
+        dataset_version()
+        return data["max_date"]
+
+    @reactive.effect
+    @reactive.event(dataset_version, ignore_init=True)
+    def _():
+        # A new export may contain new teachers and lectures
+        ui.update_selectize("teachers", choices=data["teachers"], selected=input.teachers())
+        ui.update_selectize("lectures", choices=data["lectures"], selected=input.lectures())
+
+    return sidebar_filters
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+from .utils  import src_dir
+
+import json
+import numpy  as np
+import os
+import pandas as pd
+
+store_dir     = src_dir / "data" / "cache"
+manifest_json = store_dir / "manifest.json"
+
+def read_manifest():
+    """
+    Read the manifest of the store. It lists the partitions with the cleaned
+    survey results and the hash and size of the export that has been ingested.
+    Returns `None`, if there is no usable manifest.
+    """
+    try:
+        return json.loads(manifest_json.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def write_manifest(manifest):
+    """
+    Replace the manifest and remove all partitions that it doesn't reference
+    anymore. The manifest is written last, after all partitions it references,
+    so that readers always find a consistent store.
+    """
+    temp = store_dir / f"manifest.{os.getpid()}.tmp"
+    temp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(temp, manifest_json)
+
+    used = {manifest["labels"], *(part["file"] for part in manifest["parts"])}
+
+    for path in store_dir.glob("*.feather"):
+        if path.name not in used:
+            path.unlink(missing_ok=True)
+
+def write_part(name, df):
+    """
+    Write a dataframe as a new partition and return its manifest entry. The
+    file is written under a temporary name first, so that concurrently starting
+    workers never read a half-written partition.
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    path = store_dir / f"{name}.feather"
+    temp = store_dir / f"{name}.{os.getpid()}.tmp"
+    df.reset_index(drop=True).to_feather(temp)
+    os.replace(temp, path)
+
+    return {"file": path.name, "rows": df.shape[0], "columns": df.columns.tolist()}
+
+def read_labels(manifest):
+    return pd.read_feather(store_dir / manifest["labels"])
+
+def read_columns(manifest, columns):
+    """
+    Read the given columns from all partitions, in the order they were added.
+    Columns that don't exist in older partitions are filled with missing values.
+    """
+    frames = []
+
+    for part in manifest["parts"]:
+        available = [column for column in columns if column in part["columns"]]
+        frames.append(pd.read_feather(store_dir / part["file"], columns=available))
+
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    # Missing columns are added after concatenating, because all-NA columns of
+    # the older partitions would otherwise decide the dtype of newer columns
+    data = pd.concat(frames, ignore_index=True).reindex(columns=columns)
+
+    # Categories of different partitions may differ, which pandas turns into plain objects
+    for column in columns:
+        if data[column].dtype == object and any(isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames if column in frame):
+            data[column] = data[column].astype("category")
+
+    # Arrow returns missing strings as None, but the app expects NaN like in the CSV
+    text = data.select_dtypes(include="object").columns
+    data[text] = data[text].where(data[text].notnull(), np.nan)
+
+    return data
@@ -16,21 +16,38 @@ from ..ai_llm import (
     start_ai_task,
 )
 
+from ..client_charts import output_chart, render_chart
+
 from ..data import (
     calc_likert_statistics,
-    correlation_filters,
     data,
+    dataset_version,
     get_label,
-    plot_likert_chart
+    plot_likert_chart,
+    query_surveys,
+    register_columns,
+    survey_column,
+    survey_columns,
+    survey_count,
+    survey_spec
 )
 
 from shiny import reactive, render, ui
 
 import faicons
 import pandas as pd
-import numpy as np
 import html
 
+#==============================================================================
+# Survey Columns
+#==============================================================================
+
+# Columns of the survey results read by this module, see `register_columns()` in `data.py`
+register_columns(
+    "R201_01", "R201_02", "R201_03", "R201_04", "R201_05", "R202_02", "R202_03", "R202_04",
+    "R202_05", "R202_06", "R204_01", "R205_01",
+)
+
 #==============================================================================
 # UI Definition
 #==============================================================================
@@ -132,7 +149,7 @@ def revised_ui():
 #------------------------------------------------------------------------------
 # All Together
 #------------------------------------------------------------------------------
-def revised_server(input, output, session):
+def revised_server(input, output, session, sidebar_filters, correlation_filters):
     revised_ai_summary_freitext_topics_md = reactive.Value("")
     revised_ai_summary_freitext_summary_md = reactive.Value("")
 
@@ -143,72 +160,70 @@ def revised_server(input, output, session):
         revised_ai_summary_freitext_topics_md.set("")
         revised_ai_summary_freitext_summary_md.set("")
 
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = []
+        dataset_version()
+
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        rounds     = []
 
         if input.revised_include_r2():
-            questnnrs += [f"R2-{teacher}-{lecture}" for teacher in teachers for lecture in lectures]
+            rounds.append("R2")
         if input.revised_include_r3():
-            questnnrs += [f"R3-{teacher}-{lecture}" for teacher in teachers for lecture in lectures]
+            rounds.append("R3")
         if input.revised_include_kg():
-            questnnrs += [f"KG-R3-{teacher}-{lecture}" for teacher in teachers for lecture in lectures]
-
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+            rounds.append("KG-R3")
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
-
-        for var in correlation_filters["revised"]:
-            selected = correlation_filters["revised"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = rounds,
+            teachers    = teachers,
+            lectures    = lectures,
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["revised"],
+        ))
 
     @render.text
     def revised_count_students():
         try:
-            return revised_filtered_surveys3().shape[0]
+            return survey_count(revised_filtered_surveys3())
         except KeyError:
             return 0
     
     @render.text
     def revised_count_teachers():
         try:
-            return revised_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(revised_filtered_surveys3(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def revised_id_teachers():
         try:
-            return ", ".join(revised_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(revised_filtered_surveys3(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def revised_count_lectures():
         try:
-            return revised_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(revised_filtered_surveys3(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def revised_id_lectures():
         try:
-            return ", ".join(revised_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(revised_filtered_surveys3(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def revised_no_data():
-        if revised_filtered_surveys3().shape[0] == 0:
+        if survey_count(revised_filtered_surveys3()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
     @render.ui
@@ -216,7 +231,7 @@ def revised_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("revised_stats_umsetzung_likert")
         else:
-            return ui.output_plot("revised_plot_umsetzung_likert", height="450px")
+            return output_chart("revised_plot_umsetzung_likert", height="450px")
 
     @render.data_frame
     def revised_stats_umsetzung_likert():
@@ -226,18 +241,18 @@ def revised_server(input, output, session):
             width = "100%",
         )
 
-    @render.plot
-    def revised_plot_umsetzung_likert():
-        return plot_likert_chart(input, revised_filtered_surveys3(),
-                                "R201_01", "R201_02", "R201_03", "R201_04", "R201_05",
-                                width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def revised_plot_umsetzung_likert():
+        return await plot_likert_chart(input, revised_filtered_surveys3(),
+                                      "R201_01", "R201_02", "R201_03", "R201_04", "R201_05",
+                                      width = 0.4)
     
     @render.ui
     def revised_wirkung_likert():
         if input.display_type() == "stat":
             return ui.output_data_frame("revised_stats_wirkung_likert")
         else:
-            return ui.output_plot("revised_plot_wirkung_likert", height="450px")
+            return output_chart("revised_plot_wirkung_likert", height="450px")
 
     @render.data_frame
     def revised_stats_wirkung_likert():
@@ -247,18 +262,18 @@ def revised_server(input, output, session):
             width = "100%",
         )
 
-    @render.plot
-    def revised_plot_wirkung_likert():
-        return plot_likert_chart(input, revised_filtered_surveys3(),
-                                "R202_02", "R202_03", "R202_04", "R202_05", "R202_06",
-                                width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def revised_plot_wirkung_likert():
+        return await plot_likert_chart(input, revised_filtered_surveys3(),
+                                      "R202_02", "R202_03", "R202_04", "R202_05", "R202_06",
+                                      width = 0.4)
     
     @render.ui
     def revised_sonstiges_likert():
         if input.display_type() == "stat":
             return ui.output_data_frame("revised_stats_sonstiges_likert")
         else:
-            return ui.output_plot("revised_plot_sonstiges_likert", height="150px")
+            return output_chart("revised_plot_sonstiges_likert", height="150px")
 
     @render.data_frame
     def revised_stats_sonstiges_likert():
@@ -268,15 +283,15 @@ def revised_server(input, output, session):
             width = "100%",
         )
 
-    @render.plot
-    def revised_plot_sonstiges_likert():
-        return plot_likert_chart(input, revised_filtered_surveys3(),
-                                "R204_01",
-                                width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def revised_plot_sonstiges_likert():
+        return await plot_likert_chart(input, revised_filtered_surveys3(),
+                                      "R204_01",
+                                      width = 0.4)
 
     @render.data_frame
     def revised_df_freitext():
-        df = revised_filtered_surveys3()[["R205_01"]].astype(str).copy()
+        df = survey_columns(revised_filtered_surveys3(), "R205_01").astype(str).copy()
         df = df[df["R205_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"R205_01": get_label("R205_01")})
         return render.DataGrid(df, width="100%", height="400px")
@@ -318,8 +333,8 @@ def revised_server(input, output, session):
         if revised_ai_summary_freitext_topics_md.get():
             return
 
-        df    = revised_filtered_surveys3()
         var   = "R205_01"
+        df    = survey_columns(revised_filtered_surveys3(), "QUESTNNR", var)
         label = get_label(var)
 
         # Filter usable answers once, then build a stable mapping
@@ -635,8 +650,8 @@ def revised_server(input, output, session):
     @reactive.effect
     @reactive.event(input.btn_revised_ai_summary_freitext)
     def _revised_ai_summary_freitext_summary_stream():
-        df      = revised_filtered_surveys3()
         var     = "R205_01"
+        df      = survey_columns(revised_filtered_surveys3(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -5,15 +5,30 @@
 # This source code is licensed under the BSD 3-Clause License found in the
 # LICENSE file in the root directory of this source tree.
 
-from ..ai_llm import ai_conversation_available, cancel_ai_stream, start_ai_stream
-from ..data   import calc_likert_statistics, correlation_filters, data, get_label, plot_likert_chart
-from shiny    import reactive, render, ui
+from ..ai_llm        import ai_conversation_available, cancel_ai_stream, start_ai_stream
+from ..client_charts import output_chart, render_chart
+from ..data          import calc_likert_statistics, data, dataset_version, get_label, plot_histogram, plot_likert_chart, query_surveys, register_columns, survey_column, survey_columns, survey_count, survey_spec
+from shiny           import reactive, render, ui
 
 import faicons
 import pandas            as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mtick
-import numpy             as np
+
+#==============================================================================
+# Survey Columns
+#==============================================================================
+
+# Columns of the survey results read by this module, see `register_columns()` in `data.py`
+register_columns(
+    "V201_01", "V201_02", "V202_01", "V203_01", "V204_01", "V204_02", "V209_01", "V209_02",
+    "V209_03", "V209_04", "V209_05", "V209_06", "V209_07", "V209_08", "V209_09", "V210_01",
+    "VU03_03", "VU03_04",
+    "ZW04_01", "ZW04_02", "ZW04_03", "ZW04_04", "ZW04_05", "ZW04_06", "ZW04_07", "ZW04_08",
+    "ZW05_01", "ZW06_01",
+    "AB01_01", "AB03_01", "AB03_02", "AB03_03", "AB03_04", "AB03_05", "AB07_01", "AB07_02",
+    "AB07_03", "AB07_04", "AB07_05", "AB07_06", "AB07_07", "AB07_08", "AB07_09", "AB09_01",
+    "AB09_02", "AB09_03", "AB09_04", "AB09_05", "AB09_06", "AB09_07", "AB10_01", "AB11_01",
+    "AB12_01", "AB14_06", "AB14_07", "AB14_08", "AB14_09", "AB15_01",
+)
 
 #==============================================================================
 # UI Definition
@@ -97,7 +112,7 @@ def round1_survey1_ui():
             ui.output_ui("round1_mitgestaltung_likert1"),
             ui.div(
                 ui.div(get_label("V203_01"), class_="text-center fw-bold"),
-                ui.output_plot("round1_plot_mitgestaltung_hist1"),
+                output_chart("round1_plot_mitgestaltung_hist1"),
             ),
 
             ui.div(
@@ -277,15 +292,15 @@ def round1_survey3_ui():
 #------------------------------------------------------------------------------
 # All Together
 #------------------------------------------------------------------------------
-def round1_server(input, output, session):
-    round1_survey1_server(input, output, session)
-    round1_survey2_server(input, output, session)
-    round1_survey3_server(input, output, session)
+def round1_server(input, output, session, sidebar_filters, correlation_filters):
+    round1_survey1_server(input, output, session, sidebar_filters, correlation_filters)
+    round1_survey2_server(input, output, session, sidebar_filters, correlation_filters)
+    round1_survey3_server(input, output, session, sidebar_filters, correlation_filters)
 
 #------------------------------------------------------------------------------
 # Semester Start Survey
 #------------------------------------------------------------------------------
-def round1_survey1_server(input, output, session):
+def round1_survey1_server(input, output, session, sidebar_filters, correlation_filters):
     round1_ai_summary_vorwissen1_md = reactive.Value("")
     round1_ai_summary_bemerkungen1_md = reactive.Value("")
 
@@ -296,118 +311,99 @@ def round1_survey1_server(input, output, session):
         round1_ai_summary_vorwissen1_md.set("")
         round1_ai_summary_bemerkungen1_md.set("")
 
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = [f"R1-{teacher}-{lecture}-1" for teacher in teachers for lecture in lectures]
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
-
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
-
-        for var in correlation_filters["round1_student1"]:
-            selected = correlation_filters["round1_student1"][var].get()
-            
-            if selected:
-                if var == "V203_01":
-                    conditions.append(data["answers"][var] >= selected[0])
-                    conditions.append(data["answers"][var] <= selected[1])
-                else:
-                    conditions.append(data["answers"][var].isin(selected))
-
-        return data["answers"][np.logical_and.reduce(conditions)]
+        dataset_version()
+
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
+
+        return query_surveys(survey_spec(
+            families    = ["R1-1"],
+            teachers    = teachers,
+            lectures    = lectures,
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["round1_student1"],
+        ))
 
     @render.text
     def round1_count_students1():
         try:
-            return round1_filtered_surveys1().shape[0]
+            return survey_count(round1_filtered_surveys1())
         except KeyError:
             return 0
 
     @render.text
     def round1_count_courses1():
         try:
-            df = round1_filtered_surveys1()
-            return df.groupby(['QUESTNNR', df['STARTED'].dt.date]).ngroups
+            df = survey_columns(round1_filtered_surveys1(), "QUESTNNR", "STARTED")
+            return df.groupby(['QUESTNNR', df['STARTED'].dt.date], observed=True).ngroups
         except KeyError:
             return 0
     
     @render.text
     def round1_count_teachers1():
         try:
-            return round1_filtered_surveys1()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(round1_filtered_surveys1(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_round1_id_teachers1():
         try:
-            return ", ".join(round1_filtered_surveys1()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys1(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def round1_count_lectures1():
         try:
-            return round1_filtered_surveys1()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(round1_filtered_surveys1(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_lectures1():
         try:
-            return ", ".join(round1_filtered_surveys1()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys1(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
         
     @render.text
     def round1_no_data1():
-        if round1_filtered_surveys1().shape[0] == 0:
+        if survey_count(round1_filtered_surveys1()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
     
     @render.data_frame
     def round1_df_vorwissen1():
-        df = round1_filtered_surveys1()[["V202_01"]].astype(str).copy()
+        df = survey_columns(round1_filtered_surveys1(), "V202_01").astype(str).copy()
         df = df[df["V202_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"V202_01": get_label("V202_01")})
         return render.DataGrid(df, width="100%", height="400px")
 
     @render.data_frame
     def round1_df_bemerkungen1():
-        df = round1_filtered_surveys1()[["V210_01"]].astype(str).copy()
+        df = survey_columns(round1_filtered_surveys1(), "V210_01").astype(str).copy()
         df = df[df["V210_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"V210_01": get_label("V210_01")})
         return render.DataGrid(df, width="100%", height="400px")
 
-    @render.plot
+    @render_chart(render.plot)
     def round1_plot_mitgestaltung_hist1():
-        fig, ax = plt.subplots()
-        density = False
-        df      = round1_filtered_surveys1()["V203_01"].dropna()
-
-        if input.number_format() == "percent":
-            density = True
-            ax.yaxis.set_major_formatter(mtick.PercentFormatter(xmax=1))
-
-        ax.hist(df, 11, density=density)
-        ax.set_xlabel("Grad der Mitgestaltung")
-        ax.set_ylabel("Anzahl Antworten")
-
-        return fig
+        return plot_histogram(input, round1_filtered_surveys1(), "V203_01", "Grad der Mitgestaltung")
 
     @render.ui
     def round1_vorwissen_likert1():
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_vorwissen_likert1")
         else:
-            return ui.output_plot("round1_plot_vorwissen_likert1")
+            return output_chart("round1_plot_vorwissen_likert1")
 
-    @render.plot
-    def round1_plot_vorwissen_likert1():
-        return plot_likert_chart(input, round1_filtered_surveys1(), "V201_01", "V201_02")
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_vorwissen_likert1():
+        return await plot_likert_chart(input, round1_filtered_surveys1(), "V201_01", "V201_02")
 
     @render.data_frame
     def round1_stats_vorwissen_likert1():
@@ -421,11 +417,11 @@ def round1_survey1_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_mitgestaltung_likert1")
         else:
-            return ui.output_plot("round1_plot_mitgestaltung_likert1")
+            return output_chart("round1_plot_mitgestaltung_likert1")
         
-    @render.plot
-    def round1_plot_mitgestaltung_likert1():
-        return plot_likert_chart(input, round1_filtered_surveys1(), "V204_01", "V204_02")
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_mitgestaltung_likert1():
+        return await plot_likert_chart(input, round1_filtered_surveys1(), "V204_01", "V204_02")
 
     @render.data_frame
     def round1_stats_mitgestaltung_likert1():
@@ -439,16 +435,16 @@ def round1_survey1_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_engagement_likert1")
         else:
-            return ui.output_plot("round1_plot_engagement_likert1", height="900px")
+            return output_chart("round1_plot_engagement_likert1", height="900px")
         
-    @render.plot
-    def round1_plot_engagement_likert1():
-        return plot_likert_chart(input, round1_filtered_surveys1(),
-                                 "VU03_03", "VU03_04",
-                                 "V209_01", "V209_02", "V209_03",
-                                 "V209_04", "V209_05", "V209_06",
-                                 "V209_07", "V209_08", "V209_09",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_engagement_likert1():
+        return await plot_likert_chart(input, round1_filtered_surveys1(),
+                                       "VU03_03", "VU03_04",
+                                       "V209_01", "V209_02", "V209_03",
+                                       "V209_04", "V209_05", "V209_06",
+                                       "V209_07", "V209_08", "V209_09",
+                                       width = 0.4)
 
     @render.data_frame
     def round1_stats_engagement_likert1():
@@ -485,8 +481,8 @@ def round1_survey1_server(input, output, session):
         if round1_ai_summary_vorwissen1_md.get():
             return
 
-        df      = round1_filtered_surveys1()
         var     = "V202_01"
+        df      = survey_columns(round1_filtered_surveys1(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -525,8 +521,8 @@ def round1_survey1_server(input, output, session):
         if round1_ai_summary_bemerkungen1_md.get():
             return
 
-        df      = round1_filtered_surveys1()
         var     = "V210_01"
+        df      = survey_columns(round1_filtered_surveys1(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -544,7 +540,7 @@ def round1_survey1_server(input, output, session):
 #------------------------------------------------------------------------------
 # Semester Mid Survey
 #------------------------------------------------------------------------------
-def round1_survey2_server(input, output, session):
+def round1_survey2_server(input, output, session, sidebar_filters, correlation_filters):
     round1_ai_summary_lehr_lern_innovation2_md = reactive.Value("")
     round1_ai_summary_unterstuetzung2_md = reactive.Value("")
 
@@ -555,84 +551,81 @@ def round1_survey2_server(input, output, session):
         round1_ai_summary_lehr_lern_innovation2_md.set("")
         round1_ai_summary_unterstuetzung2_md.set("")
 
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = [f"R1-{teacher}-{lecture}-2" for teacher in teachers for lecture in lectures]
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
-
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        dataset_version()
 
-        for var in correlation_filters["round1_student2"]:
-            selected = correlation_filters["round1_student2"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = ["R1-2"],
+            teachers    = teachers,
+            lectures    = lectures,
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["round1_student2"],
+        ))
 
     @render.text
     def round1_count_students2():
         try:
-            return round1_filtered_surveys2().shape[0]
+            return survey_count(round1_filtered_surveys2())
         except KeyError:
             return 0
 
     @render.text
     def round1_count_courses2():
         try:
-            df = round1_filtered_surveys2()
-            return df.groupby(['QUESTNNR', df['STARTED'].dt.date]).ngroups
+            df = survey_columns(round1_filtered_surveys2(), "QUESTNNR", "STARTED")
+            return df.groupby(['QUESTNNR', df['STARTED'].dt.date], observed=True).ngroups
         except KeyError:
             return 0
     
     @render.text
     def round1_count_teachers2():
         try:
-            return round1_filtered_surveys2()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(round1_filtered_surveys2(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_teachers2():
         try:
-            return ", ".join(round1_filtered_surveys2()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys2(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
     
     @render.text
     def round1_count_lectures2():
         try:
-            return round1_filtered_surveys2()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(round1_filtered_surveys2(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_lectures2():
         try:
-            return ", ".join(round1_filtered_surveys2()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys2(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def round1_no_data2():
-        if round1_filtered_surveys2().shape[0] == 0:
+        if survey_count(round1_filtered_surveys2()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
     
     @render.data_frame
     def round1_df_lehr_lern_innovation2():
-        df = round1_filtered_surveys2()[["ZW06_01"]].astype(str).copy()
+        df = survey_columns(round1_filtered_surveys2(), "ZW06_01").astype(str).copy()
         df = df[df["ZW06_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"ZW06_01": get_label("ZW06_01")})
         return render.DataGrid(df, width="100%", height="400px")
     
     @render.data_frame
     def round1_df_unterstuetzung2():
-        df = round1_filtered_surveys2()[["ZW05_01"]].astype(str).copy()
+        df = survey_columns(round1_filtered_surveys2(), "ZW05_01").astype(str).copy()
         df = df[df["ZW05_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"ZW05_01": get_label("ZW05_01")})
         return render.DataGrid(df, width="100%", height="400px")
@@ -642,11 +635,11 @@ def round1_survey2_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_klarheit_likert2")
         else:
-            return ui.output_plot("round1_plot_klarheit_likert2")
+            return output_chart("round1_plot_klarheit_likert2")
         
-    @render.plot
-    def round1_plot_klarheit_likert2():
-        return plot_likert_chart(input, round1_filtered_surveys2(), "ZW04_01", "ZW04_02", "ZW04_03", "ZW04_04", width=0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_klarheit_likert2():
+        return await plot_likert_chart(input, round1_filtered_surveys2(), "ZW04_01", "ZW04_02", "ZW04_03", "ZW04_04", width=0.4)
     
     @render.data_frame
     def round1_stats_klarheit_likert2():
@@ -660,11 +653,11 @@ def round1_survey2_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_zufriedenheit_likert2")
         else:
-            return ui.output_plot("round1_plot_zufriedenheit_likert2")
+            return output_chart("round1_plot_zufriedenheit_likert2")
         
-    @render.plot
-    def round1_plot_zufriedenheit_likert2():
-        return plot_likert_chart(input, round1_filtered_surveys2(), "ZW04_05", "ZW04_06", "ZW04_07", "ZW04_08", width=0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_zufriedenheit_likert2():
+        return await plot_likert_chart(input, round1_filtered_surveys2(), "ZW04_05", "ZW04_06", "ZW04_07", "ZW04_08", width=0.4)
 
     @render.data_frame
     def round1_stats_zufriedenheit_likert2():
@@ -697,8 +690,8 @@ def round1_survey2_server(input, output, session):
         if round1_ai_summary_lehr_lern_innovation2_md.get():
             return
 
-        df      = round1_filtered_surveys2()
         var     = "ZW06_01"
+        df      = survey_columns(round1_filtered_surveys2(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -737,8 +730,8 @@ def round1_survey2_server(input, output, session):
         if round1_ai_summary_unterstuetzung2_md.get():
             return
 
-        df      = round1_filtered_surveys2()
         var     = "ZW05_01"
+        df      = survey_columns(round1_filtered_surveys2(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -756,7 +749,7 @@ def round1_survey2_server(input, output, session):
 #------------------------------------------------------------------------------
 # Semester End Survey
 #------------------------------------------------------------------------------
-def round1_survey3_server(input, output, session):
+def round1_survey3_server(input, output, session, sidebar_filters, correlation_filters):
     round1_ai_summary_q1_freetext3_md = reactive.Value("")
     round1_ai_summary_q2_freetext3_md = reactive.Value("")
     round1_ai_summary_q3_freetext3_md = reactive.Value("")
@@ -776,72 +769,69 @@ def round1_survey3_server(input, output, session):
         round1_ai_summary_q4_freetext3_md.set("")
         round1_ai_summary_q5_freetext3_md.set("")
 
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = [f"R1-{teacher}-{lecture}-3" for teacher in teachers for lecture in lectures]
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
-
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
-
-        for var in correlation_filters["round1_student3"]:
-            selected = correlation_filters["round1_student3"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
-
-        return data["answers"][np.logical_and.reduce(conditions)]
+        dataset_version()
+
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
+
+        return query_surveys(survey_spec(
+            families    = ["R1-3"],
+            teachers    = teachers,
+            lectures    = lectures,
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["round1_student3"],
+        ))
     
     @render.text
     def round1_count_students3():
         try:
-            return round1_filtered_surveys3().shape[0]
+            return survey_count(round1_filtered_surveys3())
         except KeyError:
             return 0
 
     @render.text
     def round1_count_courses3():
         try:
-            df = round1_filtered_surveys3()
-            return df.groupby(['QUESTNNR', df['STARTED'].dt.date]).ngroups
+            df = survey_columns(round1_filtered_surveys3(), "QUESTNNR", "STARTED")
+            return df.groupby(['QUESTNNR', df['STARTED'].dt.date], observed=True).ngroups
         except KeyError:
             return 0
     
     @render.text
     def round1_count_teachers3():
         try:
-            return round1_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(round1_filtered_surveys3(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_teachers3():
         try:
-            return ", ".join(round1_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys3(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def round1_count_lectures3():
         try:
-            return round1_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(round1_filtered_surveys3(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_lectures3():
         try:
-            return ", ".join(round1_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys3(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def round1_no_data3():
-        if round1_filtered_surveys3().shape[0] == 0:
+        if survey_count(round1_filtered_surveys3()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
     
     @render.ui
@@ -849,13 +839,13 @@ def round1_survey3_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_lv_inhalt_likert3")
         else:
-            return ui.output_plot("round1_plot_lv_inhalt_likert3", height="450px")
+            return output_chart("round1_plot_lv_inhalt_likert3", height="450px")
         
-    @render.plot
-    def round1_plot_lv_inhalt_likert3(): #450px
-        return plot_likert_chart(input, round1_filtered_surveys3(),
-                                 "AB03_01", "AB03_02", "AB03_03", "AB03_04", "AB03_05",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_lv_inhalt_likert3(): #450px
+        return await plot_likert_chart(input, round1_filtered_surveys3(),
+                                       "AB03_01", "AB03_02", "AB03_03", "AB03_04", "AB03_05",
+                                       width = 0.4)
     
     @render.data_frame
     def round1_stats_lv_inhalt_likert3():
@@ -870,14 +860,14 @@ def round1_survey3_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_engagement_likert3")
         else:
-            return ui.output_plot("round1_plot_engagement_likert3", height="800px")
+            return output_chart("round1_plot_engagement_likert3", height="800px")
         
-    @render.plot
-    def round1_plot_engagement_likert3():
-        return plot_likert_chart(input, round1_filtered_surveys3(),
-                                 "AB07_01", "AB07_02", "AB07_03", "AB07_04",
-                                 "AB07_05", "AB07_06", "AB07_07", "AB07_08", "AB07_09",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_engagement_likert3():
+        return await plot_likert_chart(input, round1_filtered_surveys3(),
+                                       "AB07_01", "AB07_02", "AB07_03", "AB07_04",
+                                       "AB07_05", "AB07_06", "AB07_07", "AB07_08", "AB07_09",
+                                       width = 0.4)
     
     @render.data_frame
     def round1_stats_engagement_likert3():
@@ -893,14 +883,14 @@ def round1_survey3_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_beurteilung_likert3")
         else:
-            return ui.output_plot("round1_plot_beurteilung_likert3", height="600px")
+            return output_chart("round1_plot_beurteilung_likert3", height="600px")
         
-    @render.plot
-    def round1_plot_beurteilung_likert3():
-        return plot_likert_chart(input, round1_filtered_surveys3(),
-                                 "AB09_01", "AB09_02", "AB09_03",
-                                 "AB09_04", "AB09_05", "AB09_06", "AB09_07",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_beurteilung_likert3():
+        return await plot_likert_chart(input, round1_filtered_surveys3(),
+                                       "AB09_01", "AB09_02", "AB09_03",
+                                       "AB09_04", "AB09_05", "AB09_06", "AB09_07",
+                                       width = 0.4)
     
     @render.data_frame
     def round1_stats_beurteilung_likert3():
@@ -916,13 +906,13 @@ def round1_survey3_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_lernwirksamkeit_likert3")
         else:
-            return ui.output_plot("round1_plot_lernwirksamkeit_likert3", height="400px")
+            return output_chart("round1_plot_lernwirksamkeit_likert3", height="400px")
         
-    @render.plot
-    def round1_plot_lernwirksamkeit_likert3():
-        return plot_likert_chart(input, round1_filtered_surveys3(),
-                                 "AB14_06", "AB14_07", "AB14_08", "AB14_09",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_lernwirksamkeit_likert3():
+        return await plot_likert_chart(input, round1_filtered_surveys3(),
+                                       "AB14_06", "AB14_07", "AB14_08", "AB14_09",
+                                       width = 0.4)
 
     @render.data_frame
     def round1_stats_lernwirksamkeit_likert3():
@@ -935,7 +925,7 @@ def round1_survey3_server(input, output, session):
     @render.data_frame
     def round1_df_freetext3():
         try:
-            df = round1_filtered_surveys3()[["AB01_01", "AB10_01", "AB11_01", "AB15_01", "AB12_01"]].fillna("").astype(str).copy()
+            df = survey_columns(round1_filtered_surveys3(), "AB01_01", "AB10_01", "AB11_01", "AB15_01", "AB12_01").fillna("").astype(str).copy()
             df = df[df[["AB01_01", "AB10_01", "AB11_01", "AB15_01", "AB12_01"]].apply(lambda x: x.str.len() >= 3).any(axis=1)]
 
             df = df.rename(
@@ -1002,7 +992,7 @@ def round1_survey3_server(input, output, session):
         ui.modal_show(m)
 
     def _round1_ai_summary_freetext3_question(var: str) -> str:
-        df = round1_filtered_surveys3()
+        df = survey_columns(round1_filtered_surveys3(), var)
         label = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -5,13 +5,23 @@
 # This source code is licensed under the BSD 3-Clause License found in the
 # LICENSE file in the root directory of this source tree.
 
-from ..ai_llm import ai_conversation_available, ai_message, cancel_ai_stream, start_ai_stream
-from ..data   import correlation_filters, data, get_label, plot_likert_chart
-from shiny   import reactive, render, ui
+from ..ai_llm        import ai_conversation_available, cancel_ai_stream, start_ai_stream
+from ..client_charts import output_chart, render_chart
+from ..data          import data, dataset_version, get_label, plot_likert_chart, query_surveys, register_columns, survey_column, survey_columns, survey_count, survey_spec
+from shiny           import reactive, render, ui
 
 import faicons
 import pandas            as pd
-import numpy             as np
+
+#==============================================================================
+# Survey Columns
+#==============================================================================
+
+# Columns of the survey results read by this module, see `register_columns()` in `data.py`
+register_columns(
+    "R201_01", "R201_02", "R201_03", "R201_04", "R201_05", "R202_02", "R202_03", "R202_04",
+    "R202_05", "R202_06", "R204_01", "R205_01",
+)
 
 #==============================================================================
 # UI Definition
@@ -71,17 +81,17 @@ def round3_survey3_ui():
 
         ui.div(
             ui.h5("Umsetzung der Mitgestaltung"),
-            ui.output_plot("round3_plot_umsetzung_likert", height="450px"),
+            output_chart("round3_plot_umsetzung_likert", height="450px"),
         ),
 
         ui.div(
             ui.h5("Wirkung der Mitgestaltung"),
-            ui.output_plot("round3_plot_wirkung_likert", height="450px"),
+            output_chart("round3_plot_wirkung_likert", height="450px"),
         ),
 
         ui.div(
             ui.h5("Sonstiges"),
-            ui.output_plot("round3_plot_sonstiges_likert", height="150px"),
+            output_chart("round3_plot_sonstiges_likert", height="150px"),
         ),
 
         ui.div(
@@ -108,13 +118,13 @@ def round3_survey3_ui():
 #------------------------------------------------------------------------------
 # All Together
 #------------------------------------------------------------------------------
-def round3_server(input, output, session):
-    round3_survey3_server(input, output, session)
+def round3_server(input, output, session, sidebar_filters, correlation_filters):
+    round3_survey3_server(input, output, session, sidebar_filters, correlation_filters)
 
 #------------------------------------------------------------------------------
 # Semester End Survey
 #------------------------------------------------------------------------------
-def round3_survey3_server(input, output, session):
+def round3_survey3_server(input, output, session, sidebar_filters, correlation_filters):
     round3_ai_summary_freitext_md = reactive.Value("")
 
     @reactive.calc
@@ -122,87 +132,84 @@ def round3_survey3_server(input, output, session):
         cancel_ai_stream("round3_freitext")
         round3_ai_summary_freitext_md.set("")
 
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = [f"R3-{teacher}-{lecture}" for teacher in teachers for lecture in lectures]
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
-
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        dataset_version()
 
-        for var in correlation_filters["round3_student3"]:
-            selected = correlation_filters["round3_student3"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = ["R3"],
+            teachers    = teachers,
+            lectures    = lectures,
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["round3_student3"],
+        ))
 
     @render.text
     def round3_count_students3():
         try:
-            return round3_filtered_surveys3().shape[0]
+            return survey_count(round3_filtered_surveys3())
         except KeyError:
             return 0
     
     @render.text
     def round3_count_teachers3():
         try:
-            return round3_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(round3_filtered_surveys3(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round3_id_teachers3():
         try:
-            return ", ".join(round3_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(round3_filtered_surveys3(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def round3_count_lectures3():
         try:
-            return round3_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(round3_filtered_surveys3(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round3_id_lectures3():
         try:
-            return ", ".join(round3_filtered_surveys3()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(round3_filtered_surveys3(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def round3_no_data3():
-        if round3_filtered_surveys3().shape[0] == 0:
+        if survey_count(round3_filtered_surveys3()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
-    @render.plot
-    def round3_plot_umsetzung_likert():
-        return plot_likert_chart(input, round3_filtered_surveys3(),
-                                 "R201_01", "R201_02", "R201_03", "R201_04", "R201_05",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round3_plot_umsetzung_likert():
+        return await plot_likert_chart(input, round3_filtered_surveys3(),
+                                       "R201_01", "R201_02", "R201_03", "R201_04", "R201_05",
+                                       width = 0.4)
     
-    @render.plot
-    def round3_plot_wirkung_likert():
-        return plot_likert_chart(input, round3_filtered_surveys3(),
-                                 "R202_02", "R202_03", "R202_04", "R202_05", "R202_06",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round3_plot_wirkung_likert():
+        return await plot_likert_chart(input, round3_filtered_surveys3(),
+                                       "R202_02", "R202_03", "R202_04", "R202_05", "R202_06",
+                                       width = 0.4)
     
-    @render.plot
-    def round3_plot_sonstiges_likert():
-        return plot_likert_chart(input, round3_filtered_surveys3(),
-                                 "R204_01",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def round3_plot_sonstiges_likert():
+        return await plot_likert_chart(input, round3_filtered_surveys3(),
+                                       "R204_01",
+                                       width = 0.4)
     
     @render.data_frame
     def round3_df_freitext():
-        df = round3_filtered_surveys3()[["R205_01"]].astype(str).copy()
+        df = survey_columns(round3_filtered_surveys3(), "R205_01").astype(str).copy()
         df = df[df["R205_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"R205_01": get_label("R205_01")})
         return render.DataGrid(df, width="100%", height="400px")
@@ -235,8 +242,8 @@ def round3_survey3_server(input, output, session):
         if round3_ai_summary_freitext_md.get():
             return
 
-        df      = round3_filtered_surveys3()
         var     = "R205_01"
+        df      = survey_columns(round3_filtered_surveys3(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
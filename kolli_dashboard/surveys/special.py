@@ -5,15 +5,33 @@
 # This source code is licensed under the BSD 3-Clause License found in the
 # LICENSE file in the root directory of this source tree.
 
-from ..ai_llm import ai_conversation_available, cancel_ai_stream, start_ai_stream
-from ..data   import calc_likert_statistics, correlation_filters, data, get_label, plot_likert_chart
-from shiny   import reactive, render, ui
+from ..ai_llm        import ai_conversation_available, cancel_ai_stream, start_ai_stream
+from ..client_charts import output_chart, render_chart
+from ..data          import calc_likert_statistics, data, dataset_version, get_label, plot_histogram, plot_likert_chart, query_surveys, register_columns, survey_column, survey_columns, survey_count, survey_spec
+from shiny           import reactive, render, ui
 
 import faicons
 import pandas            as pd
-import matplotlib.pyplot as plt
-import matplotlib.ticker as mtick
-import numpy             as np
+
+#==============================================================================
+# Survey Columns
+#==============================================================================
+
+# Columns of the survey results read by this module, see `register_columns()` in `data.py`
+register_columns(
+    "DR01_01", "DR02_01", "DR03_01", "DR04_01", "DR05_01", "DR06_01", "DR06_08",
+    "AA01_01", "AA01_02", "AA01_03", "AA01_04", "AA02_01", "AA03_01", "AA03_02", "AA03_03",
+    "AA03_04", "AA04_01",
+    "AS01_01", "AS01_02", "AS01_03", "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
+    "AS03_01", "AS04_01",
+    "IL02", "IL03_01", "IL03_02", "IL03_03", "IL03_04", "IL03_05", "IL04_06", "IL05_01",
+    "IL05_02", "IL05_03", "IL05_04", "IL05_05", "IL06_01", "IL06_02", "IL06_03", "IL06_04",
+    "IL07_01", "IL08_01", "IL08_02", "IL08_03", "IL09_01", "IL09_02", "IL09_03", "IL09_04",
+    "IL10_01", "IL10_02", "IL10_03", "IL10_04", "IL10_05", "IL10_06", "IL11_01", "IL12_01",
+    "IL12_02", "IL12_03", "IL13_01", "IL13_02", "IL13_03", "IL13_04", "IL13_05", "IL13_06",
+    "IL13_07", "IL13_08", "IL13_09", "IL13_10", "IL13_11", "IL14_01", "IL15_06", "IL16_06",
+    "IL17_06", "IL18_06",
+)
 
 #==============================================================================
 # UI Definition
@@ -134,7 +152,7 @@ def special_desc_r2_general_ui():
             ui.output_ui("special_haltung_likert_desc_general"),
             ui.div(
                 ui.div(get_label("AA02_01"), class_="text-center fw-bold"),
-                ui.output_plot("special_plot_haltung_hist_desc_general"),
+                output_chart("special_plot_haltung_hist_desc_general"),
             ),
 
             ui.h5("Mitbestimmung in der Vorlesung"),
@@ -416,18 +434,18 @@ def special_learning_roomui():
 #------------------------------------------------------------------------------
 # All Together
 #------------------------------------------------------------------------------
-def special_server(input, output, session):
-    special_dira_r1_special_server(input, output, session)
-    special_desc_r2_general_server(input, output, session)
-    special_desc_r2_objectives_server(input, output, session)
-    special_desc_r2_assessment_server(input, output, session)
-    special_desc_r2_reflection_server(input, output, session)
-    special_learning_roomserver(input, output, session)
+def special_server(input, output, session, sidebar_filters, correlation_filters):
+    special_dira_r1_special_server(input, output, session, sidebar_filters, correlation_filters)
+    special_desc_r2_general_server(input, output, session, sidebar_filters, correlation_filters)
+    special_desc_r2_objectives_server(input, output, session, sidebar_filters, correlation_filters)
+    special_desc_r2_assessment_server(input, output, session, sidebar_filters, correlation_filters)
+    special_desc_r2_reflection_server(input, output, session, sidebar_filters, correlation_filters)
+    special_learning_roomserver(input, output, session, sidebar_filters, correlation_filters)
 
 #------------------------------------------------------------------------------
 # DIRA2 Learning Diaries
 #------------------------------------------------------------------------------
-def special_dira_r1_special_server(input, output, session):
+def special_dira_r1_special_server(input, output, session, sidebar_filters, correlation_filters):
     round1_ai_summary_q1_dira2_special_md = reactive.Value("")
     round1_ai_summary_q2_dira2_special_md = reactive.Value("")
     round1_ai_summary_q3_dira2_special_md = reactive.Value("")
@@ -447,81 +465,79 @@ def special_dira_r1_special_server(input, output, session):
         round1_ai_summary_q4_dira2_special_md.set("")
         round1_ai_summary_q5_dira2_special_md.set("")
 
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = []
+        dataset_version()
 
-        if "DIRA" in teachers and "PROG1" in lectures:
-            questnnrs = ["R1-DIRA-PROG1-2-special"]
-
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        families   = []
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        if "DIRA" in teachers and "PROG1" in lectures:
+            families = ["R1-2-special"]
 
-        for var in correlation_filters["special_DIRA_r1"]:
-            selected = correlation_filters["special_DIRA_r1"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = families,
+            teachers    = ["DIRA"],
+            lectures    = ["PROG1"],
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["special_DIRA_r1"],
+        ))
 
     @render.text
     def round1_count_students_dira2_special():
         try:
-            return round1_filtered_surveys_dira2_special().shape[0]
+            return survey_count(round1_filtered_surveys_dira2_special())
         except KeyError:
             return 0
 
     @render.text
     def round1_count_courses_dira2_special():
         try:
-            return round1_filtered_surveys_dira2_special()["STARTED"].dt.date.unique().shape[0]
+            return survey_column(round1_filtered_surveys_dira2_special(), "STARTED").dt.date.unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_count_teachers_dira2_special():
         try:
-            return round1_filtered_surveys_dira2_special()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(round1_filtered_surveys_dira2_special(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_teachers_dira2_special():
         try:
-            return ", ".join(round1_filtered_surveys_dira2_special()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys_dira2_special(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
     
     @render.text
     def round1_count_lectures_dira2_special():
         try:
-            return round1_filtered_surveys_dira2_special()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(round1_filtered_surveys_dira2_special(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def round1_id_lectures_dira2_special():
         try:
-            return ", ".join(round1_filtered_surveys_dira2_special()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(round1_filtered_surveys_dira2_special(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
         
     @render.text
     def round1_no_data_dira2_special():
-        if round1_filtered_surveys_dira2_special().shape[0] == 0:
+        if survey_count(round1_filtered_surveys_dira2_special()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
     
     @render.data_frame
     def round1_df_freetext_dira2_special():
         try:
-            df = round1_filtered_surveys_dira2_special()[["DR01_01", "DR02_01", "DR03_01", "DR04_01", "DR05_01"]].astype(str).copy()
+            df = survey_columns(round1_filtered_surveys_dira2_special(), "DR01_01", "DR02_01", "DR03_01", "DR04_01", "DR05_01").astype(str).copy()
             df = df[df[["DR01_01", "DR02_01", "DR03_01", "DR04_01", "DR05_01"]].apply(lambda x: x.str.len() >= 3).any(axis=1)]
 
             df = df.rename(
@@ -543,11 +559,11 @@ def special_dira_r1_special_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("round1_stats_likert_dira2_special")
         else:
-            return ui.output_plot("round1_plot_likert_dira2_special")
+            return output_chart("round1_plot_likert_dira2_special")
         
-    @render.plot
-    def round1_plot_likert_dira2_special():
-        return plot_likert_chart(input, round1_filtered_surveys_dira2_special(), "DR06_01", "DR06_08")
+    @render_chart(render.image(delete_file=True))
+    async def round1_plot_likert_dira2_special():
+        return await plot_likert_chart(input, round1_filtered_surveys_dira2_special(), "DR06_01", "DR06_08")
     
     @render.data_frame
     def round1_stats_likert_dira2_special():
@@ -606,7 +622,7 @@ def special_dira_r1_special_server(input, output, session):
         ui.modal_show(m)
     
     def _round1_ai_summary_dira2_special_question(var: str) -> str:
-        df = round1_filtered_surveys_dira2_special()
+        df = survey_columns(round1_filtered_surveys_dira2_special(), var)
         label = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
@@ -687,75 +703,69 @@ def special_dira_r1_special_server(input, output, session):
 #------------------------------------------------------------------------------
 # DESCH2 Participation in General
 #------------------------------------------------------------------------------
-def special_desc_r2_general_server(input, output, session):
+def special_desc_r2_general_server(input, output, session, sidebar_filters, correlation_filters):
     @reactive.calc
     def special_filtered_surveys_desc_general():
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = []
+        dataset_version()
 
-        if "DESC" in teachers and "VERTSYS" in lectures:
-            questnnrs = ["R2-DESC-VERTSYS-Allgemein"]
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        families   = []
 
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+        if "DESC" in teachers and "VERTSYS" in lectures:
+            families = ["R2-Allgemein"]
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        for var in correlation_filters["special_DESC_r2_general"]:
-            selected = correlation_filters["special_DESC_r2_general"][var].get()
-            
-            if selected:
-                if var == "AA02_01":
-                    conditions.append(data["answers"][var] >= selected[0])
-                    conditions.append(data["answers"][var] <= selected[1])
-                else:
-                    conditions.append(data["answers"][var].isin(selected))
-
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = families,
+            teachers    = ["DESC"],
+            lectures    = ["VERTSYS"],
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["special_DESC_r2_general"],
+        ))
 
     @render.text
     def special_count_students_desc_general():
         try:
-            return special_filtered_surveys_desc_general().shape[0]
+            return survey_count(special_filtered_surveys_desc_general())
         except KeyError:
             return 0
     
     @render.text
     def special_count_teachers_desc_general():
         try:
-            return special_filtered_surveys_desc_general()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_general(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_teachers_desc_general():
         try:
-            return ", ".join(special_filtered_surveys_desc_general()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_general(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_count_lectures_desc_general():
         try:
-            return special_filtered_surveys_desc_general()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_general(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_lectures_desc_general():
         try:
-            return ", ".join(special_filtered_surveys_desc_general()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_general(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_no_data_desc_general():
-        if special_filtered_surveys_desc_general().shape[0] == 0:
+        if survey_count(special_filtered_surveys_desc_general()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
     @render.ui
@@ -763,13 +773,13 @@ def special_desc_r2_general_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_haltung_likert_desc_general")
         else:
-            return ui.output_plot("special_plot_haltung_likert_desc_general")
+            return output_chart("special_plot_haltung_likert_desc_general")
 
-    @render.plot
-    def special_plot_haltung_likert_desc_general():
-        return plot_likert_chart(input, special_filtered_surveys_desc_general(),
-                                 "AA01_01", "AA01_02", "AA01_03", "AA01_04",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_haltung_likert_desc_general():
+        return await plot_likert_chart(input, special_filtered_surveys_desc_general(),
+                                       "AA01_01", "AA01_02", "AA01_03", "AA01_04",
+                                       width = 0.4)
 
     @render.data_frame
     def special_stats_haltung_likert_desc_general():
@@ -779,34 +789,22 @@ def special_desc_r2_general_server(input, output, session):
             width = "100%",
         )
     
-    @render.plot
+    @render_chart(render.plot)
     def special_plot_haltung_hist_desc_general():
-        fig, ax = plt.subplots()
-        density = False
-        df      = special_filtered_surveys_desc_general()["AA02_01"].dropna()
-
-        if input.number_format() == "percent":
-            density = True
-            ax.yaxis.set_major_formatter(mtick.PercentFormatter(xmax=1))
-
-        ax.hist(df, 11, density=density)
-        ax.set_xlabel("Grad der Mitgestaltung")
-        ax.set_ylabel("Anzahl Antworten")
-
-        return fig
+        return plot_histogram(input, special_filtered_surveys_desc_general(), "AA02_01", "Grad der Mitgestaltung")
     
     @render.ui
     def special_mitbestimmung_likert_desc_general():
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_mitbestimmung_likert_desc_general")
         else:
-            return ui.output_plot("special_plot_mitbestimmung_likert_desc_general")
+            return output_chart("special_plot_mitbestimmung_likert_desc_general")
         
-    @render.plot
-    def special_plot_mitbestimmung_likert_desc_general():
-        return plot_likert_chart(input, special_filtered_surveys_desc_general(),
-                                 "AA03_01", "AA03_02", "AA03_03", "AA03_04",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_mitbestimmung_likert_desc_general():
+        return await plot_likert_chart(input, special_filtered_surveys_desc_general(),
+                                       "AA03_01", "AA03_02", "AA03_03", "AA03_04",
+                                       width = 0.4)
     
     @render.data_frame
     def special_stats_mitbestimmung_likert_desc_general():
@@ -818,7 +816,7 @@ def special_desc_r2_general_server(input, output, session):
     
     @render.data_frame
     def special_df_freitext_desc_general():
-        df = special_filtered_surveys_desc_general()[["AA04_01"]].astype(str).copy()
+        df = survey_columns(special_filtered_surveys_desc_general(), "AA04_01").astype(str).copy()
         df = df[df["AA04_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"AA04_01": get_label("AA04_01")})
         return render.DataGrid(df, width="100%", height="400px")
@@ -826,71 +824,69 @@ def special_desc_r2_general_server(input, output, session):
 #------------------------------------------------------------------------------
 # DESCH2 Learning Objectives
 #------------------------------------------------------------------------------
-def special_desc_r2_objectives_server(input, output, session):
+def special_desc_r2_objectives_server(input, output, session, sidebar_filters, correlation_filters):
     @reactive.calc
     def special_filtered_surveys_desc_objectives():
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = []
+        dataset_version()
 
-        if "DESC" in teachers and "VERTSYS" in lectures:
-            questnnrs = ["R2-DESC-VERTSYS-Lernziele"]
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        families   = []
 
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+        if "DESC" in teachers and "VERTSYS" in lectures:
+            families = ["R2-Lernziele"]
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        for var in correlation_filters["special_DESC_r2_specific"]:
-            selected = correlation_filters["special_DESC_r2_specific"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
-
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = families,
+            teachers    = ["DESC"],
+            lectures    = ["VERTSYS"],
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["special_DESC_r2_specific"],
+        ))
 
     @render.text
     def special_count_students_desc_objectives():
         try:
-            return special_filtered_surveys_desc_objectives().shape[0]
+            return survey_count(special_filtered_surveys_desc_objectives())
         except KeyError:
             return 0
     
     @render.text
     def special_count_teachers_desc_objectives():
         try:
-            return special_filtered_surveys_desc_objectives()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_objectives(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_teachers_desc_objectives():
         try:
-            return ", ".join(special_filtered_surveys_desc_objectives()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_objectives(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_count_lectures_desc_objectives():
         try:
-            return special_filtered_surveys_desc_objectives()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_objectives(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_lectures_desc_objectives():
         try:
-            return ", ".join(special_filtered_surveys_desc_objectives()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_objectives(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_no_data_desc_objectives():
-        if special_filtered_surveys_desc_objectives().shape[0] == 0:
+        if survey_count(special_filtered_surveys_desc_objectives()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
     @render.ui
@@ -898,13 +894,13 @@ def special_desc_r2_objectives_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_nutzen_likert_desc_objectives")
         else:
-            return ui.output_plot("special_plot_nutzen_likert_desc_objectives", height="330px")
+            return output_chart("special_plot_nutzen_likert_desc_objectives", height="330px")
         
-    @render.plot
-    def special_plot_nutzen_likert_desc_objectives(): #330px
-        return plot_likert_chart(input, special_filtered_surveys_desc_objectives(),
-                                 "AS01_01", "AS01_02", "AS01_03",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_nutzen_likert_desc_objectives(): #330px
+        return await plot_likert_chart(input, special_filtered_surveys_desc_objectives(),
+                                       "AS01_01", "AS01_02", "AS01_03",
+                                       width = 0.4)
 
     @render.data_frame
     def special_stats_nutzen_likert_desc_objectives():
@@ -919,13 +915,13 @@ def special_desc_r2_objectives_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_umsetzung_likert_desc_objectives")
         else:
-            return ui.output_plot("special_plot_umsetzung_likert_desc_objectives", height="500px")
+            return output_chart("special_plot_umsetzung_likert_desc_objectives", height="500px")
         
-    @render.plot
-    def special_plot_umsetzung_likert_desc_objectives(): #500px
-        return plot_likert_chart(input, special_filtered_surveys_desc_objectives(),
-                                 "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_umsetzung_likert_desc_objectives(): #500px
+        return await plot_likert_chart(input, special_filtered_surveys_desc_objectives(),
+                                       "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
+                                       width = 0.4)
 
     @render.data_frame
     def special_stats_umsetzung_likert_desc_objectives():
@@ -938,7 +934,7 @@ def special_desc_r2_objectives_server(input, output, session):
     @render.data_frame
     def special_df_freitext_desc_objectives():
         try:
-            df = special_filtered_surveys_desc_objectives()[["AS03_01", "AS04_01"]].fillna("").astype(str).copy()
+            df = survey_columns(special_filtered_surveys_desc_objectives(), "AS03_01", "AS04_01").fillna("").astype(str).copy()
             df = df[df[["AS03_01", "AS04_01"]].apply(lambda x: x.str.len() >= 3).any(axis=1)]
 
             df = df.rename(
@@ -955,71 +951,69 @@ def special_desc_r2_objectives_server(input, output, session):
 #------------------------------------------------------------------------------
 # DESCH2 Assessment Criteria
 #------------------------------------------------------------------------------
-def special_desc_r2_assessment_server(input, output, session):
+def special_desc_r2_assessment_server(input, output, session, sidebar_filters, correlation_filters):
     @reactive.calc
     def special_filtered_surveys_desc_assessment():
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = []
-
-        if "DESC" in teachers and "VERTSYS" in lectures:
-            questnnrs = ["R2-DESC-VERTSYS-Pruefungsaufgabe"]
+        dataset_version()
 
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        families   = []
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        if "DESC" in teachers and "VERTSYS" in lectures:
+            families = ["R2-Pruefungsaufgabe"]
 
-        for var in correlation_filters["special_DESC_r2_specific"]:
-            selected = correlation_filters["special_DESC_r2_specific"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = families,
+            teachers    = ["DESC"],
+            lectures    = ["VERTSYS"],
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["special_DESC_r2_specific"],
+        ))
 
     @render.text
     def special_count_students_desc_assessment():
         try:
-            return special_filtered_surveys_desc_assessment().shape[0]
+            return survey_count(special_filtered_surveys_desc_assessment())
         except KeyError:
             return 0
     
     @render.text
     def special_count_teachers_desc_assessment():
         try:
-            return special_filtered_surveys_desc_assessment()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_assessment(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_teachers_desc_assessment():
         try:
-            return ", ".join(special_filtered_surveys_desc_assessment()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_assessment(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_count_lectures_desc_assessment():
         try:
-            return special_filtered_surveys_desc_assessment()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_assessment(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_lectures_desc_assessment():
         try:
-            return ", ".join(special_filtered_surveys_desc_assessment()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_assessment(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_no_data_desc_assessment():
-        if special_filtered_surveys_desc_assessment().shape[0] == 0:
+        if survey_count(special_filtered_surveys_desc_assessment()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
     @render.ui
@@ -1027,13 +1021,13 @@ def special_desc_r2_assessment_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_nutzen_likert_desc_assessment")
         else:
-            return ui.output_plot("special_plot_nutzen_likert_desc_assessment", height="300px")
+            return output_chart("special_plot_nutzen_likert_desc_assessment", height="300px")
 
-    @render.plot
-    def special_plot_nutzen_likert_desc_assessment():
-        return plot_likert_chart(input, special_filtered_surveys_desc_assessment(),
-                                 "AS01_01", "AS01_02", "AS01_03",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_nutzen_likert_desc_assessment():
+        return await plot_likert_chart(input, special_filtered_surveys_desc_assessment(),
+                                       "AS01_01", "AS01_02", "AS01_03",
+                                       width = 0.4)
 
     @render.data_frame
     def special_stats_nutzen_likert_desc_assessment():
@@ -1048,13 +1042,13 @@ def special_desc_r2_assessment_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_umsetzung_likert_desc_assessment")
         else:
-            return ui.output_plot("special_plot_umsetzung_likert_desc_assessment", height="500px")
+            return output_chart("special_plot_umsetzung_likert_desc_assessment", height="500px")
         
-    @render.plot
-    def special_plot_umsetzung_likert_desc_assessment():
-        return plot_likert_chart(input, special_filtered_surveys_desc_assessment(),
-                                 "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_umsetzung_likert_desc_assessment():
+        return await plot_likert_chart(input, special_filtered_surveys_desc_assessment(),
+                                       "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
+                                       width = 0.4)
     
     @render.data_frame
     def special_stats_umsetzung_likert_desc_assessment():
@@ -1067,7 +1061,7 @@ def special_desc_r2_assessment_server(input, output, session):
     @render.data_frame
     def special_df_freitext_desc_assessment():
         try:
-            df = special_filtered_surveys_desc_assessment()[["AS03_01", "AS04_01"]].fillna("").astype(str).copy()
+            df = survey_columns(special_filtered_surveys_desc_assessment(), "AS03_01", "AS04_01").fillna("").astype(str).copy()
             df = df[df[["AS03_01", "AS04_01"]].apply(lambda x: x.str.len() >= 3).any(axis=1)]
 
             df = df.rename(
@@ -1084,71 +1078,69 @@ def special_desc_r2_assessment_server(input, output, session):
 #------------------------------------------------------------------------------
 # DESCH2 Reflection Questions
 #------------------------------------------------------------------------------
-def special_desc_r2_reflection_server(input, output, session):
+def special_desc_r2_reflection_server(input, output, session, sidebar_filters, correlation_filters):
     @reactive.calc
     def special_filtered_surveys_desc_reflection():
-        teachers   = input.teachers() or data["teachers"]
-        lectures   = input.lectures() or data["lectures"]
-        questnnrs  = []
-
-        if "DESC" in teachers and "VERTSYS" in lectures:
-            questnnrs = ["R2-DESC-VERTSYS-Reflexion"]
+        dataset_version()
 
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+        filters    = sidebar_filters()
+        teachers   = filters["teachers"] or data["teachers"]
+        lectures   = filters["lectures"] or data["lectures"]
+        families   = []
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        if "DESC" in teachers and "VERTSYS" in lectures:
+            families = ["R2-Reflexion"]
 
-        for var in correlation_filters["special_DESC_r2_specific"]:
-            selected = correlation_filters["special_DESC_r2_specific"][var].get()
-            
-            if selected:
-                    conditions.append(data["answers"][var].isin(selected))
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = families,
+            teachers    = ["DESC"],
+            lectures    = ["VERTSYS"],
+            start       = start_date,
+            end         = end_date,
+            correlation = correlation_filters["special_DESC_r2_specific"],
+        ))
 
     @render.text
     def special_count_students_desc_reflection():
         try:
-            return special_filtered_surveys_desc_reflection().shape[0]
+            return survey_count(special_filtered_surveys_desc_reflection())
         except KeyError:
             return 0
     
     @render.text
     def special_count_teachers_desc_reflection():
         try:
-            return special_filtered_surveys_desc_reflection()["QUESTNNR"].str.split("-", expand=True)[1].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_reflection(), "TEACHER").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_teachers_desc_reflection():
         try:
-            return ", ".join(special_filtered_surveys_desc_reflection()["QUESTNNR"].str.split("-", expand=True)[1].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_reflection(), "TEACHER").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_count_lectures_desc_reflection():
         try:
-            return special_filtered_surveys_desc_reflection()["QUESTNNR"].str.split("-", expand=True)[2].unique().shape[0]
+            return survey_column(special_filtered_surveys_desc_reflection(), "LECTURE").unique().shape[0]
         except KeyError:
             return 0
     
     @render.text
     def special_id_lectures_desc_reflection():
         try:
-            return ", ".join(special_filtered_surveys_desc_reflection()["QUESTNNR"].str.split("-", expand=True)[2].unique().tolist())
+            return ", ".join(survey_column(special_filtered_surveys_desc_reflection(), "LECTURE").unique().tolist())
         except KeyError:
             return ""
 
     @render.text
     def special_no_data_desc_reflection():
-        if special_filtered_surveys_desc_reflection().shape[0] == 0:
+        if survey_count(special_filtered_surveys_desc_reflection()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
     @render.ui
@@ -1156,13 +1148,13 @@ def special_desc_r2_reflection_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_nutzen_likert_desc_reflection")
         else:
-            return ui.output_plot("special_plot_nutzen_likert_desc_reflection", height="300px")
+            return output_chart("special_plot_nutzen_likert_desc_reflection", height="300px")
         
-    @render.plot
-    def special_plot_nutzen_likert_desc_reflection():
-        return plot_likert_chart(input, special_filtered_surveys_desc_reflection(),
-                                 "AS01_01", "AS01_02", "AS01_03",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_nutzen_likert_desc_reflection():
+        return await plot_likert_chart(input, special_filtered_surveys_desc_reflection(),
+                                       "AS01_01", "AS01_02", "AS01_03",
+                                       width = 0.4)
 
     @render.data_frame
     def special_stats_nutzen_likert_desc_reflection():
@@ -1177,13 +1169,13 @@ def special_desc_r2_reflection_server(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("special_stats_umsetzung_likert_desc_reflection")
         else:
-            return ui.output_plot("special_plot_umsetzung_likert_desc_reflection", height="500px")
+            return output_chart("special_plot_umsetzung_likert_desc_reflection", height="500px")
         
-    @render.plot
-    def special_plot_umsetzung_likert_desc_reflection():
-        return plot_likert_chart(input, special_filtered_surveys_desc_reflection(),
-                                 "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
-                                 width = 0.4)
+    @render_chart(render.image(delete_file=True))
+    async def special_plot_umsetzung_likert_desc_reflection():
+        return await plot_likert_chart(input, special_filtered_surveys_desc_reflection(),
+                                       "AS02_01", "AS02_02", "AS02_03", "AS02_04", "AS02_05",
+                                       width = 0.4)
     
     @render.data_frame
     def special_stats_umsetzung_likert_desc_reflection():
@@ -1196,7 +1188,7 @@ def special_desc_r2_reflection_server(input, output, session):
     @render.data_frame
     def special_df_freitext_desc_reflection():
         try:
-            df = special_filtered_surveys_desc_reflection()[["AS03_01", "AS04_01"]].fillna("").astype(str).copy()
+            df = survey_columns(special_filtered_surveys_desc_reflection(), "AS03_01", "AS04_01").fillna("").astype(str).copy()
             df = df[df[["AS03_01", "AS04_01"]].apply(lambda x: x.str.len() >= 3).any(axis=1)]
 
             df = df.rename(
@@ -1213,7 +1205,7 @@ def special_desc_r2_reflection_server(input, output, session):
 #------------------------------------------------------------------------------
 # Innovative Learning Room
 #------------------------------------------------------------------------------
-def special_learning_roomserver(input, output, session):
+def special_learning_roomserver(input, output, session, sidebar_filters, correlation_filters):
     ai_summary_others_lr1_md = reactive.Value("")
 
     @reactive.calc
@@ -1221,42 +1213,42 @@ def special_learning_roomserver(input, output, session):
         cancel_ai_stream("special_others_lr1_IL14_01")
         ai_summary_others_lr1_md.set("")
 
-        questnnrs  = ["LERNRAUM-1"]
-        start_date = pd.to_datetime(input.date_range()[0])
-        end_date   = pd.to_datetime(input.date_range()[1])
+        dataset_version()
 
-        conditions = [
-            (data["answers"]["QUESTNNR"].isin(questnnrs)),
-            (data["answers"]["STARTED"] >= start_date),
-            (data["answers"]["STARTED"] <= end_date),
-        ]
+        filters    = sidebar_filters()
+        start_date = pd.to_datetime(filters["date_range"][0])
+        end_date   = pd.to_datetime(filters["date_range"][1])
 
-        return data["answers"][np.logical_and.reduce(conditions)]
+        return query_surveys(survey_spec(
+            families    = ["LERNRAUM-1"],
+            start       = start_date,
+            end         = end_date,
+        ))
     
     @render.text
     def count_answers_lr1():
         try:
-            return filtered_surveys_lr1().shape[0]
+            return survey_count(filtered_surveys_lr1())
         except KeyError:
             return 0
     
     @render.text
     def count_knowing_lr1():
         try:
-            return filtered_surveys_lr1()["IL02"].value_counts().get(1, 0)
+            return survey_column(filtered_surveys_lr1(), "IL02").value_counts().get(1, 0)
         except KeyError:
             return 0
     
     @render.text
     def count_not_knowing_lr1():
         try:
-            return filtered_surveys_lr1()["IL02"].value_counts().get(2, 0)
+            return survey_column(filtered_surveys_lr1(), "IL02").value_counts().get(2, 0)
         except KeyError:
             return 0
 
     @render.text
     def no_data_lr1():
-        if filtered_surveys_lr1().shape[0] == 0:
+        if survey_count(filtered_surveys_lr1()) == 0:
             return "Es liegen keine Umfrageergebnisse für die gewählten Filterkriterien vor."
 
     @render.ui
@@ -1264,11 +1256,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_usage_likert_lr1")
         else:
-            return ui.output_plot("plot_usage_likert_lr1", height="400px")
+            return output_chart("plot_usage_likert_lr1", height="400px")
 
-    @render.plot
-    def plot_usage_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL03_01", "IL03_02", "IL03_03", "IL03_04", "IL03_05", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_usage_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL03_01", "IL03_02", "IL03_03", "IL03_04", "IL03_05", width=0.5)
 
     @render.data_frame
     def stats_usage_likert_lr1():
@@ -1279,7 +1271,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_usage_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL04_06"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL04_06").astype(str).copy()
         df = df[df["IL04_06"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL04_06": get_label("IL04_06")})
         return render.DataGrid(df, width="100%")
@@ -1289,11 +1281,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_imagination_likert_lr1")
         else:
-            return ui.output_plot("plot_imagination_likert_lr1", height="400px")
+            return output_chart("plot_imagination_likert_lr1", height="400px")
         
-    @render.plot
-    def plot_imagination_likert_lr1(): #400px
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL05_01", "IL05_02", "IL05_03", "IL05_04", "IL05_05", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_imagination_likert_lr1(): #400px
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL05_01", "IL05_02", "IL05_03", "IL05_04", "IL05_05", width=0.5)
 
     @render.data_frame
     def stats_imagination_likert_lr1():
@@ -1304,7 +1296,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_imagination_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL16_06"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL16_06").astype(str).copy()
         df = df[df["IL16_06"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL16_06": get_label("IL16_06")})
         return render.DataGrid(df, width="100%")
@@ -1314,11 +1306,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_aspects_likert_lr1")
         else:
-            return ui.output_plot("plot_aspects_likert_lr1", height="350px")
+            return output_chart("plot_aspects_likert_lr1", height="350px")
         
-    @render.plot
-    def plot_aspects_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL06_01", "IL06_02", "IL06_03", "IL06_04", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_aspects_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL06_01", "IL06_02", "IL06_03", "IL06_04", width=0.5)
 
     @render.data_frame
     def stats_aspects_likert_lr1():
@@ -1329,7 +1321,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_aspects_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL07_01"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL07_01").astype(str).copy()
         df = df[df["IL07_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL07_01": get_label("IL07_01")})
         return render.DataGrid(df, width="100%")
@@ -1339,11 +1331,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_colors_likert_lr1")
         else:
-            return ui.output_plot("plot_colors_likert_lr1", height="280px")
+            return output_chart("plot_colors_likert_lr1", height="280px")
         
-    @render.plot
-    def plot_colors_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL08_01", "IL08_02", "IL08_03", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_colors_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL08_01", "IL08_02", "IL08_03", width=0.5)
 
     @render.data_frame
     def stats_colors_likert_lr1():
@@ -1354,7 +1346,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_colors_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL15_06"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL15_06").astype(str).copy()
         df = df[df["IL15_06"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL15_06": get_label("IL15_06")})
         return render.DataGrid(df, width="100%")
@@ -1364,11 +1356,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_accessibility_likert_lr1")
         else:
-            return ui.output_plot("plot_accessibility_likert_lr1", height="350px")
+            return output_chart("plot_accessibility_likert_lr1", height="350px")
         
-    @render.plot
-    def plot_accessibility_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL09_01", "IL09_02", "IL09_03", "IL09_04", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_accessibility_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL09_01", "IL09_02", "IL09_03", "IL09_04", width=0.5)
 
     @render.data_frame
     def stats_accessibility_likert_lr1():
@@ -1379,7 +1371,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_accessibility_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL17_06"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL17_06").astype(str).copy()
         df = df[df["IL17_06"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL17_06": get_label("IL17_06")})
         return render.DataGrid(df, width="100%")
@@ -1389,11 +1381,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_digital_tools_likert_lr1")
         else:
-            return ui.output_plot("plot_digital_tools_likert_lr1", height="480px")
+            return output_chart("plot_digital_tools_likert_lr1", height="480px")
 
-    @render.plot
-    def plot_digital_tools_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL10_01", "IL10_02", "IL10_03", "IL10_04", "IL10_05", "IL10_06", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_digital_tools_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL10_01", "IL10_02", "IL10_03", "IL10_04", "IL10_05", "IL10_06", width=0.5)
 
     @render.data_frame
     def stats_digital_tools_likert_lr1():
@@ -1404,7 +1396,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_digital_tools_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL11_01"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL11_01").astype(str).copy()
         df = df[df["IL11_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL11_01": get_label("IL11_01")})
         return render.DataGrid(df, width="100%")
@@ -1414,11 +1406,11 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_digital_ressources_likert_lr1")
         else:
-            return ui.output_plot("plot_digital_ressources_likert_lr1", height="280px")
+            return output_chart("plot_digital_ressources_likert_lr1", height="280px")
 
-    @render.plot
-    def plot_digital_ressources_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), "IL12_01", "IL12_02", "IL12_03", width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_digital_ressources_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), "IL12_01", "IL12_02", "IL12_03", width=0.5)
 
     @render.data_frame
     def stats_digital_ressources_likert_lr1():
@@ -1429,7 +1421,7 @@ def special_learning_roomserver(input, output, session):
     
     @render.data_frame
     def df_digital_ressources_freetext_lr1():
-        df = filtered_surveys_lr1()[["IL18_06"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL18_06").astype(str).copy()
         df = df[df["IL18_06"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL18_06": get_label("IL18_06")})
         return render.DataGrid(df, width="100%")
@@ -1439,14 +1431,14 @@ def special_learning_roomserver(input, output, session):
         if input.display_type() == "stat":
             return ui.output_data_frame("stats_other_equipment_likert_lr1")
         else:
-            return ui.output_plot("plot_other_equipment_likert_lr1", height="880px")
+            return output_chart("plot_other_equipment_likert_lr1", height="880px")
 
-    @render.plot
-    def plot_other_equipment_likert_lr1():
-        return plot_likert_chart(input, filtered_surveys_lr1(), 
-                                 "IL13_01", "IL13_02", "IL13_03", "IL13_04", "IL13_05", "IL13_06",
-                                 "IL13_07", "IL13_08", "IL13_09", "IL13_10", "IL13_11",
-                                 width=0.5)
+    @render_chart(render.image(delete_file=True))
+    async def plot_other_equipment_likert_lr1():
+        return await plot_likert_chart(input, filtered_surveys_lr1(), 
+                                       "IL13_01", "IL13_02", "IL13_03", "IL13_04", "IL13_05", "IL13_06",
+                                       "IL13_07", "IL13_08", "IL13_09", "IL13_10", "IL13_11",
+                                       width=0.5)
 
     @render.data_frame
     def stats_other_equipment_likert_lr1():
@@ -1465,7 +1457,7 @@ def special_learning_roomserver(input, output, session):
 
     @render.data_frame
     def df_others_lr1():
-        df = filtered_surveys_lr1()[["IL14_01"]].astype(str).copy()
+        df = survey_columns(filtered_surveys_lr1(), "IL14_01").astype(str).copy()
         df = df[df["IL14_01"].apply(lambda x: len(x.strip()) > 3)]
         df = df.rename(columns={"IL14_01": get_label("IL14_01")})
         return render.DataGrid(df, width="100%")
@@ -1491,8 +1483,8 @@ def special_learning_roomserver(input, output, session):
     @reactive.effect
     @reactive.event(input.btn_ai_summary_others_lr1)
     def _ai_summary_others_lr1_stream():
-        df      = filtered_surveys_lr1()
         var     = "IL14_01"
+        df      = survey_columns(filtered_surveys_lr1(), var)
         label   = get_label(var)
         answers = " - " + "\n - ".join(df[var].dropna().astype(str).unique().tolist())
 
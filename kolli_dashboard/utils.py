@@ -7,9 +7,19 @@
 
 from pathlib import Path
 
+import numpy  as np
+import pandas as pd
+
 src_dir = Path(__file__).resolve().parent
 
-scale_minus_plus = ["--", "-", "±", "+", "++"]
+scale_minus_plus       = ["--", "-", "±", "+", "++"]
+scale_minus_plus_dtype = pd.CategoricalDtype(scale_minus_plus, ordered=True)
+
+# Lookup tables from the numeric SoSci codes to the category codes of the scale.
+# Index 0 is used for all codes that are not part of the scale, including missing
+# answers, which are counted as "±".
+scale_minus_plus_lookup          = np.array([2, 0, 1, 3, 4], dtype=np.int8)
+checkbox_scale_minus_plus_lookup = np.array([2, 0, 4],       dtype=np.int8)
 
 def to_scale_minus_plus(nr):
     try:
@@ -39,4 +49,29 @@ def checkbox_to_scale_minus_plus(nr):
     elif nr == 2:
         return "++"
     else:
-        return "±"
\ No newline at end of file
+        return "±"
+
+def series_to_scale_minus_plus(series):
+    """
+    Vectorized version of `to_scale_minus_plus()` for a whole column. Returns an
+    ordered categorical series with the values of `scale_minus_plus`.
+    """
+    return _series_to_scale(series, scale_minus_plus_lookup, to_scale_minus_plus)
+
+def series_checkbox_to_scale_minus_plus(series):
+    """
+    Vectorized version of `checkbox_to_scale_minus_plus()` for a whole column.
+    Returns an ordered categorical series with the values of `scale_minus_plus`.
+    """
+    return _series_to_scale(series, checkbox_scale_minus_plus_lookup, checkbox_to_scale_minus_plus)
+
+def _series_to_scale(series, lookup, to_scale):
+    if not pd.api.types.is_numeric_dtype(series):
+        # Text columns keep the exact conversion rules of the scalar function
+        return series.map(to_scale).astype(scale_minus_plus_dtype)
+
+    nr    = np.trunc(series.to_numpy(dtype=float, na_value=np.nan))
+    nr    = np.where((nr >= 1) & (nr < len(lookup)), nr, 0).astype(int)
+    codes = pd.Categorical.from_codes(lookup[nr], dtype=scale_minus_plus_dtype)
+
+    return pd.Series(codes, index=series.index, name=series.name)
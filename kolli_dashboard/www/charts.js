@@ -0,0 +1,315 @@
+/*
+ * Forschungsprojekt KoLLI: Dashboard
+ * © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+ * Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+ *
+ * This source code is licensed under the BSD 3-Clause License found in the
+ * LICENSE file in the root directory of this source tree.
+ */
+
+/*
+ * Charts for CHART_MODE=client. The server only sends the counts as created by
+ * `client_charts.py` and the charts are drawn here as SVG, so that the server
+ * doesn't need to run matplotlib. The charts look similar to the ones drawn on
+ * the server, e.g. with the same colors as plot-likert.
+ */
+(function () {
+    "use strict";
+
+    const svgNS        = "http://www.w3.org/2000/svg";
+    const fontSize     = 12;
+    const likertColors = ["#ffffff00", "firebrick", "lightcoral", "gainsboro", "cornflowerblue", "darkblue"];
+    const barColor     = "#1f77b4";
+
+    const paddingLeft    = 0.02;
+    const paddingRight   = 0.04;
+    const barLabelCutoff = 0.05;
+
+    /**
+     * Create an SVG element with the given attributes and append it to `parent`.
+     */
+    function svg(parent, name, attributes = {}, text = undefined) {
+        const element = document.createElementNS(svgNS, name);
+
+        for (const [key, value] of Object.entries(attributes)) {
+            element.setAttribute(key, value);
+        }
+
+        if (text !== undefined) element.textContent = text;
+        if (parent) parent.appendChild(element);
+        return element;
+    }
+
+    /**
+     * Multi-line text, one line per "\n", vertically centered around `y`.
+     */
+    function multilineText(parent, x, y, text, attributes = {}) {
+        const lines   = String(text).split("\n");
+        const element = svg(parent, "text", {x, y, "font-size": fontSize, ...attributes});
+
+        lines.forEach((line, i) => {
+            const dy = i === 0 ? -(lines.length - 1) * 0.6 + 0.35 : 1.2;
+            svg(element, "tspan", {x, dy: `${dy}em`}, line);
+        });
+
+        return element;
+    }
+
+    /**
+     * Approximate width of a text in pixels, without rendering it first.
+     */
+    function textWidth(text) {
+        return Math.max(...String(text).split("\n").map(line => line.length)) * fontSize * 0.6;
+    }
+
+    /**
+     * Distance between the ticks of an axis with 1, 2, 2.5 or 5 times a power of ten.
+     */
+    function niceStep(range, maxTicks) {
+        const rough = range / Math.max(maxTicks, 1);
+        const power = Math.pow(10, Math.floor(Math.log10(rough || 1)));
+
+        for (const factor of [1, 2, 2.5, 5, 10]) {
+            if (factor * power >= rough) return factor * power;
+        }
+
+        return 10 * power;
+    }
+
+    /**
+     * Same as `_tick_interval()` in `charts.py`.
+     */
+    function tickInterval(tickSpace, maxWidth) {
+        const roundest = n => {
+            const divisors = [5, 10, 25, 50];
+            for (let i = 2; i <= String(n).length; i++) divisors.push(Math.pow(10, i));
+            return Math.max(1, ...divisors.filter(divisor => n % divisor === 0));
+        };
+
+        const minTicks    = Math.max(tickSpace - 5, 1);
+        const minInterval = Math.max(1, Math.floor(maxWidth / (tickSpace + 2)));
+        const maxInterval = Math.max(1, Math.round(maxWidth / minTicks));
+        let   interval    = minInterval;
+
+        for (let candidate = minInterval; candidate <= maxInterval; candidate++) {
+            if (roundest(candidate) > roundest(interval)) interval = candidate;
+        }
+
+        return interval;
+    }
+
+    /**
+     * Number with a fixed number of decimals, like the `"%.1f"` format of the
+     * labels in `charts.py`.
+     */
+    function formatNumber(value, decimals) {
+        return value.toFixed(decimals);
+    }
+
+    /**
+     * Diverging stacked bar chart like `plot_likert_bars()` in `charts.py`.
+     */
+    function drawLikert(root, chart, width, height) {
+        let counts = chart.counts;
+
+        if (chart.percentages) {
+            counts = counts.map(row => {
+                const total = row.reduce((a, b) => a + b, 0);
+                return row.map(count => total ? count / total * 100 : 0);
+            });
+        }
+
+        // Pad each question from the left, so that the bars are centered around the middle value
+        const nValues  = chart.scale.length;
+        const middle   = Math.floor(nValues / 2);
+        const middles  = counts.map(row => row.slice(0, middle).reduce((a, b) => a + b, 0) + (nValues % 2 ? row[middle] / 2 : 0));
+        const center   = Math.max(...middles);
+        const padded   = counts.map((row, i) => [Math.abs(middles[i] - center), ...row]);
+        const totalMax = Math.max(...counts.map(row => row.reduce((a, b) => a + b, 0)));
+        const maxWidth = Math.round(Math.max(...padded.map(row => row.reduce((a, b) => a + b, 0))));
+
+        // Layout: question labels on the left, axis at the bottom
+        const labelWidth = Math.min(Math.max(...chart.questions.map(textWidth)) + 10, width * 0.4);
+        const left       = labelWidth;
+        const right      = width - 10;
+        const top        = 10;
+        const bottom     = height - 45;
+
+        const xMin   = -0.05 * maxWidth - totalMax * paddingLeft;
+        const xMax   =  1.05 * maxWidth - totalMax * paddingRight;
+        const x      = value => left + (value - xMin) / (xMax - xMin || 1) * (right - left);
+        const nBars  = padded.length;
+        const yMin   = -chart.width / 2 - 0.25;
+        const yMax   = nBars - 1 + chart.width / 2 + 0.25;
+        const y      = position => top + (yMax - position) / (yMax - yMin) * (bottom - top);
+        const barPx  = chart.width / (yMax - yMin) * (bottom - top);
+        const cutoff = totalMax * barLabelCutoff;
+
+        // Center line behind the bars
+        svg(root, "line", {x1: x(center), x2: x(center), y1: top, y2: bottom, stroke: "black", "stroke-opacity": 0.5, "stroke-dasharray": "4 3"});
+
+        // Stack the segments from the left, with the first question at the top
+        padded.forEach((row, i) => {
+            const position = nBars - 1 - i;
+            let   stacked  = 0;
+
+            row.forEach((value, j) => {
+                if (value <= 0) return;
+
+                const x0 = x(stacked);
+                const x1 = x(stacked + value);
+                stacked += value;
+
+                svg(root, "rect", {x: x0, y: y(position) - barPx / 2, width: Math.max(x1 - x0, 0), height: barPx, fill: likertColors[j % likertColors.length]});
+
+                // Like `charts.py`, the rounded label is compared with the cutoff
+                const label = formatNumber(value, chart.percentages ? 1 : 0);
+
+                if (j > 0 && Number(label) >= cutoff) {
+                    svg(root, "text", {x: (x0 + x1) / 2, y: y(position), "font-size": fontSize, "font-weight": "bold", fill: "white", "text-anchor": "middle", "dominant-baseline": "central"}, chart.percentages ? `${label}%` : label);
+                }
+            });
+
+            multilineText(root, left - 6, y(position), chart.questions[i], {"text-anchor": "end"});
+        });
+
+        // Ticks in both directions from the center. Labels above the largest total are hidden.
+        const interval = tickInterval(Math.max(Math.floor((right - left) / 50), 1), maxWidth);
+        const ticks    = [];
+
+        for (let tick = 0; tick <= center; tick += interval) ticks.push([center - tick, tick]);
+        for (let tick = interval; tick < maxWidth - center + interval; tick += interval) ticks.push([center + tick, tick]);
+
+        svg(root, "line", {x1: left, x2: right, y1: bottom, y2: bottom, stroke: "black"});
+
+        for (const [position, tick] of ticks) {
+            if (x(position) < left || x(position) > right) continue;
+
+            const label = tick > totalMax ? "" : `${Math.round(tick)}${chart.percentages ? "%" : ""}`;
+            svg(root, "line", {x1: x(position), x2: x(position), y1: bottom, y2: bottom + 4, stroke: "black"});
+            svg(root, "text", {x: x(position), y: bottom + 16, "font-size": fontSize, "text-anchor": "middle"}, label);
+        }
+
+        svg(root, "text", {x: (left + right) / 2, y: bottom + 34, "font-size": fontSize, "text-anchor": "middle"}, chart.xlabel);
+    }
+
+    /**
+     * Vertical value axis with ticks from 0 to `maxValue`.
+     */
+    function drawValueAxis(root, maxValue, y, left, top, bottom, format, label) {
+        const step = niceStep(maxValue, Math.max(Math.floor((bottom - top) / 40), 1));
+
+        svg(root, "line", {x1: left, x2: left, y1: top, y2: bottom, stroke: "black"});
+
+        for (let tick = 0; tick <= maxValue + step * 1e-9; tick += step) {
+            svg(root, "line", {x1: left - 4, x2: left, y1: y(tick), y2: y(tick), stroke: "black"});
+            svg(root, "text", {x: left - 6, y: y(tick), "font-size": fontSize, "text-anchor": "end", "dominant-baseline": "central"}, format(tick));
+        }
+
+        svg(root, "text", {x: 12, y: (top + bottom) / 2, "font-size": fontSize, "text-anchor": "middle", transform: `rotate(-90 12 ${(top + bottom) / 2})`}, label);
+    }
+
+    /**
+     * Bar chart with one bar per label.
+     */
+    function drawBar(root, chart, width, height) {
+        const left     = 60;
+        const right    = width - 10;
+        const top      = 10;
+        const bottom   = height - 40;
+        const maxValue = Math.max(...chart.values, 1) * 1.05;
+        const y        = value => bottom - value / maxValue * (bottom - top);
+        const slot     = (right - left) / Math.max(chart.values.length, 1);
+
+        const format = chart.percentages
+            ? value => `${formatNumber(chart.total ? value / chart.total * 100 : 0, 0)}%`
+            : value => formatNumber(value, Number.isInteger(value) ? 0 : 1);
+
+        chart.values.forEach((value, i) => {
+            const x = left + i * slot;
+            svg(root, "rect", {x: x + slot * 0.1, y: y(value), width: slot * 0.8, height: bottom - y(value), fill: barColor});
+            svg(root, "text", {x: x + slot / 2, y: bottom + 16, "font-size": fontSize, "text-anchor": "middle"}, chart.labels[i]);
+        });
+
+        svg(root, "line", {x1: left, x2: right, y1: bottom, y2: bottom, stroke: "black"});
+        drawValueAxis(root, maxValue, y, left, top, bottom, format, chart.ylabel);
+    }
+
+    /**
+     * Histogram with the bin edges on the x-axis.
+     */
+    function drawHistogram(root, chart, width, height) {
+        const left     = 60;
+        const right    = width - 10;
+        const top      = 10;
+        const bottom   = height - 50;
+        const edges    = chart.edges;
+        const xMin     = edges[0];
+        const xMax     = edges[edges.length - 1];
+        const x        = value => left + (value - xMin) / (xMax - xMin || 1) * (right - left);
+        const maxValue = Math.max(...chart.values, chart.percentages ? 0.01 : 1) * 1.05;
+        const y        = value => bottom - value / maxValue * (bottom - top);
+
+        const format = chart.percentages
+            ? value => `${formatNumber(value * 100, value * 100 < 10 && !Number.isInteger(value * 100) ? 1 : 0)}%`
+            : value => formatNumber(value, Number.isInteger(value) ? 0 : 1);
+
+        chart.values.forEach((value, i) => {
+            svg(root, "rect", {x: x(edges[i]), y: y(value), width: Math.max(x(edges[i + 1]) - x(edges[i]), 0), height: bottom - y(value), fill: barColor});
+        });
+
+        svg(root, "line", {x1: left, x2: right, y1: bottom, y2: bottom, stroke: "black"});
+
+        const step = niceStep(xMax - xMin, Math.max(Math.floor((right - left) / 60), 1));
+
+        for (let tick = Math.ceil(xMin / step) * step; tick <= xMax + step * 1e-9; tick += step) {
+            svg(root, "line", {x1: x(tick), x2: x(tick), y1: bottom, y2: bottom + 4, stroke: "black"});
+            svg(root, "text", {x: x(tick), y: bottom + 16, "font-size": fontSize, "text-anchor": "middle"}, formatNumber(tick, Number.isInteger(tick) ? 0 : 1));
+        }
+
+        svg(root, "text", {x: (left + right) / 2, y: bottom + 34, "font-size": fontSize, "text-anchor": "middle"}, chart.xlabel);
+        drawValueAxis(root, maxValue, y, left, top, bottom, format, chart.ylabel);
+    }
+
+    const charts = {
+        likert:    drawLikert,
+        bar:       drawBar,
+        histogram: drawHistogram,
+    };
+
+    /**
+     * (Re)draw the chart of an output element with its current size.
+     */
+    function draw(el) {
+        el.replaceChildren();
+
+        const chart  = el.kolliChart;
+        const width  = el.clientWidth;
+        const height = el.clientHeight;
+
+        if (!chart || !charts[chart.type] || !width || !height) return;
+
+        const root = svg(el, "svg", {width, height, viewBox: `0 0 ${width} ${height}`, style: "display: block; font-family: sans-serif;"});
+        charts[chart.type](root, chart, width, height);
+    }
+
+    const resizeObserver = new ResizeObserver(entries => {
+        for (const entry of entries) draw(entry.target);
+    });
+
+    const binding = new Shiny.OutputBinding();
+
+    $.extend(binding, {
+        find(scope) {
+            return $(scope).find(".kolli-chart-output");
+        },
+
+        renderValue(el, chart) {
+            el.kolliChart = chart;
+            resizeObserver.observe(el);
+            draw(el);
+        },
+    });
+
+    Shiny.outputBindings.register(binding, "kolli.chartOutput");
+})();
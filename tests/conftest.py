@@ -0,0 +1,72 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Shared fixtures of the tests. `kolli_dashboard.data` reads the SoSci export
+# into the store in `data/cache` when it is imported. The tests therefore get
+# the module from the `data_module` fixture, which points the store to a
+# temporary directory first, so that the working tree is never written.
+#==============================================================================
+
+from types import SimpleNamespace
+
+import importlib
+import pytest
+
+from kolli_dashboard       import store
+from kolli_dashboard.cache import new_cache
+
+@pytest.fixture(scope="session")
+def data_module(tmp_path_factory):
+    """
+    The module `kolli_dashboard.data`, loaded with an empty store in a temporary
+    directory.
+    """
+    store_dir = tmp_path_factory.mktemp("cache")
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(store, "store_dir",     store_dir)
+        monkeypatch.setattr(store, "manifest_json", store_dir / "manifest.json")
+        yield importlib.import_module("kolli_dashboard.data")
+
+@pytest.fixture
+def store_dir(data_module, tmp_path, monkeypatch):
+    """
+    Another empty store in a temporary directory for tests that write the store.
+    """
+    monkeypatch.setattr(store, "store_dir",     tmp_path / "cache")
+    monkeypatch.setattr(store, "manifest_json", tmp_path / "cache" / "manifest.json")
+    return tmp_path
+
+@pytest.fixture
+def result_cache(data_module, monkeypatch):
+    """
+    Empty result cache for `data.py`.
+    """
+    cache = new_cache(1024 * 1024)
+    monkeypatch.setattr(data_module, "result_cache", cache)
+    return cache
+
+@pytest.fixture
+def make_input():
+    """
+    Factory for the `input` of a session with the given number format.
+    """
+    def make_input(number_format="absolute"):
+        return SimpleNamespace(number_format=lambda: number_format)
+
+    return make_input
+
+@pytest.fixture
+def make_value():
+    """
+    Factory for a reactive value of a correlation filter with the given selection.
+    """
+    def make_value(selected):
+        return SimpleNamespace(get=lambda: selected)
+
+    return make_value
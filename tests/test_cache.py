@@ -0,0 +1,85 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the result cache in `kolli_dashboard/cache.py` and its keys for the
+# likert statistics in `kolli_dashboard/data.py`.
+#==============================================================================
+
+import numpy as np
+
+from kolli_dashboard.cache import cache_stats, cached, new_cache
+
+vars = ("R201_01", "R201_02", "R201_03", "R201_04", "R201_05")
+
+def statistics(data_module, input, **filters):
+    surveys = data_module.query_surveys(data_module.survey_spec(["R2", "R3"], **filters))
+    return data_module.calc_likert_statistics(input, surveys, *vars)
+
+def test_cached_computes_each_key_once():
+    cache = new_cache(1024)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(4)
+
+    first  = cached(cache, "key", compute)
+    second = cached(cache, "key", compute)
+
+    assert second is first
+    assert len(calls) == 1
+    assert cache_stats(cache)["hits"] == 1
+    assert cache_stats(cache)["misses"] == 1
+
+def test_least_recently_used_results_are_evicted():
+    cache = new_cache(2000)
+
+    cached(cache, "a", lambda: np.zeros(100))
+    cached(cache, "b", lambda: np.zeros(100))
+    cached(cache, "a", lambda: np.zeros(100))
+    cached(cache, "c", lambda: np.zeros(100))
+
+    assert list(cache["entries"]) == ["a", "c"]
+    assert cache["bytes"] <= cache["max_bytes"]
+    assert cache_stats(cache)["evictions"] == 1
+
+def test_results_larger_than_the_cache_are_not_stored():
+    cache = new_cache(100)
+
+    cached(cache, "key", lambda: np.zeros(100))
+    cached(cache, "key", lambda: np.zeros(100))
+
+    assert cache_stats(cache)["misses"] == 2
+    assert cache["bytes"] == 0
+
+def test_statistics_are_shared_for_equal_filters(data_module, result_cache, make_input):
+    first  = statistics(data_module, make_input(), teachers=["KAWE", "DESC"])
+    misses = cache_stats(result_cache)["misses"]
+    second = statistics(data_module, make_input(), teachers=["DESC", "KAWE"])
+
+    assert second.equals(first)
+    assert cache_stats(result_cache)["misses"] == misses
+
+def test_statistics_are_copied_from_the_cache(data_module, result_cache, make_input):
+    first = statistics(data_module, make_input())
+    first["N"] = 0
+
+    assert (statistics(data_module, make_input())["N"] > 0).any()
+
+def test_number_format_and_data_are_part_of_the_key(data_module, result_cache, make_input, monkeypatch):
+    absolute = statistics(data_module, make_input("absolute"))
+    percent  = statistics(data_module, make_input("percent"))
+
+    assert not percent.equals(absolute)
+
+    # A reload of the data changes the stamp, so that older results aren't used anymore
+    misses = cache_stats(result_cache)["misses"]
+    monkeypatch.setitem(data_module.data, "stamp", ("reloaded",))
+    statistics(data_module, make_input("absolute"))
+
+    assert cache_stats(result_cache)["misses"] > misses
@@ -0,0 +1,67 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the likert count matrix in `kolli_dashboard/data.py`, which is shared
+# by the likert charts and the statistics tables.
+#==============================================================================
+
+import pytest
+
+vars = ("AB07_01", "AB07_02", "AB07_03", "AB07_04", "AB07_05", "AB07_06", "AB07_07", "AB07_08", "AB07_09")
+
+@pytest.fixture
+def calls(data_module, result_cache, monkeypatch):
+    """
+    Number of times the answers were counted from the cube and from the responses.
+    """
+    calls = {"cube": 0, "responses": 0}
+
+    cube_counts    = data_module._cube_counts
+    survey_columns = data_module.survey_columns
+
+    def count_cube(*args):
+        calls["cube"] += 1
+        return cube_counts(*args)
+
+    def count_responses(*args):
+        calls["responses"] += 1
+        return survey_columns(*args)
+
+    monkeypatch.setattr(data_module, "_cube_counts",   count_cube)
+    monkeypatch.setattr(data_module, "survey_columns", count_responses)
+
+    data_module.load_columns(*vars)
+    return calls
+
+def switch_views(data_module, make_input, surveys):
+    """
+    Show the questions as chart and as table with both number formats.
+    """
+    data_module.likert_counts(surveys, *vars)
+
+    for number_format in ("absolute", "percent", "absolute"):
+        data_module.calc_likert_statistics(make_input(number_format), surveys, *vars)
+
+def test_count_matrix_is_shared_and_read_only(data_module, calls):
+    surveys = data_module.query_surveys(data_module.survey_spec(["R1-3"]))
+    matrix  = data_module.likert_count_matrix(surveys, *vars)
+
+    assert data_module.likert_count_matrix(surveys, *vars) is matrix
+    assert matrix.shape == (len(vars), 5)
+    assert not matrix.flags.writeable
+
+def test_display_type_and_number_format_count_once(data_module, calls, make_input):
+    switch_views(data_module, make_input, data_module.query_surveys(data_module.survey_spec(["R1-3"])))
+
+    assert calls == {"cube": 1, "responses": 0}
+
+def test_correlation_filters_read_the_responses_once(data_module, calls, make_input, make_value):
+    spec = data_module.survey_spec(["R1-3"], correlation={"AB07_01": make_value(["+", "++"])})
+    switch_views(data_module, make_input, data_module.query_surveys(spec))
+
+    assert calls == {"cube": 1, "responses": 1}
@@ -0,0 +1,82 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the pre-aggregated likert answers of `_count_cube()` in
+# `kolli_dashboard/data.py`, which must give the same counts as counting the
+# matching responses.
+#==============================================================================
+
+import numpy  as np
+import pandas as pd
+import pytest
+
+from kolli_dashboard.utils import scale_minus_plus
+
+revised = ("R201_01", "R201_02", "R201_03", "R201_04", "R201_05")
+round1  = ("V201_01", "V201_02", "V204_01", "V204_02")
+
+def raw_counts(data_module, spec, vars):
+    """
+    Number of answers of the matching responses, counted one by one.
+    """
+    df = data_module.survey_columns(data_module.query_surveys(spec), *vars)
+    return np.array([[(df[var] == value).sum() for value in scale_minus_plus] for var in vars])
+
+@pytest.mark.parametrize("families, vars, filters", [
+    (["R2", "R3"], revised, {}),
+    (["R2", "R3"], revised, {"teachers": ["KAWE", "DESC"]}),
+    (["R2", "R3"], revised, {"lectures": ["VERTSYS", "PROG1", "WEBPROG"]}),
+    (["R2", "R3"], revised, {"teachers": ["KAWE", "DESC", "DIRA"], "lectures": ["VERTSYS", "WEBPROG"]}),
+    (["R2", "R3"], revised, {"start": "2025-10-01", "end": "2025-11-14"}),
+    (["R1-1"],     round1,  {}),
+    (["R1-1"],     round1,  {"start": "2024-09-01", "end": "2024-12-31", "teachers": ["KAWE"]}),
+    (["NOPE"],     revised, {}),
+])
+def test_cube_counts_equal_counted_responses(data_module, families, vars, filters):
+    data_module.load_columns(*vars)
+    spec = data_module.survey_spec(families, **filters)
+
+    np.testing.assert_array_equal(data_module._cube_counts(spec, vars), raw_counts(data_module, spec, vars))
+
+def test_correlation_filters_count_the_responses(data_module, make_value):
+    data_module.load_columns(*revised)
+    spec = data_module.survey_spec(["R2", "R3"], correlation={"R201_01": make_value(["++"])})
+
+    assert spec[-1] == (("R201_01", ("++",)),)
+    assert data_module._cube_counts(spec, revised) is None
+
+def test_dates_within_a_day_count_the_responses(data_module):
+    data_module.load_columns(*revised)
+    spec = data_module.survey_spec(["R2", "R3"], start=pd.Timestamp("2024-10-01 12:00"))
+
+    assert data_module._cube_counts(spec, revised) is None
+
+def test_correlation_filters_without_effect_are_left_out(data_module, make_value):
+    data_module.load_columns(*round1, "V203_01")
+    spec = data_module.survey_spec(["R1-1"], correlation={"V201_01": make_value([]), "V203_01": make_value([-1, 11])})
+
+    assert spec[-1] == ()
+    assert data_module._cube_counts(spec, round1) is not None
+
+def test_correlation_filters_select_the_matching_responses(data_module, make_value):
+    data_module.load_columns(*revised)
+    correlation = {"R201_01": make_value(["++", "+"]), "R201_02": make_value(["-", "0"])}
+    surveys     = data_module.query_surveys(data_module.survey_spec(["R2", "R3"], correlation=correlation))
+    df          = data_module.survey_columns(data_module.query_surveys(data_module.survey_spec(["R2", "R3"])), "R201_01", "R201_02")
+    expected    = df[df["R201_01"].isin(["++", "+"]) & df["R201_02"].isin(["-", "0"])]
+
+    assert 0 < data_module.survey_count(surveys) < df.shape[0]
+    assert data_module.survey_columns(surveys, "R201_01").index.tolist() == expected.index.tolist()
+
+def test_loaded_columns_extend_the_cube(data_module):
+    data_module.load_columns(*revised)
+    cube = data_module.data["cube"]
+    full = data_module._count_cube(data_module.data["answers"], data_module.data["label_index"])
+
+    assert cube["vars"].keys() == full["vars"].keys()
+    np.testing.assert_array_equal(cube["counts"][:, [cube["vars"][var] for var in full["vars"]]], full["counts"])
@@ -0,0 +1,84 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the cache of the rendered likert charts, which is shared by all
+# sessions, see `plot_likert_chart()` in `kolli_dashboard/data.py`.
+#==============================================================================
+
+from types import SimpleNamespace
+
+import asyncio
+import os
+import pytest
+
+from kolli_dashboard.cache import cache_stats, new_cache
+
+vars = ("R201_01", "R201_02", "R201_03", "R201_04", "R201_05")
+
+@pytest.fixture
+def drawn(data_module, monkeypatch):
+    """
+    Empty image cache for `data.py` and the sizes of the charts that were drawn
+    instead of drawing them in the plot pool.
+    """
+    drawn = []
+
+    def png_result(key, image_key, func, *args, **kwargs):
+        drawn.append((*args[:3], kwargs["percentages"]))
+        return f"{len(drawn)}".encode()
+
+    monkeypatch.setattr(data_module, "image_cache", new_cache(1024 * 1024))
+    monkeypatch.setattr(data_module, "png_result",  png_result)
+
+    data_module.load_columns(*vars)
+    return drawn
+
+def session(id, width=800, height=400, pixelratio=1):
+    clientdata = SimpleNamespace(
+        output_width  = lambda: width,
+        output_height = lambda: height,
+        pixelratio    = lambda: pixelratio,
+    )
+
+    return SimpleNamespace(id=id, clientdata=clientdata)
+
+@pytest.fixture
+def show_chart(data_module, make_input, monkeypatch):
+    """
+    Render the chart in the given session and return the bytes of the image.
+    """
+    def show_chart(session, number_format="absolute"):
+        monkeypatch.setattr(data_module, "get_current_session", lambda: session)
+
+        surveys = data_module.query_surveys(data_module.survey_spec(["R2", "R3"]))
+        image   = asyncio.run(data_module.plot_likert_chart(make_input(number_format), surveys, *vars, width=0.4))
+
+        with open(image["src"], "rb") as file:
+            png = file.read()
+
+        os.unlink(image["src"])
+        return png
+
+    return show_chart
+
+def test_sessions_share_the_image(data_module, drawn, show_chart):
+    first  = show_chart(session("a"))
+    second = show_chart(session("b"))
+
+    assert second == first
+    assert drawn == [(800, 400, 1, False)]
+    assert cache_stats(data_module.image_cache)["hits"] == 1
+
+def test_size_and_number_format_draw_new_images(drawn, show_chart):
+    show_chart(session("a"))
+    show_chart(session("a", width=600))
+    show_chart(session("a", pixelratio=2))
+    show_chart(session("a"), number_format="percent")
+    show_chart(session("b", width=600))
+
+    assert drawn == [(800, 400, 1, False), (600, 400, 1, False), (800, 400, 2, False), (800, 400, 1, True)]
@@ -0,0 +1,59 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the extended tasks that wait for the charts of the plot pool, see
+# `png_result()` in `kolli_dashboard/plot_pool.py`.
+#==============================================================================
+
+from shiny       import reactive
+from shiny.types import SilentOperationInProgressException
+
+import asyncio
+import pytest
+
+from kolli_dashboard import plot_pool
+
+def draw(image):
+    return image.encode()
+
+def status(task):
+    with reactive.isolate():
+        return task.status.get()
+
+@pytest.fixture
+def tasks(monkeypatch):
+    """
+    Empty pool that draws in a thread of the test process.
+    """
+    monkeypatch.setattr(plot_pool, "plot_workers", 0)
+    monkeypatch.setattr(plot_pool, "pool", {"executor": None, "slots": None, "jobs": {}, "tasks": {}})
+    return plot_pool.pool["tasks"]
+
+def test_new_image_replaces_the_task_of_the_chart(tasks):
+    async def show_images():
+        replaced = []
+
+        with reactive.isolate():
+            for image in ["a", "b", "c"]:
+                if tasks:
+                    replaced.append(tasks["session", "chart"]["task"])
+
+                with pytest.raises(SilentOperationInProgressException):
+                    plot_pool.png_result(("session", "chart"), image, draw, image)
+
+        while status(tasks["session", "chart"]["task"]) == "running":
+            await asyncio.sleep(0.01)
+
+        with reactive.isolate():
+            return [status(task) for task in replaced], plot_pool.png_result(("session", "chart"), "c", draw, "c")
+
+    replaced, png = asyncio.run(show_images())
+
+    assert png == b"c"
+    assert list(tasks) == [("session", "chart")]
+    assert replaced == ["cancelled", "cancelled"]
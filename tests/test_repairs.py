@@ -0,0 +1,85 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the fixes of the raw SoSci export in `kolli_dashboard/repairs.py`,
+# which must give the same result when the rules of one kind are fused into
+# one pass as when they are applied one after the other.
+#==============================================================================
+
+import numpy  as np
+import pandas as pd
+
+from kolli_dashboard.repairs import compile_repairs, run_repairs
+
+def raw_data():
+    return pd.DataFrame({
+        "CASE":     [1, 2, 3, 4, 5, 6],
+        "QUESTNNR": ["R1-A-1", "R1-A-1", "R1-B-1", "R1-C-1", "R1-C-1", "R1-D-2"],
+        "STARTED":  pd.to_datetime(["2024-10-16 09:00", "2024-10-17 10:00", "2024-10-16 11:00", "2024-10-18 12:00", "2024-10-19 13:00", "2024-10-20 14:00"]),
+        "OLD_01":   [5, 3, np.nan, 7, 1, np.nan],
+        "OLD_02":   ["a", np.nan, "b", np.nan, "c", "d"],
+        "NEW_01":   [np.nan, 2, 4, np.nan, 6, 1],
+        "NEW_02":   [np.nan, np.nan, np.nan, "x", np.nan, np.nan],
+        "NUM_01":   [np.nan, 1, np.nan, 2, np.nan, 3],
+        "NUM_02":   [4, np.nan, np.nan, 5, 6, np.nan],
+    })
+
+rules = [
+    {"fix": "drop_cases",           "description": "drop 1",   "cases": [1, 6]},
+    {"fix": "rename_questionnaire", "description": "rename 1", "source": "R1-A-1", "target": "R1-X-1", "started_on": "2024-10-17"},
+    {"fix": "clip",                 "description": "clip 1",   "columns": ["OLD_01", "NEW_01"], "upper": 4},
+    {"fix": "clip",                 "description": "clip 2",   "columns": ["NEW_01"], "upper": 5},
+    {"fix": "fill_missing",         "description": "fill 1",   "columns": ["NUM_01"], "value": 0},
+    {"fix": "rename_questionnaire", "description": "rename 2", "source": "R1-C-1", "target": "R1-Y-1"},
+    {"fix": "migrate",              "description": "migrate 1", "columns": {"NEW_01": "OLD_01"}},
+    {"fix": "clip",                 "description": "clip 3",   "columns": ["NEW_01"], "upper": 3},
+    {"fix": "clip",                 "description": "clip 4",   "columns": ["OLD_01", "NEW_01"], "upper": 2},
+    {"fix": "drop_cases",           "description": "drop 2",   "cases": [6]},
+    {"fix": "fill_missing",         "description": "fill 2",   "columns": ["NUM_01", "NUM_02"], "value": -1},
+    {"fix": "rename_questionnaire", "description": "rename 3", "source": "R1-Y-1", "target": "R1-Z-1", "started_on": "2024-10-18"},
+    {"fix": "migrate",              "description": "migrate 2", "columns": {"NEW_02": "OLD_02"}, "prefix": "> "},
+    {"fix": "migrate",              "description": "migrate 3", "columns": {"OLD_01": "NEW_01"}},
+    {"fix": "copy_responses",       "description": "copy 1",   "source": "R1-B-1", "target": "R1-B-2", "columns": {"NUM_02": "NEW_01"}},
+    {"fix": "copy_responses",       "description": "copy 2",   "source": "R1-B-2", "target": "R1-B-3", "columns": {"NUM_01": "NEW_01"}},
+    {"fix": "copy_responses",       "description": "copy 3",   "source": "R1-C-1", "target": "R1-C-2", "columns": {"NUM_01": "NEW_01"}},
+]
+
+def one_by_one(data, rules):
+    rows = []
+
+    for rule in rules:
+        data, report = run_repairs(data, [rule])
+        rows.append(report[0]["rows"])
+
+    return data, rows
+
+def test_fused_rules_equal_rules_one_by_one():
+    expected, expected_rows = one_by_one(raw_data(), rules)
+    data, report            = run_repairs(raw_data(), rules)
+
+    expected = expected.sort_values("CASE", kind="stable").reset_index(drop=True)
+    data     = data.sort_values("CASE", kind="stable").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(data[expected.columns], expected)
+    assert {r["description"]: r["rows"] for r in report} == dict(zip((rule["description"] for rule in rules), expected_rows))
+
+def test_dependent_rules_start_a_new_pass():
+    passes = [[rule["description"] for rule in group] for _, group in compile_repairs(rules)]
+
+    assert passes == [
+        ["drop 1", "drop 2"],
+        ["rename 1", "rename 2"],
+        ["clip 1", "clip 2"],
+        ["fill 1", "fill 2"],
+        ["migrate 1", "migrate 2"],
+        ["clip 3", "clip 4"],
+        ["rename 3"],
+        ["migrate 3"],
+        ["copy 1"],
+        ["copy 2", "copy 3"],
+    ]
@@ -0,0 +1,84 @@
+# Forschungsprojekt KoLLI: Dashboard
+# © 2025 DHBW Karlsruhe / Studiengang Wirtschaftsinformatik
+# Dennis Schulmeister-Zimolong <dennis@wpvs.de>
+#
+# This source code is licensed under the BSD 3-Clause License found in the
+# LICENSE file in the root directory of this source tree.
+
+#==============================================================================
+# Tests for the store of the cleaned survey results in `kolli_dashboard/store.py`
+# and the ingest of new SoSci exports in `kolli_dashboard/data.py`.
+#==============================================================================
+
+import pandas as pd
+import pytest
+
+from kolli_dashboard.store import read_columns, write_part
+
+def read_export(data_module):
+    return pd.read_csv(str(data_module.data_csv), encoding="utf-16", sep="\t", quotechar='"', dtype=str, keep_default_na=False)
+
+def write_export(path, df):
+    df.to_csv(path, sep="\t", encoding="utf-16", index=False)
+
+def test_ingest_of_two_exports_equals_full_rebuild(data_module, store_dir, monkeypatch):
+    export = read_export(data_module)
+    older  = store_dir / "older.csv"
+    newer  = store_dir / "newer.csv"
+
+    write_export(older, export.iloc[:export.shape[0] // 2])
+    write_export(newer, export)
+
+    monkeypatch.setattr(data_module, "data_csv", older)
+    data_module._ingest()
+
+    monkeypatch.setattr(data_module, "data_csv", newer)
+    manifest = data_module._ingest()
+
+    assert len(manifest["parts"]) == 2
+    assert manifest["size"] == newer.stat().st_size
+
+    columns  = list(dict.fromkeys(column for part in manifest["parts"] for column in part["columns"]))
+    expected = data_module._read_and_clean()[0].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(read_columns(manifest, columns), expected[columns])
+
+def test_unchanged_export_adds_no_partition(data_module, store_dir, monkeypatch):
+    export = store_dir / "export.csv"
+    write_export(export, read_export(data_module))
+
+    monkeypatch.setattr(data_module, "data_csv", export)
+
+    assert data_module._ingest() == data_module._ingest()
+
+@pytest.mark.parametrize("change", ["edited", "shorter"])
+def test_changed_export_rebuilds_the_store(data_module, store_dir, monkeypatch, change):
+    export = read_export(data_module)
+    path   = store_dir / "export.csv"
+
+    write_export(path, export)
+    monkeypatch.setattr(data_module, "data_csv", path)
+    data_module._ingest()
+
+    if change == "edited":
+        export.loc[0, "QUESTNNR"] = "R1-SILA-1"
+    else:
+        export = export.iloc[:-10]
+
+    write_export(path, export)
+    manifest = data_module._ingest()
+
+    assert len(manifest["parts"]) == 1
+    assert manifest["parts"][0]["rows"] == data_module._read_and_clean()[0].shape[0]
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_read_columns_fills_columns_missing_in_older_partitions(store_dir):
+    older = write_part("older", pd.DataFrame({"CASE": [1, 2], "QUESTNNR": pd.Categorical(["R2-A-B", "R2-C-D"])}))
+    newer = write_part("newer", pd.DataFrame({"CASE": [3], "QUESTNNR": pd.Categorical(["R3-A-B"]), "STARTED": [pd.Timestamp("2025-01-01")]}))
+    df    = read_columns({"parts": [older, newer]}, ["CASE", "QUESTNNR", "STARTED", "R201_01"])
+
+    assert df["CASE"].tolist() == [1, 2, 3]
+    assert df["QUESTNNR"].dtype == "category"
+    assert df["STARTED"].dtype == "datetime64[ns]"
+    assert df["STARTED"].isna().tolist() == [True, True, False]
+    assert df["R201_01"].isna().all()